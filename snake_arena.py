@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Snake arena - N snakes on one board, moving simultaneously (no pygame)
+
+The single-snake rules of SnakeEngine.tick, extended to many snakes:
+- Walls kill
+- A snake may move into a tail cell that is vacated this tick (its own or
+  another snake's); a tail stays put when its snake eats
+- Moving into any snake's body kills
+- Heads meeting on one cell: the longest snake survives, equal lengths all die
+- Food is shared; the snake whose head reaches it grows by one
+- Dead snakes leave the board at the end of the tick
+
+Every snake moves at once: targets are computed first, vacating tails are
+lifted, and each target is then checked against a single occupancy grid
+whose cells hold the owner's id + 1 (0 = empty). A tick therefore costs
+O(snakes) lookups, never pairwise body checks; a dead snake's cells are
+cleared once, when it dies.
+
+Cells are flat indices (y * grid_w + x). Food lives in its own byte grid and
+is topped back up to food_count from a FreeCells index (see snake_engine.py),
+so placement stays O(1) however crowded the board gets.
+
+Usage:
+    python snake_arena.py --snakes 64 --board 120x80 --ticks 2000
+"""
+
+import argparse
+import random
+import sys
+import time
+from array import array
+from collections import deque
+
+from snake_engine import FreeCells, DIRECTIONS
+
+GRID_W, GRID_H = 120, 80
+START_LENGTH = 3
+SPAWN_TRIES = 1000  # random placements tried per snake before giving up
+
+
+# -----------------------------
+# Snakes
+# -----------------------------
+class ArenaSnake:
+    """One snake of the arena. cells runs tail -> head (head at cells[-1])."""
+
+    __slots__ = ("id", "cells", "direction", "next_direction", "alive", "score", "ticks_alive")
+
+    def __init__(self, snake_id, cells, direction):
+        self.id = snake_id
+        self.cells = deque(cells)
+        self.direction = direction
+        self.next_direction = direction
+        self.alive = True
+        self.score = 0
+        self.ticks_alive = 0
+
+    @property
+    def head(self):
+        return self.cells[-1]
+
+    @property
+    def tail(self):
+        return self.cells[0]
+
+    @property
+    def length(self):
+        return len(self.cells)
+
+    def set_direction(self, d):
+        # Prevent 180-degree reversal
+        dx, dy = d
+        cx, cy = self.direction
+        if (dx, dy) == (-cx, -cy):
+            return
+        self.next_direction = d
+
+
+# -----------------------------
+# Arena
+# -----------------------------
+class Arena:
+    """n_snakes snakes sharing one grid_w x grid_h board and food_count foods.
+
+    `owner[cell]` is the id + 1 of the snake on the cell (0 = empty),
+    `food[cell]` is 1 on food cells. Call tick() for one simultaneous move.
+    """
+
+    def __init__(self, n_snakes, grid_w=GRID_W, grid_h=GRID_H, seed=None, food_count=None):
+        if n_snakes < 1:
+            raise ValueError(f"need at least one snake, got {n_snakes}")
+        if grid_w < 4 or grid_h < 1:
+            raise ValueError(f"grid must be at least 4x1, got {grid_w}x{grid_h}")
+        self.n_snakes = n_snakes
+        self.grid_w = grid_w
+        self.grid_h = grid_h
+        self.cells = grid_w * grid_h
+        self.food_count = food_count if food_count is not None else max(1, n_snakes // 2)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.owner = array("H", bytes(2 * self.cells))
+        self.food = bytearray(self.cells)
+        self.food_cells = set()
+        self.free = FreeCells(self.cells)
+        self.snakes = []
+        self.reset()
+
+    def reset(self, seed=None):
+        """Start a new round. Passing a seed reseeds the RNG first."""
+        if seed is not None:
+            self.seed = seed
+            self.rng.seed(seed)
+        owner, food, free = self.owner, self.food, self.free
+        for snake in self.snakes:
+            if snake.alive:
+                for cell in snake.cells:
+                    owner[cell] = 0
+                    free.add(cell)
+        for cell in self.food_cells:
+            food[cell] = 0
+            free.add(cell)
+        self.food_cells.clear()
+
+        self.snakes = [self._spawn(i) for i in range(self.n_snakes)]
+        self.alive_count = self.n_snakes
+        self.ticks = 0
+        self._place_food()
+
+    @property
+    def done(self):
+        """No snake left, or only one left in a multi-snake round."""
+        return self.alive_count == 0 or (self.n_snakes > 1 and self.alive_count == 1)
+
+    def snake_at(self, cell):
+        """The snake covering cell, or None."""
+        tag = self.owner[cell]
+        return self.snakes[tag - 1] if tag else None
+
+    # -------------------------
+    # Simulation
+    # -------------------------
+    def tick(self):
+        """Move every live snake at once. Returns the snakes that died."""
+        w, h = self.grid_w, self.grid_h
+        owner, food, free = self.owner, self.food, self.free
+        self.ticks += 1
+
+        # 1. Targets; walls kill outright
+        movers = []
+        dead = []
+        for snake in self.snakes:
+            if not snake.alive:
+                continue
+            snake.direction = dx, dy = snake.next_direction
+            head = snake.cells[-1]
+            x, y = head % w + dx, head // w + dy
+            if 0 <= x < w and 0 <= y < h:
+                movers.append((snake, y * w + x))
+            else:
+                dead.append(snake)
+
+        # 2. Tails move away unless their snake eats (head lands on food)
+        for snake, target in movers:
+            if not food[target]:
+                cell = snake.cells.popleft()
+                owner[cell] = 0
+                free.add(cell)
+
+        # 3. Resolve each target against the grid, then against other heads
+        claims = {}
+        for snake, target in movers:
+            if owner[target]:
+                dead.append(snake)  # a body (the old head included) is there
+            else:
+                claims.setdefault(target, []).append(snake)
+
+        # 4. Survivors take their cells
+        for target, claimants in claims.items():
+            if len(claimants) > 1:
+                longest = max(s.length for s in claimants)
+                winners = [s for s in claimants if s.length == longest]
+                dead.extend(s for s in claimants if s.length != longest or len(winners) > 1)
+                if len(winners) > 1:
+                    continue  # nobody gets the cell (or its food)
+                claimants = winners
+            snake = claimants[0]
+            snake.cells.append(target)
+            owner[target] = snake.id + 1
+            snake.ticks_alive += 1
+            if food[target]:
+                self._eat(target)
+                snake.score += 1
+            else:
+                free.remove(target)
+
+        # 5. The dead leave the board
+        for snake in dead:
+            snake.alive = False
+            for cell in snake.cells:
+                owner[cell] = 0
+                free.add(cell)
+        self.alive_count -= len(dead)
+
+        self._place_food()
+        return dead
+
+    def _eat(self, cell):
+        # The eater's head now covers the cell, so it stays out of free
+        self.food[cell] = 0
+        self.food_cells.discard(cell)
+
+    def _place_food(self):
+        food, free = self.food, self.free
+        while len(self.food_cells) < self.food_count and len(free):
+            cell = free.sample(self.rng)
+            free.remove(cell)
+            food[cell] = 1
+            self.food_cells.add(cell)
+
+    def _spawn(self, snake_id):
+        """A straight START_LENGTH snake on free cells, with room ahead of its head."""
+        w, h, owner, free, rng = self.grid_w, self.grid_h, self.owner, self.free, self.rng
+        for _ in range(SPAWN_TRIES):
+            direction = rng.choice(DIRECTIONS)
+            dx, dy = direction
+            x, y = rng.randrange(w), rng.randrange(h)
+            # Tail first, then one free cell in front of the head
+            line = [(x + dx * k, y + dy * k) for k in range(START_LENGTH + 1)]
+            if all(0 <= cx < w and 0 <= cy < h and not owner[cy * w + cx] and not self.food[cy * w + cx]
+                   for cx, cy in line):
+                cells = [cy * w + cx for cx, cy in line[:START_LENGTH]]
+                for cell in cells:
+                    owner[cell] = snake_id + 1
+                    free.remove(cell)
+                return ArenaSnake(snake_id, cells, direction)
+        raise ValueError(f"no room for snake {snake_id} on a {w}x{h} board")
+
+
+# -----------------------------
+# Agents
+# -----------------------------
+def open_moves(arena, snake):
+    """Directions that do not hit a wall or a body next tick (tails may move on)."""
+    w, h, owner = arena.grid_w, arena.grid_h, arena.owner
+    head = snake.cells[-1]
+    hx, hy = head % w, head // w
+    rx, ry = -snake.direction[0], -snake.direction[1]
+    moves = []
+    for d in DIRECTIONS:
+        if d == (rx, ry):
+            continue
+        x, y = hx + d[0], hy + d[1]
+        if 0 <= x < w and 0 <= y < h:
+            tag = owner[y * w + x]
+            if not tag or arena.snakes[tag - 1].tail == y * w + x:
+                moves.append(d)
+    return moves
+
+
+def random_open_move(arena, snake, rng=random):
+    """A random open move, or None (keep going) when there is none."""
+    moves = open_moves(arena, snake)
+    return rng.choice(moves) if moves else None
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a headless multi-snake arena and report ticks/s.")
+    parser.add_argument("--snakes", type=int, default=64)
+    parser.add_argument("--board", default=f"{GRID_W}x{GRID_H}", metavar="WxH")
+    parser.add_argument("--food", type=int, help="food on the board at once (default: snakes / 2)")
+    parser.add_argument("--ticks", type=int, default=2000, help="total ticks to run (rounds restart)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+    try:
+        w, h = (int(n) for n in args.board.lower().split("x"))
+    except ValueError:
+        parser.error(f"--board: expected WxH, got {args.board!r}")
+
+    arena = Arena(args.snakes, w, h, seed=args.seed, food_count=args.food)
+    rng = random.Random(args.seed)
+    rounds, best = 1, 0
+    steer_s = tick_s = 0.0
+    for _ in range(args.ticks):
+        t0 = time.perf_counter()
+        for snake in arena.snakes:
+            if snake.alive:
+                d = random_open_move(arena, snake, rng)
+                if d is not None:
+                    snake.set_direction(d)
+        t1 = time.perf_counter()
+        arena.tick()
+        t2 = time.perf_counter()
+        steer_s += t1 - t0
+        tick_s += t2 - t1
+        best = max(best, max(s.length for s in arena.snakes))
+        if arena.done:
+            arena.reset()
+            rounds += 1
+
+    print(f"{args.snakes} snakes on {w}x{h}: {args.ticks} ticks in {rounds} rounds, longest snake {best}")
+    print(f"arena tick: {args.ticks / tick_s:.0f} ticks/s ({tick_s / args.ticks * 1e6:.1f} us/tick)")
+    print(f"with agents: {args.ticks / (tick_s + steer_s):.0f} ticks/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
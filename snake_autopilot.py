@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""
+Snake autopilots
+
+Autopilot - shortest path to the food with a tail-reachability safety check.
+Each decision:
+1. Follow the cached path to the food while the food has not moved and the
+   next cell is still open.
+2. Otherwise BFS from the head to the food. Accept the path only if, after
+   eating at its end, the snake could still reach its own tail (so it never
+   seals itself into a pocket); then cache it.
+3. No safe path: take the open move from which the tail is reachable and
+   farthest away, which stalls safely until the food path clears. Failed
+   plans back off (1, 2, 4 ... MAX_BACKOFF moves) before the next attempt.
+
+Neighbor tables are built once per board size and the BFS marks cells with
+a generation stamp instead of clearing arrays, so a cached step costs a few
+microseconds and a fresh plan is a single pass over the board. Boards above
+TABLE_MAX_CELLS (say 2000x2000) get the same lookups computed from a byte
+per cell instead, since a full table would take gigabytes.
+
+Works with anything that has the SnakeEngine interface (grid_w, grid_h, body,
+direction, food): SnakeEngine, SnakeGame in snake_gpt5.2_thinking.py, and
+the tournament's AutoGame.
+
+HamiltonianAutopilot - follows a Hamiltonian cycle of the board, taking
+shortcuts that can never trap it, so it fills every board that has a cycle
+(both sides 2+, one of them even) and reaches the victory state. Odd x odd
+and one-cell-wide boards have no cycle, so it raises ValueError there
+(has_hamiltonian_cycle()).
+
+Usage:
+    pilot = Autopilot()      # or HamiltonianAutopilot()
+    d = pilot(game)          # or pilot.drive(game) to call set_direction
+"""
+
+from array import array
+from collections import deque
+
+from snake_engine import DIRECTIONS
+
+MAX_BACKOFF = 8  # most moves to stall before planning for the food again
+TABLE_MAX_CELLS = 1 << 16  # bigger boards compute neighbors instead of tabulating them
+
+_neighbor_tables = {}
+
+
+def has_hamiltonian_cycle(w, h):
+    """Does a w x h board have a Hamiltonian cycle (both sides 2+, one of them even)?"""
+    return w >= 2 and h >= 2 and (w % 2 == 0 or h % 2 == 0)
+
+
+def hamiltonian_cycle(w, h):
+    """Cells (x, y) of a closed path visiting every cell once.
+
+    Row 0 runs left to right, the remaining rows zig-zag over columns 1..w-1,
+    and column 0 leads back up. Needs an even h (or an even w, transposed).
+    """
+    return list(iter_hamiltonian_cycle(w, h))
+
+
+def iter_hamiltonian_cycle(w, h):
+    """hamiltonian_cycle() one cell at a time, for boards too big to list."""
+    if not has_hamiltonian_cycle(w, h):
+        raise ValueError(f"no Hamiltonian cycle on a {w}x{h} board")
+    if h % 2:
+        return ((x, y) for (y, x) in iter_hamiltonian_cycle(h, w))
+    return _zigzag(w, h)
+
+
+def _zigzag(w, h):
+    for x in range(w):
+        yield x, 0
+    for y in range(1, h):
+        for x in (range(w - 1, 0, -1) if y % 2 else range(1, w)):
+            yield x, y
+    for y in range(h - 1, 0, -1):
+        yield 0, y
+
+
+class ComputedNeighbors:
+    """neighbor_table() for huge boards: same lookups, a byte per cell.
+
+    shape[cell] flags which board edges the cell touches; each of the 16
+    edge combinations has its (offset, direction) list, in DIRECTIONS order
+    like the table.
+    """
+
+    def __init__(self, grid_w, grid_h):
+        self.cells = grid_w * grid_h
+        self.shapes = []
+        for shape in range(16):
+            left, right, top, bottom = (shape >> i & 1 for i in range(4))
+            self.shapes.append(tuple(
+                (dy * grid_w + dx, (dx, dy))
+                for dx, dy in DIRECTIONS
+                if not (dx < 0 and left or dx > 0 and right or dy < 0 and top or dy > 0 and bottom)
+            ))
+        row = bytearray(grid_w)
+        row[0] |= 1
+        row[-1] |= 2
+        top = bytes(b | 4 | (8 if grid_h == 1 else 0) for b in row)
+        bottom = bytes(b | 8 for b in row)
+        self.shape = bytearray(top) + bytes(row) * (grid_h - 2) + (bottom if grid_h > 1 else b"")
+
+    def __len__(self):
+        return self.cells
+
+    def __getitem__(self, cell):
+        return [(cell + offset, d) for offset, d in self.shapes[self.shape[cell]]]
+
+
+def neighbor_table(grid_w, grid_h):
+    """For every cell, the (neighbor_cell, direction) pairs inside the board."""
+    key = (grid_w, grid_h)
+    table = _neighbor_tables.get(key)
+    if table is None and grid_w * grid_h > TABLE_MAX_CELLS:
+        table = _neighbor_tables[key] = ComputedNeighbors(grid_w, grid_h)
+    elif table is None:
+        table = []
+        for cell in range(grid_w * grid_h):
+            x, y = cell % grid_w, cell // grid_w
+            table.append(tuple(
+                ((y + dy) * grid_w + x + dx, (dx, dy))
+                for dx, dy in DIRECTIONS
+                if 0 <= x + dx < grid_w and 0 <= y + dy < grid_h
+            ))
+        table = _neighbor_tables[key] = tuple(table)
+    return table
+
+
+class Autopilot:
+    """Picks a direction per tick; see the module docstring for the strategy.
+
+    seed is accepted for snake_tournament's agent factory signature; the
+    autopilot itself is deterministic.
+    """
+
+    def __init__(self, seed=None):
+        self.grid = None
+        self.neighbors = None
+        self.path = None        # cells from the head to the food, head excluded
+        self.path_pos = 0
+        self.path_food = -1
+        self.path_head = -1     # where the head must be for the cached path to apply
+        self.plans = 0          # BFS food searches made (for tuning / tests)
+        self._backoff = 0       # moves to wait after the next failed plan
+        self._wait = 0
+        self._stamp = 0
+        self._seen = None
+        self._parent = None
+
+    # -------------------------
+    # Entry points
+    # -------------------------
+    def __call__(self, game):
+        """The direction to take on the next tick, or None to keep going."""
+        if self.grid != (game.grid_w, game.grid_h):
+            self._resize(game.grid_w, game.grid_h)
+        body = game.body
+        head = body.head
+        food = game.food
+        food_cell = -1 if food is None else food[1] * game.grid_w + food[0]
+
+        # 1. Cached path
+        step = self._cached_step(body, head, food_cell)
+        if step is not None:
+            return step
+
+        # 2. Fresh path to the food (after a failed plan, wait a few moves
+        # before trying again: the board barely changes in one move)
+        self.path = None
+        if food_cell >= 0 and self._wait <= 0:
+            path = self._bfs_path(body, head, food_cell)
+            if path is not None and self._safe_after(body, path):
+                self._backoff = 0
+                return self._follow(path, body, head, food_cell)
+            self._backoff = min(MAX_BACKOFF, 2 * self._backoff or 1)
+            self._wait = self._backoff
+        self._wait -= 1
+
+        # 3. Stall: stay where the tail can be reached
+        return self._stall_move(body, head, food_cell, game.direction)
+
+    def drive(self, game):
+        d = self(game)
+        if d is not None:
+            game.set_direction(d)
+        return d
+
+    def reset(self):
+        self.path = None
+        self._backoff = self._wait = 0
+
+    # -------------------------
+    # Internals
+    # -------------------------
+    def _resize(self, grid_w, grid_h):
+        self.grid = (grid_w, grid_h)
+        self.neighbors = neighbor_table(grid_w, grid_h)
+        cells = grid_w * grid_h
+        self._seen = array("I", bytes(4 * cells))
+        self._parent = array("i", bytes(4 * cells))
+        self._stamp = 0
+        self.path = None
+
+    def _next_stamp(self):
+        self._stamp += 1
+        if self._stamp == 0xFFFFFFFF:
+            self._seen = array("I", bytes(4 * len(self._seen)))
+            self._stamp = 1
+        return self._stamp
+
+    def _follow(self, path, body, head, food_cell):
+        self.path, self.path_pos, self.path_food, self.path_head = path, 0, food_cell, head
+        return self._cached_step(body, head, food_cell)
+
+    def _cached_step(self, body, head, food_cell):
+        path = self.path
+        if path is None or food_cell != self.path_food or head != self.path_head:
+            return None  # food moved, or the snake went elsewhere (restart, manual input)
+        pos = self.path_pos
+        if pos >= len(path):
+            return None
+        cell = path[pos]
+        if body.occupancy[cell] and cell != body.tail:
+            return None  # blocked
+        for n, d in self.neighbors[head]:
+            if n == cell:
+                self.path_pos = pos + 1
+                self.path_head = cell
+                return d
+        return None
+
+    def _bfs_path(self, body, start, goal):
+        """Shortest open path start -> goal (start excluded), or None."""
+        occupancy, tail = body.occupancy, body.tail
+        neighbors, seen, parent = self.neighbors, self._seen, self._parent
+        stamp = self._next_stamp()
+        self.plans += 1
+        seen[start] = stamp
+        queue = deque((start,))
+        pop, push = queue.popleft, queue.append
+        while queue:
+            cell = pop()
+            for n, _ in neighbors[cell]:
+                if seen[n] == stamp or (occupancy[n] and n != tail):
+                    continue
+                seen[n] = stamp
+                parent[n] = cell
+                if n == goal:
+                    path = [n]
+                    while parent[n] != start:
+                        n = parent[n]
+                        path.append(n)
+                    path.reverse()
+                    return path
+                push(n)
+        return None
+
+    def _reachable(self, occupied, start, goal):
+        """BFS distance start -> goal over cells not in occupied (goal allowed), or -1."""
+        if start == goal:
+            return 0
+        neighbors, seen = self.neighbors, self._seen
+        stamp = self._next_stamp()
+        seen[start] = stamp
+        frontier = [start]
+        dist = 0
+        while frontier:
+            dist += 1
+            nxt = []
+            for cell in frontier:
+                for n, _ in neighbors[cell]:
+                    if n == goal:
+                        return dist
+                    if seen[n] != stamp and not occupied[n]:
+                        seen[n] = stamp
+                        nxt.append(n)
+            frontier = nxt
+        return -1
+
+    def _safe_after(self, body, path):
+        """After following path and eating at its end, is the tail reachable?"""
+        length = body.length + 1
+        cells = path[::-1]
+        if len(cells) < length:
+            for cell in body:
+                cells.append(cell)
+                if len(cells) == length:
+                    break
+        else:
+            del cells[length:]
+        if length >= len(self._seen):
+            return True  # that bite fills the board
+        occupied = bytearray(len(self._seen))
+        for cell in cells:
+            occupied[cell] = 1
+        return self._reachable(occupied, cells[0], cells[-1]) >= 0
+
+    def _stall_move(self, body, head, food_cell, direction):
+        occupancy, tail = body.occupancy, body.tail
+        rx, ry = -direction[0], -direction[1]
+        best = fallback = None
+        best_dist = -1
+        for n, d in self.neighbors[head]:
+            if d == (rx, ry) or (occupancy[n] and n != tail):
+                continue
+            fallback = fallback or d
+            # One step: the tail leaves unless the snake eats
+            occupied = bytearray(body.occupancy)
+            occupied[n] = 1
+            new_tail = tail
+            if n != food_cell:
+                occupied[tail] = n == tail
+                new_tail = body.ring[body.tail_pos + 1 if body.tail_pos + 1 < body.capacity else 0]
+            dist = self._reachable(occupied, n, new_tail)
+            if dist > best_dist:
+                best, best_dist = d, dist
+        return best if best_dist >= 0 else fallback
+
+
+class HamiltonianAutopilot:
+    """Moves along a Hamiltonian cycle, cutting ahead where that is safe.
+
+    Number the cells by their position on the cycle. While the body lies in
+    cycle order from tail to head, every cell between the head and the tail
+    (going forward) is free, and moving to any of them keeps the order. So
+    each move picks the neighbor furthest forward on the cycle that passes
+    neither the food nor the tail; plain cycle following (one step forward)
+    is always available. The snake therefore never dies and reaches the food
+    within two laps, which ends every game in victory.
+
+    The body is checked against the cycle (in either direction) when a game
+    starts or the head turns up somewhere unexpected; if it is not in order
+    (manual play before switching on), the BFS Autopilot steers until it is.
+    Boards without a cycle (odd x odd, or one cell wide) raise ValueError on
+    the first call: the BFS Autopilot alone cannot guarantee progress on a
+    nearly full board, and on a one-wide board nothing reaches food that
+    lands behind the head.
+    """
+
+    def __init__(self, seed=None):
+        self.grid = None
+        self.neighbors = None
+        self.order = None       # cycle position of every cell
+        self.sign = 1           # +1 follows the cycle forwards, -1 backwards
+        self.ordered = False
+        self.expected_head = -1
+        self.fallback = Autopilot(seed)
+
+    def __call__(self, game):
+        if self.grid != (game.grid_w, game.grid_h):
+            self._resize(game.grid_w, game.grid_h)
+        body = game.body
+        head = body.head
+        if head != self.expected_head:
+            self.ordered = self.order is not None and self._orient(body)
+        if not self.ordered:
+            self.expected_head = -1
+            return self.fallback(game)
+
+        order, sign, n_cells = self.order, self.sign, len(self.order)
+        here = order[head]
+        # Cells forward of the head up to the tail are all free; shortcuts
+        # leave holes behind the head, and food there waits for the tail
+        # to pass
+        reach = sign * (order[body.tail] - here) % n_cells - 1
+        food = game.food
+        if food is not None:
+            reach = min(reach, sign * (order[food[1] * game.grid_w + food[0]] - here) % n_cells)
+        reach = max(reach, 1)
+        # Furthest neighbor forward within reach; the next cell on the cycle
+        # (ahead == 1, free or the departing tail) always qualifies
+        best = None
+        best_ahead = 0
+        for n, d in self.neighbors[head]:
+            ahead = sign * (order[n] - here) % n_cells
+            if best_ahead < ahead <= reach:
+                best, best_ahead = d, ahead
+                self.expected_head = n
+        return best
+
+    def drive(self, game):
+        d = self(game)
+        if d is not None:
+            game.set_direction(d)
+        return d
+
+    def reset(self):
+        self.expected_head = -1
+        self.fallback.reset()
+
+    def _resize(self, grid_w, grid_h):
+        self.grid = (grid_w, grid_h)
+        self.neighbors = neighbor_table(grid_w, grid_h)
+        self.expected_head = -1
+        if not has_hamiltonian_cycle(grid_w, grid_h):
+            raise ValueError(f"HamiltonianAutopilot needs a board with a Hamiltonian cycle, got {grid_w}x{grid_h} "
+                             "(both sides must be 2+ and one of them even)")
+        cycle = iter_hamiltonian_cycle(grid_w, grid_h)
+        self.order = array("i", bytes(4 * grid_w * grid_h))
+        for i, (x, y) in enumerate(cycle):
+            self.order[y * grid_w + x] = i
+
+    def _orient(self, body):
+        """Is the body in cycle order, forwards or backwards? Sets self.sign."""
+        order, n_cells = self.order, len(self.order)
+        positions = [order[cell] for cell in body]  # head first
+        for sign in (1, -1):
+            span = 0
+            for i in range(len(positions) - 1):
+                span += sign * (positions[i] - positions[i + 1]) % n_cells
+                if span >= n_cells:
+                    break
+            else:
+                self.sign = sign
+                return True
+        return False
+
+
+AUTOPILOTS = {
+    "bfs": Autopilot,
+    "hamiltonian": HamiltonianAutopilot,
+}
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Snake batch - N games stepped in lockstep with NumPy
+
+Every game lives in a row of a few arrays (occupancy grid, ring-buffer body,
+head/tail pointers, food cell, alive mask), and step() advances all of them
+with vectorized operations. The rules follow SnakeEngine / SnakeGame._move_once:
+- Walls kill, the tail cell may be entered because it is vacated this tick
+- Eating food grows the snake by one
+- Filling the whole grid is a victory
+
+Cells are flat indices (y * grid_w + x). Directions are indices into
+snake_engine.DIRECTIONS: 0=UP, 1=RIGHT, 2=DOWN, 3=LEFT.
+"""
+
+import numpy as np
+
+from snake_engine import GRID_W, GRID_H, DIRECTIONS
+
+DX = np.array([d[0] for d in DIRECTIONS], dtype=np.int64)
+DY = np.array([d[1] for d in DIRECTIONS], dtype=np.int64)
+RIGHT_INDEX = DIRECTIONS.index((1, 0))
+NO_ACTION = -1
+
+# Rejection-sampling rounds before falling back to an exact free-cell scan
+FOOD_TRIES = 8
+
+
+class BatchSnakeEnv:
+    """n independent games on grid_w x grid_h boards.
+
+    Public arrays (one row / entry per game):
+    - grid: uint8 (n, grid_h * grid_w), 1 where the snake is
+    - body: int32 (n, grid_h * grid_w) ring buffer of cells, head at head_ptr
+    - head_ptr, tail_ptr, length, score: int64 (n,)
+    - direction: int64 (n,) direction index
+    - food: int64 (n,) food cell, -1 once the grid is full
+    - alive, victory: bool (n,)
+    """
+
+    def __init__(self, n, grid_w=GRID_W, grid_h=GRID_H, seed=None):
+        if grid_w < 4 or grid_h < 1:
+            raise ValueError(f"grid must be at least 4x1, got {grid_w}x{grid_h}")
+        self.n = n
+        self.grid_w = grid_w
+        self.grid_h = grid_h
+        self.cells = grid_w * grid_h
+        self.rng = np.random.default_rng(seed)
+
+        self.grid = np.zeros((n, self.cells), dtype=np.uint8)
+        self.body = np.zeros((n, self.cells), dtype=np.int32)
+        self.head_ptr = np.zeros(n, dtype=np.int64)
+        self.tail_ptr = np.zeros(n, dtype=np.int64)
+        self.length = np.zeros(n, dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.ticks = np.zeros(n, dtype=np.int64)
+        self.direction = np.zeros(n, dtype=np.int64)
+        self.head_x = np.zeros(n, dtype=np.int64)
+        self.head_y = np.zeros(n, dtype=np.int64)
+        self.food = np.zeros(n, dtype=np.int64)
+        self.alive = np.zeros(n, dtype=bool)
+        self.victory = np.zeros(n, dtype=bool)
+        self._rows = np.arange(n)
+
+        self.reset()
+
+    # -------------------------
+    # Reset
+    # -------------------------
+    def reset(self, mask=None):
+        """Start new games for the rows in mask (all rows by default)."""
+        rows = self._rows if mask is None else self._rows[np.asarray(mask, dtype=bool)]
+        if rows.size == 0:
+            return
+
+        sx, sy = self.grid_w // 2, self.grid_h // 2
+        start = sy * self.grid_w + sx
+        self.grid[rows] = 0
+        # Tail first in the ring, head at index 2
+        self.body[rows, 0] = start - 2
+        self.body[rows, 1] = start - 1
+        self.body[rows, 2] = start
+        self.grid[rows, start - 2:start + 1] = 1
+        self.head_ptr[rows] = 2
+        self.tail_ptr[rows] = 0
+        self.length[rows] = 3
+        self.score[rows] = 0
+        self.ticks[rows] = 0
+        self.direction[rows] = RIGHT_INDEX
+        self.head_x[rows] = sx
+        self.head_y[rows] = sy
+        self.alive[rows] = True
+        self.victory[rows] = False
+        self._spawn_food(rows)
+
+    # -------------------------
+    # Simulation
+    # -------------------------
+    def step(self, actions=None):
+        """Advance every live game by one move.
+
+        actions is an int array of direction indices, NO_ACTION (-1) keeps the
+        current heading; 180-degree reversals are ignored like set_direction().
+        Returns (ate, died) boolean arrays for this tick.
+        """
+        live = self._rows[self.alive]
+        ate = np.zeros(self.n, dtype=bool)
+        died = np.zeros(self.n, dtype=bool)
+        if live.size == 0:
+            return ate, died
+
+        direction = self.direction[live]
+        if actions is not None:
+            act = np.asarray(actions, dtype=np.int64)[live]
+            turn = (act >= 0) & (act != (direction + 2) % 4)
+            direction = np.where(turn, act, direction)
+            self.direction[live] = direction
+        self.ticks[live] += 1
+
+        nx = self.head_x[live] + DX[direction]
+        ny = self.head_y[live] + DY[direction]
+
+        # Wall collision
+        inside = (nx >= 0) & (nx < self.grid_w) & (ny >= 0) & (ny < self.grid_h)
+        cell = np.where(inside, ny * self.grid_w + nx, 0)
+
+        # Self collision (the tail cell is vacated unless the snake grows)
+        eats = inside & (cell == self.food[live])
+        tail_cell = self.body[live, self.tail_ptr[live]]
+        blocked = (self.grid[live, cell] == 1) & ~((cell == tail_cell) & ~eats)
+        dead = ~inside | blocked
+
+        died[live[dead]] = True
+        self.alive[live[dead]] = False
+
+        moving = ~dead
+        rows, cell, eats, tail_cell = live[moving], cell[moving], eats[moving], tail_cell[moving]
+        nx, ny = nx[moving], ny[moving]
+
+        # Normal move: pop tail (before placing the head, which may reuse it)
+        trim = rows[~eats]
+        self.grid[trim, tail_cell[~eats]] = 0
+        self.tail_ptr[trim] = (self.tail_ptr[trim] + 1) % self.cells
+
+        # Push new head
+        self.head_ptr[rows] = (self.head_ptr[rows] + 1) % self.cells
+        self.body[rows, self.head_ptr[rows]] = cell
+        self.grid[rows, cell] = 1
+        self.head_x[rows] = nx
+        self.head_y[rows] = ny
+
+        grown = rows[eats]
+        if grown.size:
+            ate[grown] = True
+            self.length[grown] += 1
+            self.score[grown] += 1
+
+            # Grid full => win
+            full = self.length[grown] >= self.cells
+            won = grown[full]
+            self.food[won] = -1
+            self.victory[won] = True
+            self.alive[won] = False
+            self._spawn_food(grown[~full])
+        return ate, died
+
+    def _spawn_food(self, rows):
+        """Put food on a uniformly random free cell for each row."""
+        pending = rows
+        for _ in range(FOOD_TRIES):
+            if pending.size == 0:
+                return
+            pick = self.rng.integers(0, self.cells, size=pending.size)
+            free = self.grid[pending, pick] == 0
+            self.food[pending[free]] = pick[free]
+            pending = pending[~free]
+
+        # Crowded boards: choose among the actual free cells
+        for row in pending:
+            free_cells = np.flatnonzero(self.grid[row] == 0)
+            if free_cells.size == 0:
+                self.food[row] = -1  # no space
+            else:
+                self.food[row] = free_cells[self.rng.integers(free_cells.size)]
+
+    # -------------------------
+    # Inspection
+    # -------------------------
+    def boards(self):
+        """Occupancy as an (n, grid_h, grid_w) view (no copy)."""
+        return self.grid.reshape(self.n, self.grid_h, self.grid_w)
+
+    def snake(self, i):
+        """Body of game i as (x, y) cells, head first (like SnakeEngine.snake)."""
+        idx = (self.head_ptr[i] - np.arange(self.length[i])) % self.cells
+        cells = self.body[i, idx]
+        return [(int(c) % self.grid_w, int(c) // self.grid_w) for c in cells]
+
+    def food_xy(self, i):
+        """Food of game i as an (x, y) cell, or None once the grid is full."""
+        f = int(self.food[i])
+        return None if f < 0 else (f % self.grid_w, f // self.grid_w)
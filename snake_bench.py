@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+"""
+Snake bench - performance comparison of the snake_*.py variants
+
+Each variant runs in its own headless process (SDL_VIDEODRIVER=dummy) with:
+- a virtual clock: Clock.tick(fps) returns 1000 / fps ms at once instead of
+  sleeping, so a run measures work, not waiting
+- scripted input: seeded random arrow keys (plus R to restart), the same
+  script for every variant
+
+Reported per run:
+- ticks_per_sec: simulation moves per wall-clock second
+- frame_ms: p50 / p95 / p99 / max time between presented frames
+- startup_ms: process spawn to first presented frame
+- peak_rss_kib: peak resident set size of the process
+- alloc: tracemalloc over a trailing window of frames; "kib_per_tick" is the
+  per-frame allocation high-water mark above the frame's starting memory,
+  "blocks_per_tick" the growth in live blocks (should be ~0)
+
+Variants whose board can be resized and whose game state can be reached
+(see ADAPTERS) also support scaling runs over board size and snake length.
+In those runs the snake is laid out along a Hamiltonian cycle and steered
+along it, so it survives at any length.
+
+Usage:
+    python snake_bench.py
+    python snake_bench.py --frames 1200 --variants snake_gpt5.2_thinking.py
+    python snake_bench.py --boards 30x20,60x40,120x80 --lengths 3,200,2000
+    python snake_bench.py --json bench.json
+"""
+
+import argparse
+import glob
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from snake_autopilot import hamiltonian_cycle
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ENTRY_POINTS = ("main", "game_loop")
+DEFAULT_FRAMES = 600
+DEFAULT_ALLOC_FRAMES = 120
+DEFAULT_TIMEOUT_S = 300
+
+
+# -----------------------------
+# Helpers
+# -----------------------------
+def percentile(values, p):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    k = max(0, min(len(ordered) - 1, int(round(p / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[k]
+
+
+def discover_variants():
+    return sorted(os.path.basename(p) for p in glob.glob(os.path.join(HERE, "snake_gpt*.py")))
+
+
+# -----------------------------
+# Adapters (scaling support)
+# -----------------------------
+class Adapter:
+    """Reaches into a variant to resize its board and read/seed its game.
+
+    install() runs after the module is imported and before its entry point.
+    game_view() returns (grid_w, grid_h, head_xy, alive) or None; ticks()
+    returns the simulation move count, or None when the variant keeps none.
+    """
+
+    def ticks(self):
+        return None
+
+    def resize(self, module, w, h):
+        raise NotImplementedError
+
+    def install(self, module, seed, length, on_new_game):
+        raise NotImplementedError
+
+    def game_view(self):
+        return None
+
+
+class ThinkingAdapter(Adapter):
+    """snake_gpt5.2_thinking.py: SnakeGame is a SnakeEngine sized by BOARD_* (the
+    window keeps its size and scrolls over bigger boards)."""
+
+    def __init__(self):
+        self.game = None
+        self._ticks = 0  # moves made by earlier games
+
+    def ticks(self):
+        return 0 if self.game is None else self._ticks + self.game.ticks
+
+    def resize(self, module, w, h):
+        module.BOARD_W, module.BOARD_H = w, h
+
+    def install(self, module, seed, length, on_new_game):
+        adapter = self
+        module.SnakeGame.__init__.__defaults__ = (seed,)
+        reset = module.SnakeGame.reset
+
+        def bench_reset(game, *args, **kwargs):
+            if adapter.game is game:
+                adapter._ticks += game.ticks
+            reset(game, *args, **kwargs)
+            adapter.game = game
+            if length > 3:
+                adapter.preload(length, on_new_game(game.grid_w, game.grid_h))
+
+        module.SnakeGame.reset = bench_reset
+
+    def preload(self, length, cycle):
+        game = self.game
+        cells = [y * game.grid_w + x for x, y in cycle[:length]]
+        game.body.clear()
+        for cell in cells:
+            game.body.push_head(cell)
+        (px, py), (hx, hy) = cycle[length - 2], cycle[length - 1]
+        game.head_x, game.head_y = hx, hy
+        game.direction = game.next_direction = (hx - px, hy - py)
+        game._place_food()
+
+    def game_view(self):
+        g = self.game
+        if g is None:
+            return None
+        return g.grid_w, g.grid_h, (g.head_x, g.head_y), g.alive
+
+
+class AutoAdapter(Adapter):
+    """snake_gpt5.2_auto.py: dict state from new_game_state(), board from GRID_*."""
+
+    def __init__(self):
+        self.module = None
+        self.state = None
+        self._ticks = 0  # moves made so far (the loop runs on a fixed timestep)
+
+    def ticks(self):
+        return self._ticks
+
+    def resize(self, module, w, h):
+        module.GRID_W, module.GRID_H = w, h
+        module.WIDTH, module.HEIGHT = w * module.CELL_SIZE, h * module.CELL_SIZE
+
+    def install(self, module, seed, length, on_new_game):
+        adapter = self
+        self.module = module
+        new_game_state = module.new_game_state
+
+        def bench_new_game_state():
+            state = adapter.state = new_game_state()
+            if length > 3:
+                adapter.preload(length, on_new_game(module.GRID_W, module.GRID_H))
+            return state
+
+        module.new_game_state = bench_new_game_state
+        tick = module.tick
+
+        def bench_tick(state):
+            adapter._ticks += 1
+            return tick(state)
+
+        module.tick = bench_tick
+
+    def preload(self, length, cycle):
+        m, state = self.module, self.state
+        body = state["body"] = m.SnakeBody(m.GRID_W, m.GRID_H)
+        for x, y in cycle[:length]:
+            body.push_head(y * m.GRID_W + x)
+        (px, py), (hx, hy) = cycle[length - 2], cycle[length - 1]
+        state["direction"] = state["pending_dir"] = (hx - px, hy - py)
+        state["food"] = m.spawn_food(body)
+
+    def game_view(self):
+        if self.state is None:
+            return None
+        m, body = self.module, self.state["body"]
+        return m.GRID_W, m.GRID_H, (body.head % m.GRID_W, body.head // m.GRID_W), self.state["alive"]
+
+
+ADAPTERS = {
+    "snake_gpt5.2_thinking.py": ThinkingAdapter,
+    "snake_gpt5.2_auto.py": AutoAdapter,
+}
+
+
+# -----------------------------
+# Child: one instrumented run
+# -----------------------------
+def run_child(cfg):
+    """Run one variant in this process and return its metrics dict."""
+    import resource
+    import tracemalloc
+    import pygame
+
+    frames_target = cfg["frames"]
+    alloc_frames = cfg["alloc_frames"]
+    adapter = ADAPTERS[cfg["variant"]]() if cfg["variant"] in ADAPTERS else None
+    random.seed(cfg["seed"])
+    keys_rng = random.Random(cfg["seed"] + 1)
+    board = cfg.get("board")
+    length = cfg.get("length") or 3
+
+    # Virtual clock
+    clock_state = {"now": 0.0}
+
+    class VirtualClock:
+        def __init__(self):
+            self._dt = 0
+
+        def tick(self, framerate=0):
+            self._dt = int(1000 / framerate) if framerate else 16
+            clock_state["now"] += self._dt
+            return self._dt
+
+        tick_busy_loop = tick
+
+        def get_time(self):
+            return self._dt
+
+        get_rawtime = get_time
+
+        def get_fps(self):
+            return 1000 / self._dt if self._dt else 0.0
+
+    pygame.time.Clock = VirtualClock
+    pygame.time.get_ticks = lambda: int(clock_state["now"])
+    pygame.time.delay = pygame.time.wait = lambda ms: clock_state.__setitem__("now", clock_state["now"] + ms) or ms
+
+    # Cycle steering for scaling runs
+    steer = {}
+
+    def on_new_game(w, h):
+        cycle = steer.get((w, h))
+        if cycle is None:
+            cycle = steer[(w, h)] = hamiltonian_cycle(w, h)
+            steer[(w, h, "next")] = {cycle[i - 1]: cycle[i] for i in range(len(cycle))}
+        if length >= w * h:
+            raise ValueError(f"snake length {length} does not fit a {w}x{h} board")
+        return cycle
+
+    arrows = {(0, -1): pygame.K_UP, (0, 1): pygame.K_DOWN, (-1, 0): pygame.K_LEFT, (1, 0): pygame.K_RIGHT}
+
+    def key(k):
+        return pygame.event.Event(pygame.KEYDOWN, key=k, mod=0, unicode="", scancode=0)
+
+    # Scripted input
+    stats = {"frames": 0, "flips": 0, "polls": 0, "first_frame": None, "last": None}
+    frame_ms = []
+    alloc = {"peak_bytes": 0, "blocks_start": 0, "ticks_start": 0, "frames": 0}
+
+    def script():
+        view = adapter.game_view() if (adapter and (board or length > 3)) else None
+        if view is not None:
+            w, h, head, alive = view
+            if not alive:
+                return [key(pygame.K_r)]
+            nxt = steer.get((w, h, "next"), {}).get(head)
+            if nxt is None:
+                return []
+            return [key(arrows[(nxt[0] - head[0], nxt[1] - head[1])])]
+        if keys_rng.random() < 0.15:
+            return [key(keys_rng.choice((pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT, pygame.K_r)))]
+        return []
+
+    def poll(*args, **kwargs):
+        stats["polls"] += 1
+        if stats["frames"] >= frames_target + alloc_frames or stats["polls"] > 50 * (frames_target + alloc_frames):
+            return [pygame.event.Event(pygame.QUIT)]
+        return script()
+
+    pygame.event.get = poll
+    pygame.event.poll = lambda: (poll() or [pygame.event.Event(pygame.NOEVENT)])[0]
+    pygame.event.wait = lambda *a: (poll() or [pygame.event.Event(pygame.NOEVENT)])[0]
+
+    def ticks_now():
+        # Variants without an engine move once per presented frame
+        ticks = adapter.ticks() if adapter else None
+        return stats["frames"] if ticks is None else ticks
+
+    def on_present():
+        now = time.perf_counter()
+        frames = stats["frames"] = stats["frames"] + 1
+        if frames == 1:
+            stats["first_frame"] = time.time()
+            stats["timed_start"] = now
+            stats["timed_ticks_start"] = ticks_now()
+        elif frames <= frames_target:
+            frame_ms.append((now - stats["last"]) * 1000)
+            if frames == frames_target:
+                stats["timed_s"] = now - stats["timed_start"]
+                stats["timed_ticks"] = ticks_now() - stats["timed_ticks_start"]
+                if alloc_frames:
+                    tracemalloc.start()
+                    alloc["blocks_start"] = sys.getallocatedblocks()
+                    alloc["ticks_start"] = ticks_now()
+        elif tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            alloc["peak_bytes"] += max(0, peak - alloc["frame_start"])
+            alloc["frames"] += 1
+
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            alloc["frame_start"] = tracemalloc.get_traced_memory()[0]
+        stats["last"] = time.perf_counter()
+
+    flip, update = pygame.display.flip, pygame.display.update
+
+    def bench_flip():
+        flip()
+        on_present()
+
+    def bench_update(*args):
+        update(*args)
+        on_present()
+
+    pygame.display.flip = bench_flip
+    pygame.display.update = bench_update
+
+    # Import and run
+    import importlib.util
+    sys.path.insert(0, HERE)
+    path = os.path.join(HERE, cfg["variant"])
+    spec = importlib.util.spec_from_file_location("bench_variant", path)
+    module = importlib.util.module_from_spec(spec)
+    error = None
+    try:
+        spec.loader.exec_module(module)
+        if adapter:
+            if board:
+                adapter.resize(module, *board)
+            adapter.install(module, cfg["seed"], length, on_new_game)
+        for name in ENTRY_POINTS:
+            if callable(getattr(module, name, None)):
+                getattr(module, name)()
+                break
+    except SystemExit:
+        pass
+    except Exception as e:  # report, don't crash the whole sweep
+        error = f"{type(e).__name__}: {e}"
+
+    alloc_ticks = ticks_now() - alloc["ticks_start"] if tracemalloc.is_tracing() else 0
+    blocks = sys.getallocatedblocks() - alloc["blocks_start"] if tracemalloc.is_tracing() else 0
+    tracemalloc.stop()
+
+    timed_s = stats.get("timed_s") or (stats["last"] - stats["timed_start"] if stats.get("timed_start") else 0)
+    timed_ticks = stats.get("timed_ticks")
+    if timed_ticks is None and stats.get("timed_start"):
+        timed_ticks = ticks_now() - stats["timed_ticks_start"]
+    result = {
+        "variant": cfg["variant"],
+        "board": "x".join(map(str, board)) if board else "native",
+        "length": length,
+        "frames": len(frame_ms),
+        "ticks": timed_ticks or 0,
+        "ticks_per_sec": round((timed_ticks or 0) / timed_s, 1) if timed_s else 0.0,
+        "frames_per_sec": round(len(frame_ms) / timed_s, 1) if timed_s else 0.0,
+        "frame_ms": {
+            "p50": round(percentile(frame_ms, 50), 3),
+            "p95": round(percentile(frame_ms, 95), 3),
+            "p99": round(percentile(frame_ms, 99), 3),
+            "max": round(max(frame_ms), 3),
+        } if frame_ms else None,
+        "first_frame_time": stats["first_frame"],
+        "peak_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "alloc": {
+            "kib_per_tick": round(alloc["peak_bytes"] / 1024 / alloc_ticks, 3) if alloc_ticks else None,
+            "blocks_per_tick": round(blocks / alloc_ticks, 3) if alloc_ticks else None,
+        },
+        "error": error,
+    }
+    return result
+
+
+# -----------------------------
+# Parent: spawn and report
+# -----------------------------
+def run_variant(variant, frames, alloc_frames, seed, board=None, length=None, timeout=DEFAULT_TIMEOUT_S):
+    cfg = {"variant": variant, "frames": frames, "alloc_frames": alloc_frames,
+           "seed": seed, "board": board, "length": length}
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+    with tempfile.NamedTemporaryFile("r", suffix=".json") as out:
+        started = time.time()
+        try:
+            proc = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--child", json.dumps(cfg), "--child-out", out.name],
+                env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, timeout=timeout,
+            )
+        except subprocess.TimeoutExpired:
+            return dict(cfg, board="x".join(map(str, board)) if board else "native", error=f"timeout after {timeout}s")
+        try:
+            result = json.load(out)
+        except ValueError:
+            tail = proc.stderr.strip().splitlines()[-1:] or [f"exit code {proc.returncode}"]
+            return dict(cfg, board="x".join(map(str, board)) if board else "native", error=tail[0])
+    first = result.pop("first_frame_time")
+    result["startup_ms"] = round((first - started) * 1000, 1) if first else None
+    return result
+
+
+def format_table(results):
+    headers = ("variant", "board", "len", "ticks/s", "fps", "p50 ms", "p95 ms", "p99 ms",
+               "startup ms", "rss MiB", "KiB/tick", "error")
+    rows = []
+    for r in results:
+        fm = r.get("frame_ms") or {}
+        alloc = r.get("alloc") or {}
+        rows.append((
+            r["variant"], r.get("board", ""), str(r.get("length") or 3),
+            f"{r.get('ticks_per_sec', 0):.0f}", f"{r.get('frames_per_sec', 0):.0f}",
+            f"{fm.get('p50', 0):.2f}", f"{fm.get('p95', 0):.2f}", f"{fm.get('p99', 0):.2f}",
+            f"{r.get('startup_ms') or 0:.0f}", f"{(r.get('peak_rss_kib') or 0) / 1024:.1f}",
+            "-" if alloc.get("kib_per_tick") is None else f"{alloc['kib_per_tick']:.2f}",
+            r.get("error") or "",
+        ))
+    widths = [max(len(h), *(len(row[i]) for row in rows)) if rows else len(h) for i, h in enumerate(headers)]
+    lines = ["  ".join(h.ljust(w) for h, w in zip(headers, widths)),
+             "  ".join("-" * w for w in widths)]
+    lines += ["  ".join(c.ljust(w) for c, w in zip(row, widths)) for row in rows]
+    return "\n".join(lines)
+
+
+def parse_board(text):
+    w, h = text.lower().split("x")
+    return int(w), int(h)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the snake variants headless.")
+    parser.add_argument("--variants", nargs="*", help="variant files (default: all snake_gpt*.py)")
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES, help="timed frames per run")
+    parser.add_argument("--alloc-frames", type=int, default=DEFAULT_ALLOC_FRAMES,
+                        help="extra frames measured with tracemalloc on (0 to skip)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--boards", help="scaling sweep over board sizes, e.g. 30x20,60x40")
+    parser.add_argument("--lengths", help="scaling sweep over starting snake lengths, e.g. 3,100,1000")
+    parser.add_argument("--timeout", type=int, default=DEFAULT_TIMEOUT_S, help="seconds per run")
+    parser.add_argument("--json", help="also write results to this file ('-' for stdout)")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--child-out", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        result = run_child(json.loads(args.child))
+        with open(args.child_out, "w") as f:
+            json.dump(result, f)
+        return 0
+
+    variants = args.variants or discover_variants()
+    boards = [parse_board(b) for b in args.boards.split(",")] if args.boards else [None]
+    lengths = [int(n) for n in args.lengths.split(",")] if args.lengths else [None]
+    scaling = args.boards or args.lengths
+
+    results = []
+    for variant in variants:
+        if scaling and variant not in ADAPTERS:
+            print(f"skipping {variant}: no scaling adapter", file=sys.stderr)
+            continue
+        for board in boards:
+            for length in lengths:
+                r = run_variant(variant, args.frames, args.alloc_frames, args.seed, board, length, args.timeout)
+                results.append(r)
+                print(f"done {variant} board={r.get('board')} length={length or 3}", file=sys.stderr)
+
+    if args.json == "-":
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    else:
+        print(format_table(results))
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
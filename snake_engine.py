@@ -0,0 +1,504 @@
+#!/usr/bin/env python3
+"""
+Snake engine - headless simulation core (no pygame)
+
+The rules are the ones SnakeGame in snake_gpt5.2_thinking.py was written with:
+- Walls kill, the snake may move into the cell its tail is leaving
+- Eating food grows the snake by one and speeds it up
+- Filling the whole grid is a victory
+
+Grid size, RNG seed and speed schedule are constructor arguments instead of
+module globals, so bots and regression sims can step games without importing
+pygame.
+
+Cells are flat indices (y * grid_w + x). The body is a fixed-capacity ring
+buffer plus a bytearray occupancy grid, so head push, tail pop and collision
+lookup are O(1) whatever the snake length. A swap-remove index of the free
+cells rides along, so food placement is O(1) at any fill level too.
+
+Turns are queued: set_direction() appends to a short queue (TURN_QUEUE)
+and every tick takes at most one turn from it, so two quick presses within
+one tick (a U-turn around a wall, say) become two moves instead of the
+first being overwritten. Each turn is checked against the one queued
+before it, so a 180 is still impossible however fast the keys come.
+
+fork() copies a game in O(1) for lookahead search: the copy shares the body
+arrays and the food RNG with the original until one of them writes to them
+(copy-on-write). snapshot() / restore() use the same sharing to save and
+rewind a game.
+"""
+
+import random
+import weakref
+from array import array
+from collections import deque
+
+# -----------------------------
+# Config
+# -----------------------------
+GRID_W, GRID_H = 30, 20
+FPS_BASE = 10  # starting speed (moves per second)
+FPS_STEP = 1   # speed increment per food eaten
+FPS_MAX = 35   # speed cap
+TURN_QUEUE = 3  # turns buffered ahead of the snake; later presses are dropped
+
+# Directions
+UP = (0, -1)
+DOWN = (0, 1)
+LEFT = (-1, 0)
+RIGHT = (1, 0)
+DIRECTIONS = (UP, RIGHT, DOWN, LEFT)
+
+
+# -----------------------------
+# Free cells
+# -----------------------------
+class FreeCells:
+    """The free cells of a grid, with O(1) add, remove and uniform sampling.
+
+    `cells[:count]` are the free cells in no particular order and
+    `slot[cell]` is each cell's position in `cells`. Removing swaps the cell
+    with the last free one and shrinks count; adding swaps it back in.
+    """
+
+    __slots__ = ("cells", "slot", "count")
+
+    def __init__(self, capacity):
+        self.cells = array("i", range(capacity))
+        self.slot = array("i", range(capacity))
+        self.count = capacity
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, cell):
+        return self.slot[cell] < self.count
+
+    def copy(self):
+        new = FreeCells.__new__(FreeCells)
+        new.cells = self.cells[:]
+        new.slot = self.slot[:]
+        new.count = self.count
+        return new
+
+    def remove(self, cell):
+        cells, slot = self.cells, self.slot
+        i = slot[cell]
+        last = self.count - 1
+        moved = cells[last]
+        cells[i] = moved
+        slot[moved] = i
+        cells[last] = cell
+        slot[cell] = last
+        self.count = last
+
+    def add(self, cell):
+        cells, slot = self.cells, self.slot
+        i = slot[cell]
+        first = self.count
+        moved = cells[first]
+        cells[i] = moved
+        slot[moved] = i
+        cells[first] = cell
+        slot[cell] = first
+        self.count = first + 1
+
+    def sample(self, rng=random):
+        """A uniformly random free cell, or -1 if there is none."""
+        if not self.count:
+            return -1
+        return self.cells[rng.randrange(self.count)]
+
+
+# -----------------------------
+# Body
+# -----------------------------
+class SnakeBody:
+    """Snake cells in a ring buffer, with a flat occupancy grid for lookups.
+
+    The ring holds grid_w * grid_h cell indices, which is the longest a snake
+    can ever get, so pushes never reallocate. `free` tracks every cell the
+    body does not cover.
+    """
+
+    __slots__ = ("grid_w", "capacity", "ring", "occupancy", "free", "head_pos", "tail_pos", "length")
+
+    def __init__(self, grid_w, grid_h):
+        self.grid_w = grid_w
+        self.capacity = grid_w * grid_h
+        self.ring = array("i", bytes(4 * self.capacity))
+        self.occupancy = bytearray(self.capacity)
+        self.free = FreeCells(self.capacity)
+        self.head_pos = self.capacity - 1
+        self.tail_pos = 0
+        self.length = 0
+
+    def copy(self):
+        """An independent copy: one memcpy per array, no per-cell work."""
+        new = SnakeBody.__new__(SnakeBody)
+        new.grid_w = self.grid_w
+        new.capacity = self.capacity
+        new.ring = self.ring[:]
+        new.occupancy = self.occupancy[:]
+        new.free = self.free.copy()
+        new.head_pos = self.head_pos
+        new.tail_pos = self.tail_pos
+        new.length = self.length
+        return new
+
+    def clear(self):
+        occupancy, free = self.occupancy, self.free
+        for cell in self:
+            occupancy[cell] = 0
+            free.add(cell)
+        self.head_pos = self.capacity - 1
+        self.tail_pos = 0
+        self.length = 0
+
+    def push_head(self, cell):
+        pos = self.head_pos + 1
+        if pos == self.capacity:
+            pos = 0
+        self.head_pos = pos
+        self.ring[pos] = cell
+        self.occupancy[cell] = 1
+        self.free.remove(cell)
+        self.length += 1
+
+    def pop_tail(self):
+        pos = self.tail_pos
+        cell = self.ring[pos]
+        self.occupancy[cell] = 0
+        self.free.add(cell)
+        pos += 1
+        self.tail_pos = 0 if pos == self.capacity else pos
+        self.length -= 1
+        return cell
+
+    def advance(self, cell):
+        """Move without growing: pop the tail and push cell as the new head.
+
+        Same result as pop_tail() + push_head(cell) in one call; the vacated
+        tail cell and the new head simply trade places in the free index.
+        """
+        ring, cap = self.ring, self.capacity
+        pos = self.tail_pos
+        tail = ring[pos]
+        pos += 1
+        self.tail_pos = 0 if pos == cap else pos
+        pos = self.head_pos + 1
+        if pos == cap:
+            pos = 0
+        self.head_pos = pos
+        ring[pos] = cell
+
+        if cell != tail:
+            occupancy = self.occupancy
+            occupancy[tail] = 0
+            occupancy[cell] = 1
+            cells, slot = self.free.cells, self.free.slot
+            i, j = slot[cell], slot[tail]
+            cells[i] = tail
+            slot[tail] = i
+            cells[j] = cell
+            slot[cell] = j
+        return tail
+
+    @property
+    def head(self):
+        return self.ring[self.head_pos]
+
+    @property
+    def tail(self):
+        return self.ring[self.tail_pos]
+
+    def __len__(self):
+        return self.length
+
+    def __contains__(self, cell):
+        return self.occupancy[cell] == 1
+
+    def __iter__(self):
+        """Cells from head to tail."""
+        ring, pos, cap = self.ring, self.head_pos, self.capacity
+        for _ in range(self.length):
+            yield ring[pos]
+            pos = pos - 1 if pos else cap - 1
+
+    def xy(self):
+        """(x, y) cells from head to tail."""
+        w = self.grid_w
+        return [(c % w, c // w) for c in self]
+
+
+# -----------------------------
+# Engine
+# -----------------------------
+def _add_sharer(sharers, owner, game):
+    """The sharers list of owner's body or RNG (a new one if None) with game added."""
+    if sharers is None:
+        return [weakref.ref(owner), weakref.ref(game)]
+    n = len(sharers)
+    if n >= 64 and not n & (n - 1):
+        # Forks dropped before any sharer moves leave dead references behind
+        sharers[:] = [ref for ref in sharers if ref() is not None]
+    sharers.append(weakref.ref(game))
+    return sharers
+
+
+class SnakeEngine:
+    """One game of Snake on a grid_w x grid_h board.
+
+    `snake` lists the body as (x, y) cells, head first; `body` is the
+    underlying SnakeBody. Call `tick()` to make one move, or `step(dt_ms)` to
+    advance by wall-clock time using the speed schedule (fps_base +
+    score * fps_step, capped at fps_max).
+
+    `body` and `rng` may be shared with forks (see fork()), so change them
+    only through tick() and reset(). A shared body is copied by the first
+    move that writes to it, so read `body` again after tick() instead of
+    holding on to it across moves.
+    """
+
+    # Everything restore() copies besides the body, the RNG and the turn queue
+    STATE = ("head_x", "head_y", "direction", "next_direction", "score", "ticks", "alive", "victory",
+             "food_cell", "food", "speed_fps", "move_interval_ms", "_accum_ms", "seed")
+
+    def __init__(self, grid_w=GRID_W, grid_h=GRID_H, seed=None,
+                 fps_base=FPS_BASE, fps_step=FPS_STEP, fps_max=FPS_MAX):
+        if grid_w < 4 or grid_h < 1:
+            raise ValueError(f"grid must be at least 4x1, got {grid_w}x{grid_h}")
+        self.grid_w = grid_w
+        self.grid_h = grid_h
+        self.fps_base = fps_base
+        self.fps_step = fps_step
+        self.fps_max = fps_max
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.body = SnakeBody(grid_w, grid_h)
+        self.turns = deque()  # queued turns, oldest first (see set_direction)
+        # While shared with forks: weak references to the games sharing it, else None
+        self._body_sharers = None
+        self._rng_sharers = None
+        self.reset()
+
+    def reset(self, seed=None):
+        """Start a new game. Passing a seed reseeds the food RNG first."""
+        if seed is not None:
+            if self._rng_sharers is not None:
+                self._own_rng()
+            self.seed = seed
+            self.rng.seed(seed)
+
+        self.head_x, self.head_y = self.grid_w // 2, self.grid_h // 2
+        start = self.head_y * self.grid_w + self.head_x
+        if self._body_sharers is not None:
+            self._own_body()
+        body = self.body
+        body.clear()
+        for cell in (start - 2, start - 1, start):
+            body.push_head(cell)
+
+        self.direction = RIGHT
+        self.next_direction = RIGHT
+        self.turns.clear()
+        self.score = 0
+        self.ticks = 0
+        self.alive = True
+        self.victory = False
+        self._place_food()
+        self.speed_fps = self.speed_for_score(0)
+
+        # Movement pacing independent from the caller's frame rate
+        self.move_interval_ms = int(1000 / self.speed_fps)
+        self._accum_ms = 0
+
+    @property
+    def snake(self):
+        """Body as (x, y) cells, head first."""
+        return self.body.xy()
+
+    @property
+    def head(self):
+        return (self.head_x, self.head_y)
+
+    # -------------------------
+    # Input
+    # -------------------------
+    def set_direction(self, d):
+        """Queue a turn for a coming tick. Returns False when it is dropped.
+
+        The turn is checked against the last queued one (or the current
+        direction): a reversal or a repeat is ignored, and so is any turn
+        once TURN_QUEUE are waiting.
+        """
+        turns = self.turns
+        dx, dy = d
+        cx, cy = turns[-1] if turns else self.direction
+        # Prevent 180-degree reversal
+        if (dx, dy) == (-cx, -cy) or (dx, dy) == (cx, cy) or len(turns) >= TURN_QUEUE:
+            return False
+        turns.append(d)
+        return True
+
+    # -------------------------
+    # Speed schedule
+    # -------------------------
+    def speed_for_score(self, score):
+        """Moves per second at the given score. Override for other schedules."""
+        return max(self.fps_base, min(self.fps_max, self.fps_base + score * self.fps_step))
+
+    def _update_speed(self):
+        self.speed_fps = self.speed_for_score(self.score)
+        self.move_interval_ms = int(1000 / self.speed_fps)
+
+    # -------------------------
+    # Simulation
+    # -------------------------
+    def step(self, dt_ms):
+        """Advance by dt_ms of game time, making as many moves as are due."""
+        if not self.alive:
+            return
+
+        self._accum_ms += dt_ms
+        while self._accum_ms >= self.move_interval_ms and self.alive:
+            self._accum_ms -= self.move_interval_ms
+            self.tick()
+
+    def run(self, n):
+        """Make up to n moves (fewer if the game ends). Returns moves made."""
+        tick = self.tick
+        done = 0
+        while done < n and self.alive:
+            tick()
+            done += 1
+        return done
+
+    def tick(self):
+        """Make exactly one move. Returns False once the game is over."""
+        if not self.alive:
+            return False
+
+        if self.turns:
+            self.next_direction = self.turns.popleft()
+        self.direction = dx, dy = self.next_direction
+        x = self.head_x + dx
+        y = self.head_y + dy
+        self.ticks += 1
+
+        # Wall collision
+        if not (0 <= x < self.grid_w and 0 <= y < self.grid_h):
+            self.alive = False
+            return False
+
+        # Self collision (moving into the tail is allowed, it moves away)
+        cell = y * self.grid_w + x
+        body = self.body
+        if body.occupancy[cell] and cell != body.ring[body.tail_pos]:
+            self.alive = False
+            return False
+
+        if self._body_sharers is not None:
+            self._own_body()
+            body = self.body
+        self.head_x = x
+        self.head_y = y
+        if cell != self.food_cell:
+            # Normal move: pop tail, push head
+            body.advance(cell)
+            return True
+
+        body.push_head(cell)
+        self.score += 1
+        self._update_speed()
+
+        self._place_food()
+        if self.food is None:
+            # Grid full => win
+            self.victory = True
+            self.alive = False
+            return False
+        return True
+
+    def _place_food(self):
+        self.food_cell = cell = self._random_free_cell()
+        self.food = None if cell < 0 else (cell % self.grid_w, cell // self.grid_w)
+
+    def _random_free_cell(self):
+        if self._rng_sharers is not None:
+            self._own_rng()
+        return self.body.free.sample(self.rng)  # -1 when there is no space
+
+    # -------------------------
+    # Forks and snapshots
+    # -------------------------
+    def fork(self):
+        """An independent copy of the game, made in O(1).
+
+        The copy shares the body and the RNG with this game (and any other
+        fork of it) until one of them writes: the first move of a sharer
+        copies the body arrays, one memcpy each (O(grid_w * grid_h)), and the
+        RNG is copied only when food is placed. Moves of one game never show
+        in another.
+
+        Sharers are tracked with weak references, so only live games count:
+        a fork that is dropped without moving costs this game nothing, and
+        neither does one that has since moved (it already has its own copy).
+        """
+        child = object.__new__(type(self))
+        child.__dict__.update(self.__dict__)
+        child.turns = deque(self.turns)
+        self._share_with(child)
+        return child
+
+    def snapshot(self):
+        """The current state, to restore() later (any number of times)."""
+        return self.fork()
+
+    def restore(self, snapshot):
+        """Put the game back in the state of a snapshot() or fork, in O(1)."""
+        if (snapshot.grid_w, snapshot.grid_h) != (self.grid_w, self.grid_h):
+            raise ValueError(f"snapshot is for a {snapshot.grid_w}x{snapshot.grid_h} board, "
+                             f"this game is {self.grid_w}x{self.grid_h}")
+        if snapshot is self:
+            return
+        for name in self.STATE:
+            setattr(self, name, getattr(snapshot, name))
+        self.turns = deque(snapshot.turns)
+        # Our old body and RNG need no release: sharers that no longer
+        # hold them are dropped when the next owner checks (_still_shared)
+        snapshot._share_with(self)
+
+    def _share_with(self, other):
+        other.body, other.rng = self.body, self.rng
+        other._body_sharers = self._body_sharers = _add_sharer(self._body_sharers, self, other)
+        other._rng_sharers = self._rng_sharers = _add_sharer(self._rng_sharers, self, other)
+
+    def _still_shared(self, sharers, name):
+        """Whether another live game still uses our `name` object.
+
+        Prunes sharers down to those games, in place: the list is shared by
+        all of them. Games that were freed, or that moved on to their own
+        copy or to a restored snapshot, drop out, and so does this one.
+        """
+        mine = getattr(self, name)
+        live = []
+        for ref in sharers:
+            game = ref()
+            if game is not None and game is not self and getattr(game, name) is mine:
+                live.append(ref)
+        sharers[:] = live
+        return bool(live)
+
+    def _own_body(self):
+        """Stop sharing the body, copying it if another live game still uses it."""
+        sharers, self._body_sharers = self._body_sharers, None
+        if self._still_shared(sharers, "body"):
+            self.body = self.body.copy()
+
+    def _own_rng(self):
+        sharers, self._rng_sharers = self._rng_sharers, None
+        if self._still_shared(sharers, "rng"):
+            rng = random.Random.__new__(random.Random)
+            rng.setstate(self.rng.getstate())
+            self.rng = rng
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Snake env - Gym-style reinforcement learning environment (needs NumPy)
+
+SnakeEnv wraps one SnakeEngine (or a SnakeGame from snake_gpt5.2_thinking.py,
+which is a SnakeEngine) behind reset() / step(action), with the Gymnasium
+return conventions:
+    obs, info = env.reset()
+    obs, reward, terminated, truncated, info = env.step(action)
+
+Observations are read-only NumPy views over planes the env keeps up to date
+itself, so nothing is copied or rebuilt per step: a move touches a handful
+of cells (new head, vacated tail, food) whatever the snake length.
+Channels, in the order given (all of them by default):
+- head:  1 on the head cell
+- body:  1 on every snake cell, head included
+- food:  1 on the food cell
+- walls: 1 on the border padding around the board
+- order: push number of each body cell, 0 elsewhere (head highest; a cell's
+  ticks left before the tail vacates it is order - (env.head_order - length))
+  Asking for "order" makes every plane int32 instead of uint8.
+
+The planes are padded around the board: by the crop radius with crop=r,
+else by one cell when "walls" is requested. With crop=r, observations are
+the (2r + 1) x (2r + 1) window centered on the head (off-board cells read as
+walls), again as a view.
+
+Actions are indices into snake_engine.DIRECTIONS: 0=UP, 1=RIGHT, 2=DOWN,
+3=LEFT; NO_ACTION (-1) or None keeps the current direction. Reversing is
+ignored, as in the game.
+
+VectorSnakeEnv steps n SnakeEnvs that share one (n, C, H, W) buffer, so a
+batch of full-board observations is a view too; cropped batches are gathered
+into one preallocated array. Episodes reset automatically.
+
+Usage:
+    env = SnakeEnv(30, 20, seed=1, crop=5, auto_reset=True)
+    obs, info = env.reset()
+    obs, reward, terminated, truncated, info = env.step(1)
+
+    venv = VectorSnakeEnv(64, 30, 20, seed=1)
+    obs, info = venv.reset()
+    obs, rewards, terminated, truncated, infos = venv.step(actions)
+"""
+
+import numpy as np
+
+from snake_engine import SnakeEngine, GRID_W, GRID_H, DIRECTIONS
+
+CHANNELS = ("head", "body", "food", "walls", "order")
+DEFAULT_CHANNELS = ("head", "body", "food", "walls")
+NO_ACTION = -1
+
+# Rewards
+REWARD_FOOD = 1.0
+REWARD_DEATH = -1.0
+REWARD_STEP = 0.0
+
+
+class SnakeEnv:
+    """One game behind reset() / step(action); see the module docstring.
+
+    max_ticks truncates an episode after that many moves. With auto_reset,
+    the step that ends an episode already returns the next episode's first
+    observation; the last one is in info["final_observation"] (a copy, since
+    the views are about to be reused) and its info in info["final_info"].
+    """
+
+    def __init__(self, grid_w=GRID_W, grid_h=GRID_H, seed=None, channels=DEFAULT_CHANNELS,
+                 crop=None, auto_reset=False, max_ticks=None, game=None, out=None):
+        self.game = game if game is not None else SnakeEngine(grid_w, grid_h, seed=seed)
+        self.grid_w, self.grid_h = w, h = self.game.grid_w, self.game.grid_h
+        self.channels = tuple(channels)
+        self.crop = crop
+        self.auto_reset = auto_reset
+        self.max_ticks = max_ticks
+        shape, dtype, self.observation_shape = self.layout(w, h, channels, crop)
+        self.pad = pad = (shape[1] - h) // 2
+
+        if out is None:
+            out = np.zeros(shape, dtype)
+        elif out.shape != shape or out.dtype != dtype or not out.flags.c_contiguous:
+            raise ValueError(f"out must be a C-contiguous {dtype.__name__} array of shape {shape}")
+        self.planes = out
+        self.plane_size = shape[1] * shape[2]
+        # Flat memoryview for single-cell writes (much cheaper than NumPy item access)
+        cells = memoryview(out).cast("B")
+        self._cells = cells if dtype is np.uint8 else cells.cast("i")
+        self._index = {name: i for i, name in enumerate(channels)}
+        # Start of each channel in the flat buffer, -1 when not observed
+        self._head_base, self._body_base, self._food_base, self._order_base = (
+            self._index[name] * self.plane_size if name in self._index else -1
+            for name in ("head", "body", "food", "order")
+        )
+        self._stride = w + 2 * pad
+        self._corner = pad * self._stride + pad  # flat index of board cell 0
+
+        # Read-only views handed out as observations
+        view = out.view()
+        view.flags.writeable = False
+        self._view = view
+        self.observation = view if not crop else None
+        self.n_actions = len(DIRECTIONS)
+
+        self.head_order = 0
+        self._head = self._food = -1
+        self._done = True
+
+    @staticmethod
+    def layout(grid_w, grid_h, channels=DEFAULT_CHANNELS, crop=None):
+        """(planes shape, dtype, observation shape) of an env, without building one."""
+        unknown = [c for c in channels if c not in CHANNELS]
+        if unknown or not channels:
+            raise ValueError(f"channels must be some of {CHANNELS}, got {tuple(channels)}")
+        pad = crop if crop else (1 if "walls" in channels else 0)
+        shape = (len(channels), grid_h + 2 * pad, grid_w + 2 * pad)
+        dtype = np.int32 if "order" in channels else np.uint8
+        return shape, dtype, (len(channels), 2 * crop + 1, 2 * crop + 1) if crop else shape
+
+    # -------------------------
+    # Gym API
+    # -------------------------
+    def reset(self, seed=None):
+        """Start a new episode. Returns (observation, info)."""
+        self.game.reset(seed)
+        self._sync()
+        self._done = False
+        return self._observe(), self._info()
+
+    def step(self, action):
+        """Make one move. Returns (observation, reward, terminated, truncated, info)."""
+        if self._done:
+            raise RuntimeError("step() called on a finished episode; call reset() first")
+        game = self.game
+        if action is not None and action != NO_ACTION:
+            game.set_direction(DIRECTIONS[action])
+
+        tail, length, score = game.body.tail, game.body.length, game.score
+        game.tick()
+        body = game.body  # after the tick: a forked game copies its body on its next move
+        if body.head != self._head:
+            self._moved(tail, body.length == length)
+        if game.food_cell != self._food:
+            self._set_food(game.food_cell)
+
+        reward = REWARD_STEP
+        if game.score != score:
+            reward = REWARD_FOOD
+        terminated = not game.alive
+        if terminated and not game.victory:
+            reward = REWARD_DEATH
+        truncated = not terminated and self.max_ticks is not None and game.ticks >= self.max_ticks
+
+        info = self._info()
+        if terminated or truncated:
+            self._done = True
+            if self.auto_reset:
+                final = self._observe().copy()
+                obs, reset_info = self.reset()
+                reset_info["final_observation"] = final
+                reset_info["final_info"] = info
+                return obs, reward, terminated, truncated, reset_info
+        return self._observe(), reward, terminated, truncated, info
+
+    # -------------------------
+    # Planes
+    # -------------------------
+    def _at(self, cell):
+        """Flat index of a board cell within a plane (padding included)."""
+        return self._corner + cell + cell // self.grid_w * 2 * self.pad
+
+    def _sync(self):
+        """Rebuild every plane from the game (reset, or a game changed from outside)."""
+        planes, pad, w, h = self.planes, self.pad, self.grid_w, self.grid_h
+        planes[:] = 0
+        if "walls" in self._index and pad:
+            walls = planes[self._index["walls"]]
+            walls[:] = 1
+            walls[pad:pad + h, pad:pad + w] = 0
+
+        body = self.game.body
+        if "body" in self._index:
+            board = np.frombuffer(body.occupancy, dtype=np.uint8).reshape(h, w)
+            planes[self._index["body"], pad:pad + h, pad:pad + w] = board
+        if self._order_base >= 0:
+            for i, cell in enumerate(reversed(list(body))):
+                self._cells[self._order_base + self._at(cell)] = i + 1
+        self.head_order = body.length
+        self._head = body.head
+        if self._head_base >= 0:
+            self._cells[self._head_base + self._at(self._head)] = 1
+        self._food = -1
+        self._set_food(self.game.food_cell)
+
+    def _moved(self, old_tail, popped):
+        cells = self._cells
+        head = self.game.body.head
+        at = self._at(head)
+        if popped:
+            tail_at = self._at(old_tail)
+            if self._body_base >= 0:
+                cells[self._body_base + tail_at] = 0
+            if self._order_base >= 0:
+                cells[self._order_base + tail_at] = 0
+        if self._head_base >= 0:
+            cells[self._head_base + self._at(self._head)] = 0
+            cells[self._head_base + at] = 1
+        if self._body_base >= 0:
+            cells[self._body_base + at] = 1
+        self.head_order += 1
+        if self._order_base >= 0:
+            cells[self._order_base + at] = self.head_order
+        self._head = head
+
+    def _set_food(self, cell):
+        base = self._food_base
+        if base >= 0:
+            if self._food >= 0:
+                self._cells[base + self._at(self._food)] = 0
+            if cell >= 0:
+                self._cells[base + self._at(cell)] = 1
+        self._food = cell
+
+    def _observe(self):
+        if not self.crop:
+            return self.observation
+        # The padding is crop cells wide, so the window never leaves the planes
+        y, x = divmod(self._head, self.grid_w)
+        k = 2 * self.crop + 1
+        return self._view[:, y:y + k, x:x + k]
+
+    def _info(self):
+        game = self.game
+        return {"score": game.score, "ticks": game.ticks, "length": game.body.length,
+                "victory": game.victory}
+
+
+class VectorSnakeEnv:
+    """n SnakeEnvs stepped together, with auto-reset.
+
+    step(actions) takes one action per env and returns (observations,
+    rewards, terminated, truncated, infos) with arrays of n entries and a
+    list of n info dicts. seed seeds env i with seed + i.
+    """
+
+    def __init__(self, n, grid_w=GRID_W, grid_h=GRID_H, seed=None, channels=DEFAULT_CHANNELS,
+                 crop=None, max_ticks=None):
+        shape, dtype, observation_shape = SnakeEnv.layout(grid_w, grid_h, channels, crop)
+        self.planes = np.zeros((n,) + shape, dtype)
+        self.envs = [
+            SnakeEnv(grid_w, grid_h, None if seed is None else seed + i, channels, crop, True,
+                     max_ticks, out=self.planes[i])
+            for i in range(n)
+        ]
+        self.n = n
+        self.crop = crop
+        self.observation_shape = (n,) + observation_shape
+        self.n_actions = len(DIRECTIONS)
+        if crop:
+            self._crops = np.zeros(self.observation_shape, dtype)
+            view = self._crops.view()
+        else:
+            view = self.planes.view()
+        view.flags.writeable = False
+        self.observation = view
+        self.rewards = np.zeros(n, dtype=np.float32)
+        self.terminated = np.zeros(n, dtype=bool)
+        self.truncated = np.zeros(n, dtype=bool)
+
+    def reset(self, seed=None):
+        infos = []
+        for i, env in enumerate(self.envs):
+            infos.append(env.reset(None if seed is None else seed + i)[1])
+        return self._observe(), infos
+
+    def step(self, actions):
+        infos = []
+        rewards, terminated, truncated = self.rewards, self.terminated, self.truncated
+        for i, (env, action) in enumerate(zip(self.envs, actions)):
+            _, rewards[i], terminated[i], truncated[i], info = env.step(int(action))
+            infos.append(info)
+        return self._observe(), rewards, terminated, truncated, infos
+
+    def _observe(self):
+        if self.crop:
+            crops = self._crops
+            for i, env in enumerate(self.envs):
+                crops[i] = env._observe()
+        return self.observation
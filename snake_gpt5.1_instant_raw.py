@@ -1,14 +1,12 @@
-import pygame
 import random
 import sys
 
-# Initialize pygame
-pygame.init()
+# pygame (and the snake_render helpers built on it) are imported by
+# init_display(), so importing this module opens no window.
+pygame = None
 
 # Window settings
 WIDTH, HEIGHT = 600, 400
-WIN = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Snake Game")
 
 # Colors
 WHITE = (255, 255, 255)
@@ -16,13 +14,35 @@ GREEN = (0, 200, 0)
 RED = (255, 0, 0)
 BLACK = (0, 0, 0)
 
-# Clock
-clock = pygame.time.Clock()
-
 # Snake settings
 SNAKE_SIZE = 15
 initial_speed = 10
 
+# Display state, set up by init_display()
+WIN = None
+clock = None
+fonts = text_cache = None
+
+
+def init_display():
+    """Initialize pygame, create the window and clock (first call only)."""
+    global pygame, WIN, clock, fonts, text_cache
+    if WIN is not None:
+        return WIN
+
+    import pygame
+    from snake_render import fonts, text_cache
+
+    # Initialize pygame
+    pygame.init()
+
+    WIN = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Snake Game")
+
+    # Clock
+    clock = pygame.time.Clock()
+    return WIN
+
 
 def draw_snake(snake_list):
     for x, y in snake_list:
@@ -30,8 +50,8 @@ def draw_snake(snake_list):
 
 
 def message(text, color, y_offset=0, size=28):
-    font_style = pygame.font.SysFont("comicsansms", size)
-    msg = font_style.render(text, True, color)
+    font_style = fonts.get("comicsansms", size)
+    msg = text_cache.render(font_style, text, color)
     WIN.blit(msg, (WIDTH/2 - msg.get_width()/2, HEIGHT/2 - msg.get_height()/2 + y_offset))
 
 
@@ -114,8 +134,8 @@ def game_loop():
         draw_snake(snake_list)
 
         # Display score
-        font = pygame.font.SysFont("comicsansms", 22)
-        score_text = font.render(f"Score: {score}", True, WHITE)
+        font = fonts.get("comicsansms", 22)
+        score_text = text_cache.render(font, f"Score: {score}", WHITE)
         WIN.blit(score_text, (10, 10))
 
         pygame.display.update()
@@ -134,4 +154,10 @@ def game_loop():
     sys.exit()
 
 
-game_loop()
+def main():
+    init_display()
+    game_loop()
+
+
+if __name__ == "__main__":
+    main()
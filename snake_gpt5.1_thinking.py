@@ -1,10 +1,9 @@
-import pygame
 import random
 import sys
 
-
-# Initialize pygame
-pygame.init()
+# pygame (and the snake_render helpers built on it) are imported by
+# init_display(), so importing this module opens no window.
+pygame = None
 
 # ---------- Game Settings ----------
 WINDOW_WIDTH = 640
@@ -13,6 +12,7 @@ BLOCK_SIZE = 20
 
 INITIAL_SPEED = 10        # Initial frames per second
 SPEED_INCREMENT = 1       # How much to speed up after each food
+ARRAY_RENDER = False      # Draw the snake from a palette-indexed board array (needs NumPy)
 
 # Colors (R, G, B)
 WHITE  = (255, 255, 255)
@@ -24,38 +24,92 @@ BLUE   = (0,   0, 255)
 YELLOW = (255, 255, 0)
 GRAY   = (40,  40,  40)
 
-# Create window
-screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-pygame.display.set_caption("Snake Game")
+# Display state, set up by init_display()
+screen = None
+clock = None
+score_font = game_over_font = info_font = None
+background = None
+text_cache = None
+segment_sprite = None
+blit_batch = None
+board_pixels = None
 
-clock = pygame.time.Clock()
 
-# Fonts
-score_font = pygame.font.SysFont("consolas", 24)
-game_over_font = pygame.font.SysFont("consolas", 48)
-info_font = pygame.font.SysFont("consolas", 24)
+def init_display():
+    """Initialize pygame, create the window, clock and fonts (first call only)."""
+    global pygame, screen, clock, score_font, game_over_font, info_font, background, text_cache
+    global segment_sprite, blit_batch, board_pixels
+    if screen is not None:
+        return screen
 
+    import pygame
+    from snake_render import BackgroundCache, blit_batch, text_cache
 
-def draw_grid():
-    """Draw a subtle grid to make movement clearer."""
+    # Initialize pygame
+    pygame.init()
+
+    # Create window
+    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    pygame.display.set_caption("Snake Game")
+
+    clock = pygame.time.Clock()
+
+    # Fonts
+    score_font = pygame.font.SysFont("consolas", 24)
+    game_over_font = pygame.font.SysFont("consolas", 48)
+    info_font = pygame.font.SysFont("consolas", 24)
+
+    # Painted once, then blitted at the start of every frame
+    background = BackgroundCache(paint_background)
+
+    # One snake block (dark outline, bright center), drawn once
+    segment_sprite = pygame.Surface((BLOCK_SIZE, BLOCK_SIZE), 0, screen)
+    segment_sprite.fill(DARK_GREEN)
+    segment_sprite.fill(GREEN, (2, 2, BLOCK_SIZE - 4, BLOCK_SIZE - 4))
+
+    if ARRAY_RENDER:
+        # One pixel per block (1 = snake), kept current as the snake moves
+        from snake_render import PaletteBoard
+        cols, rows = WINDOW_WIDTH // BLOCK_SIZE, WINDOW_HEIGHT // BLOCK_SIZE
+        board_pixels = PaletteBoard(cols, rows, cols, rows, BLOCK_SIZE, [GREEN], screen)
+    return screen
+
+
+def paint_background(surface):
+    """Black background with a subtle grid to make movement clearer."""
+    surface.fill(BLACK)
     for x in range(0, WINDOW_WIDTH, BLOCK_SIZE):
-        pygame.draw.line(screen, GRAY, (x, 0), (x, WINDOW_HEIGHT))
+        pygame.draw.line(surface, GRAY, (x, 0), (x, WINDOW_HEIGHT))
     for y in range(0, WINDOW_HEIGHT, BLOCK_SIZE):
-        pygame.draw.line(screen, GRAY, (0, y), (WINDOW_WIDTH, y))
+        pygame.draw.line(surface, GRAY, (0, y), (WINDOW_WIDTH, y))
+
+
+def draw_grid():
+    """Draw the background and grid (a single blit of the cached layer)."""
+    background.draw(screen, BLOCK_SIZE)
 
 
 def draw_snake(snake_list):
-    """Draw the snake blocks from the snake_list positions."""
-    for segment in snake_list:
-        x, y = segment
-        pygame.draw.rect(screen, DARK_GREEN, [x, y, BLOCK_SIZE, BLOCK_SIZE])
-        pygame.draw.rect(screen, GREEN, [x + 2, y + 2, BLOCK_SIZE - 4, BLOCK_SIZE - 4])
+    """Draw the snake blocks from the snake_list positions (one blits() batch).
+
+    With ARRAY_RENDER the board array already holds them: one scaled blit,
+    whatever the snake length.
+    """
+    if board_pixels is not None:
+        board_pixels.draw(screen)
+    else:
+        blit_batch(screen, [(segment_sprite, segment) for segment in snake_list])
+
+
+def block_cell(x, y):
+    """Board array cell of the block at pixel position (x, y)."""
+    return (y // BLOCK_SIZE) * (WINDOW_WIDTH // BLOCK_SIZE) + x // BLOCK_SIZE
 
 
 def show_score(score, speed):
     """Display current score and speed at the top-left."""
-    score_surface = score_font.render(f"Score: {score}", True, YELLOW)
-    speed_surface = score_font.render(f"Speed: {speed} FPS", True, YELLOW)
+    score_surface = text_cache.render(score_font, f"Score: {score}", YELLOW)
+    speed_surface = text_cache.render(score_font, f"Speed: {speed} FPS", YELLOW)
     screen.blit(score_surface, (10, 10))
     screen.blit(speed_surface, (10, 10 + score_surface.get_height() + 4))
 
@@ -85,19 +139,20 @@ def game_over_screen(score):
 
     pygame.display.flip()
 
+    # The screen is static: sleep until the next event instead of polling
     waiting = True
     while waiting:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
+        event = pygame.event.wait()
+        if event.type == pygame.QUIT:
+            pygame.quit()
+            sys.exit()
+
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_q:
                 pygame.quit()
                 sys.exit()
-
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_q:
-                    pygame.quit()
-                    sys.exit()
-                if event.key == pygame.K_r:
-                    waiting = False  # Return to start a new game
+            if event.key == pygame.K_r:
+                waiting = False  # Return to start a new game
 
 
 def game_loop():
@@ -109,6 +164,8 @@ def game_loop():
 
     snake_list = []
     snake_length = 1
+    if board_pixels is not None:
+        board_pixels.clear()
 
     # Initial food position
     food_x, food_y = random_food_position()
@@ -152,9 +209,15 @@ def game_loop():
         # --- Update snake body ---
         snake_head = [x, y]
         snake_list.append(snake_head)
+        if board_pixels is not None:
+            board_pixels.set(block_cell(x, y), 1)
 
         if len(snake_list) > snake_length:
+            tail = snake_list[0]
             del snake_list[0]
+            # The head may have just moved onto the tail's block
+            if board_pixels is not None and tail != snake_head:
+                board_pixels.set(block_cell(*tail), 0)
 
         # --- Collision with self (Game Over) ---
         for segment in snake_list[:-1]:
@@ -170,7 +233,6 @@ def game_loop():
             food_x, food_y = random_food_position()
 
         # --- Drawing ---
-        screen.fill(BLACK)
         draw_grid()
 
         # Draw food
@@ -189,6 +251,7 @@ def game_loop():
 
 
 def main():
+    init_display()
     while True:
         game_loop()  # After game over, control comes back here and restarts
 
@@ -10,8 +10,14 @@ Features:
 
 import sys
 import random
+from collections import deque
+
 import pygame
 
+from snake_engine import SnakeBody
+from snake_profile import FrameProfiler, InputLatency, ProfilerOverlay, default_path
+from snake_render import BackgroundCache, DirtyCells, blit_batch, sprites, text_cache
+
 
 # ----------------------------
 # Config
@@ -22,6 +28,10 @@ WIDTH, HEIGHT = GRID_W * CELL_SIZE, GRID_H * CELL_SIZE
 FPS_BASE = 10            # starting speed (frames/sec)
 FPS_PER_FOOD = 1         # speed increase per food eaten
 MAX_FPS = 45             # cap speed so it doesn't become unplayable
+DIRTY_RECTS = True       # repaint only the cells that changed (pygame.display.update(rects))
+RENDER_FPS = 60          # render/input rate when the display refresh rate is unknown
+INTERPOLATE = True       # slide head and tail between ticks instead of jumping a cell
+TURN_QUEUE = 3           # turns buffered ahead of the snake; later presses are dropped
 
 BG_COLOR = (18, 18, 18)
 SNAKE_COLOR = (40, 200, 120)
@@ -31,30 +41,156 @@ TEXT_COLOR = (235, 235, 235)
 MUTED_TEXT = (170, 170, 170)
 PANEL_COLOR = (28, 28, 28)
 BORDER_COLOR = (55, 55, 55)
+GRID_COLOR = (24, 24, 24)
+PANEL_RECT = pygame.Rect(10, 10, 220, 42)
+
+TURN_KEYS = {
+    pygame.K_UP: (0, -1), pygame.K_w: (0, -1),
+    pygame.K_DOWN: (0, 1), pygame.K_s: (0, 1),
+    pygame.K_LEFT: (-1, 0), pygame.K_a: (-1, 0),
+    pygame.K_RIGHT: (1, 0), pygame.K_d: (1, 0),
+}
 
 
 # ----------------------------
 # Helpers
 # ----------------------------
+def display_refresh_rate() -> int:
+    """The monitor refresh rate where pygame can tell (pygame-ce), else RENDER_FPS."""
+    get_rates = getattr(pygame.display, "get_desktop_refresh_rates", None)
+    rates = get_rates() if get_rates else None
+    return rates[0] if rates and rates[0] > 0 else RENDER_FPS
+
+
+def cell_sprite(surface: pygame.Surface, color, inset=2) -> pygame.Surface:
+    """A grid cell with a slight inset for nicer visuals, rendered once (see CellSprites)."""
+    # inset is per side; CellSprites takes the total, like Rect.inflate
+    return sprites.get(surface, CELL_SIZE, color, inset * 2, 6)
+
+
 def draw_cell(surface: pygame.Surface, pos, color, inset=2):
-    """Draws a grid cell with a slight inset for nicer visuals."""
+    """Draws a grid cell with a slight inset for nicer visuals.
+
+    pos may be fractional (an interpolated position between two cells).
+    """
+    x, y = pos
+    surface.blit(cell_sprite(surface, color, inset), (round(x * CELL_SIZE), round(y * CELL_SIZE)))
+
+
+# Scratch rect reused by every cell erase, so erasing allocates no Rects
+_erase_rect = pygame.Rect(0, 0, 0, 0)
+
+# (x, y) of every cell, rebuilt only when the grid size changes
+_cell_positions = {"w": 0, "h": 0, "xy": []}
+
+
+def cell_xy(cell: int):
+    """(x, y) of a cell; the tuples are built once, so lookups allocate nothing."""
+    table = _cell_positions
+    if table["w"] != GRID_W or table["h"] != GRID_H:
+        table["w"], table["h"] = GRID_W, GRID_H
+        table["xy"] = [(c % GRID_W, c // GRID_W) for c in range(GRID_W * GRID_H)]
+    return table["xy"][cell]
+
+
+def lerp_xy(a: int, b: int, t: float):
+    """Position t of the way from cell a to cell b."""
+    ax, ay = cell_xy(a)
+    bx, by = cell_xy(b)
+    return (ax + (bx - ax) * t, ay + (by - ay) * t)
+
+
+def paint_background(surface: pygame.Surface):
+    """Background fill plus the subtle grid (rendered once, see `background`)."""
+    surface.fill(BG_COLOR)
+    for x in range(0, WIDTH, CELL_SIZE):
+        pygame.draw.line(surface, GRID_COLOR, (x, 0), (x, HEIGHT))
+    for y in range(0, HEIGHT, CELL_SIZE):
+        pygame.draw.line(surface, GRID_COLOR, (0, y), (WIDTH, y))
+
+
+background = BackgroundCache(paint_background)
+
+
+def erase_cell(surface: pygame.Surface, pos):
+    """Restores a cell's background from the cached layer."""
     x, y = pos
-    rect = pygame.Rect(x * CELL_SIZE + inset, y * CELL_SIZE + inset,
-                       CELL_SIZE - inset * 2, CELL_SIZE - inset * 2)
-    pygame.draw.rect(surface, color, rect, border_radius=6)
+    _erase_rect.update(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+    background.restore(surface, _erase_rect, CELL_SIZE)
+
+
+def draw_board_cell(surface: pygame.Surface, state, cell: int, moving=False):
+    """Repaints one cell (y * GRID_W + x) from the current game state.
+
+    With moving=True the head cell is left empty: draw_moving_ends() paints
+    the head on its way there.
+    """
+    pos = cell_xy(cell)
+    body = state["body"]
+    erase_cell(surface, pos)
+    if cell == body.head:
+        if not moving:
+            draw_cell(surface, pos, SNAKE_HEAD_COLOR, inset=2)
+    elif cell in body:
+        draw_cell(surface, pos, SNAKE_COLOR, inset=3)
+    elif pos == state["food"]:
+        draw_cell(surface, pos, FOOD_COLOR, inset=3)
+
+
+def moving_cells(state) -> tuple:
+    """Cells the interpolated head and tail overlap: head, neck, old and new tail."""
+    body = state["body"]
+    ring = body.ring
+    neck = ring[body.head_pos - 1] if body.head_pos else ring[body.capacity - 1]
+    return (body.head, neck, state["prev_tail"], body.tail)
+
+
+def draw_moving_ends(surface: pygame.Surface, state, alpha: float):
+    """Draws the tail and head alpha of the way through the last move.
+
+    The frame shows the state between the previous tick and the current one:
+    the head slides from the neck into its new cell and the tail slides off
+    the cell it just left.
+    """
+    head, neck, prev_tail, tail = moving_cells(state)
+    draw_cell(surface, lerp_xy(prev_tail, tail, alpha), SNAKE_COLOR, inset=3)
+    draw_cell(surface, lerp_xy(neck, head, alpha), SNAKE_HEAD_COLOR, inset=2)
+
+
+def panel_text(state) -> str:
+    return f"Score: {state['score']}   Speed: {state['fps']}"
 
 
-def spawn_food(occupied: set[tuple[int, int]]) -> tuple[int, int]:
-    """Spawn food on a free cell."""
-    free = [(x, y) for x in range(GRID_W) for y in range(GRID_H) if (x, y) not in occupied]
-    if not free:
+def panel_values(state) -> tuple:
+    return (state["score"], state["fps"])
+
+
+def panel_changed(state, last) -> bool:
+    """Whether the panel shows other values than last (panel_values() when drawn).
+
+    Compared field by field, so the per-frame check builds no string or tuple.
+    """
+    return last is None or last[0] != state["score"] or last[1] != state["fps"]
+
+
+def draw_panel(surface: pygame.Surface, font: pygame.font.Font, state):
+    pygame.draw.rect(surface, PANEL_COLOR, PANEL_RECT, border_radius=10)
+    pygame.draw.rect(surface, BORDER_COLOR, PANEL_RECT, width=2, border_radius=10)
+    score_txt = text_cache.render(font, panel_text(state), TEXT_COLOR)
+    surface.blit(score_txt, (20, 20))
+
+
+def spawn_food(body: SnakeBody) -> tuple[int, int]:
+    """Spawn food on a free cell (O(1): sampled from the body's free-cell index)."""
+    cell = body.free.sample(random)
+    if cell < 0:
         # Board full: player wins (handled elsewhere)
         return (-1, -1)
-    return random.choice(free)
+    return cell_xy(cell)
 
 
 def render_text_center(surface: pygame.Surface, font: pygame.font.Font, text: str, y: int, color=TEXT_COLOR):
-    img = font.render(text, True, color)
+    img = text_cache.render(font, text, color)
     rect = img.get_rect(center=(WIDTH // 2, y))
     surface.blit(img, rect)
 
@@ -64,27 +200,101 @@ def render_text_center(surface: pygame.Surface, font: pygame.font.Font, text: st
 # ----------------------------
 def new_game_state():
     # Start snake in center, moving right
+    # The body is a ring buffer of cell indices (y * GRID_W + x) with an
+    # occupancy grid, so moving and collision checks are O(1) at any length.
     start_x, start_y = GRID_W // 2, GRID_H // 2
-    snake = [(start_x - 2, start_y), (start_x - 1, start_y), (start_x, start_y)]
+    body = SnakeBody(GRID_W, GRID_H)
+    for x in (start_x - 2, start_x - 1, start_x):
+        body.push_head(start_y * GRID_W + x)
     direction = (1, 0)  # dx, dy
     pending_dir = direction
-    occupied = set(snake)
-    food = spawn_food(occupied)
+    food = spawn_food(body)
     score = 0
     fps = FPS_BASE
     return {
-        "snake": snake,
+        "body": body,
+        "prev_tail": body.tail,  # tail cell before the last move (for interpolation)
+        "accum_ms": 0.0,         # game time not yet spent on moves
         "direction": direction,
         "pending_dir": pending_dir,
-        "occupied": occupied,
+        "turns": deque(),        # queued turns, oldest first (see queue_turn)
         "food": food,
         "score": score,
         "fps": fps,
         "alive": True,
         "won": False,
+        "paused": False,         # on focus loss or Space; any key resumes
     }
 
 
+def queue_turn(state, d):
+    """Queues a turn for a coming tick; returns False when it is ignored.
+
+    Each turn is checked against the one queued before it (or the current
+    direction), so two quick presses within one tick both happen, one move
+    apart, and a reversal is still impossible.
+    """
+    turns = state["turns"]
+    dx, dy = turns[-1] if turns else state["direction"]
+    # No immediate reversal; repeats and presses beyond TURN_QUEUE are dropped
+    if d == (-dx, -dy) or d == (dx, dy) or len(turns) >= TURN_QUEUE:
+        return False
+    turns.append(d)
+    return True
+
+
+def tick(state):
+    """Makes one move: steer, collide, eat or advance."""
+    if state["turns"]:
+        state["pending_dir"] = state["turns"].popleft()
+    state["direction"] = state["pending_dir"]
+
+    dx, dy = state["direction"]
+    body = state["body"]
+    # Plain ints all the way: a move builds no tuples
+    new_x, new_y = body.head % GRID_W + dx, body.head // GRID_W + dy
+
+    # Wall collision
+    if not (0 <= new_x < GRID_W and 0 <= new_y < GRID_H):
+        state["alive"] = False
+        return
+
+    food_x, food_y = state["food"]
+    ate_food = new_x == food_x and new_y == food_y
+    new_cell = new_y * GRID_W + new_x
+
+    # Self collision:
+    # If not eating, tail will move away, so it's okay to step into the current tail.
+    if ate_food:
+        # new_cell must not be in the body at all
+        if new_cell in body:
+            state["alive"] = False
+    else:
+        # allow moving into tail because it will be removed
+        if new_cell in body and new_cell != body.tail:
+            state["alive"] = False
+
+    if not state["alive"]:
+        return
+
+    if ate_food:
+        # Move snake (growing)
+        state["prev_tail"] = body.tail
+        body.push_head(new_cell)
+        state["score"] += 1
+        # Speed up each time it eats food
+        state["fps"] = min(MAX_FPS, FPS_BASE + state["score"] * FPS_PER_FOOD)
+
+        # Spawn new food
+        state["food"] = spawn_food(body)
+        if state["food"] == (-1, -1):
+            state["alive"] = False
+            state["won"] = True
+    else:
+        # Move snake: remove tail, then add the new head
+        state["prev_tail"] = body.advance(new_cell)
+
+
 def main():
     pygame.init()
     pygame.display.set_caption("Snake (pygame)")
@@ -96,144 +306,198 @@ def main():
     font_large = pygame.font.SysFont("consolas", 52, bold=True)
 
     state = new_game_state()
-
-    # To prevent repeated turns on long key-hold, we accept one direction change per tick.
-    can_turn_this_tick = True
+    dirty = DirtyCells(GRID_W, GRID_H, CELL_SIZE)
+    panel_cells = dirty.cells_under(PANEL_RECT)
+    last_panel = None  # panel_values() of the panel on screen
+    last_ends = ()  # cells under the sliding head/tail last frame
+    render_fps = display_refresh_rate()
+
+    # Frame profiler: F3 shows per-phase times, F4 saves them (snake_profile.py)
+    profiler = FrameProfiler()
+    profile_overlay = ProfilerOverlay(profiler, font_small, TEXT_COLOR, PANEL_COLOR)
+    profile_rect = pygame.Rect(profile_overlay.rect(screen))
+    profile_cells = dirty.cells_under(profile_rect)
+    latency = InputLatency()  # key press -> move -> screen, printed with F4
+
+    # Game over and pause screens are static: drawn once, then the loop
+    # sleeps in pygame.event.wait() instead of redrawing them every frame
+    shade = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+    shade.fill((0, 0, 0, 160))
+    scene_drawn = False  # the game over / pause screen on display is up to date
 
     while True:
+        profiler.start()
+
         # ----------------------------
         # Events
         # ----------------------------
-        for event in pygame.event.get():
+        idle = not state["alive"] or state["paused"]
+        if idle and scene_drawn:
+            events = [pygame.event.wait()]
+            events.extend(pygame.event.get())
+        else:
+            events = pygame.event.get()
+        for event in events:
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit(0)
 
+            if event.type in (pygame.WINDOWFOCUSLOST, pygame.WINDOWMINIMIZED):
+                if state["alive"] and not state["paused"]:
+                    state["paused"] = True
+                    scene_drawn = False
+                continue
+
             if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_F3:
+                    profile_overlay.toggle()
+                    dirty.invalidate()
+                    scene_drawn = False
+                    continue
+                if event.key == pygame.K_F4:
+                    print(f"Profile saved: {profiler.export(default_path())}")
+                    print(latency.report())
+                    continue
+                if event.key == pygame.K_ESCAPE and idle:
+                    pygame.quit()
+                    sys.exit(0)
+
+                if state["paused"]:
+                    # Any other key resumes; the time spent paused is not played
+                    state["paused"] = False
+                    clock.tick()
+                    dirty.invalidate()
+                    scene_drawn = False
+                    continue
+
                 if not state["alive"]:
                     if event.key in (pygame.K_r, pygame.K_RETURN, pygame.K_SPACE):
                         state = new_game_state()
-                        can_turn_this_tick = True
-                    elif event.key == pygame.K_ESCAPE:
-                        pygame.quit()
-                        sys.exit(0)
+                        latency.discard()
+                        clock.tick()  # the time on the game over screen is not played
+                        scene_drawn = False
                     continue
 
-                # Direction changes (no immediate reversal)
-                if can_turn_this_tick:
-                    dx, dy = state["direction"]
-                    if event.key in (pygame.K_UP, pygame.K_w) and (dx, dy) != (0, 1):
-                        state["pending_dir"] = (0, -1)
-                        can_turn_this_tick = False
-                    elif event.key in (pygame.K_DOWN, pygame.K_s) and (dx, dy) != (0, -1):
-                        state["pending_dir"] = (0, 1)
-                        can_turn_this_tick = False
-                    elif event.key in (pygame.K_LEFT, pygame.K_a) and (dx, dy) != (1, 0):
-                        state["pending_dir"] = (-1, 0)
-                        can_turn_this_tick = False
-                    elif event.key in (pygame.K_RIGHT, pygame.K_d) and (dx, dy) != (-1, 0):
-                        state["pending_dir"] = (1, 0)
-                        can_turn_this_tick = False
+                if event.key == pygame.K_SPACE:
+                    state["paused"] = True
+                    scene_drawn = False
+                    continue
+
+                # Direction changes, queued one per tick (no immediate reversal)
+                d = TURN_KEYS.get(event.key)
+                if d is not None:
+                    latency.pressed(queue_turn(state, d))
 
         # ----------------------------
-        # Update
+        # Update (fixed timestep: moves paced by game time, not frame rate)
         # ----------------------------
-        if state["alive"]:
-            state["direction"] = state["pending_dir"]
-
-            dx, dy = state["direction"]
-            head_x, head_y = state["snake"][-1]
-            new_head = (head_x + dx, head_y + dy)
-
-            # Wall collision
-            if not (0 <= new_head[0] < GRID_W and 0 <= new_head[1] < GRID_H):
-                state["alive"] = False
-            else:
-                ate_food = (new_head == state["food"])
-
-                # Self collision:
-                # If not eating, tail will move away, so it's okay to step into the current tail.
-                tail = state["snake"][0]
-                occupied = state["occupied"]
-
-                if ate_food:
-                    # new_head must not be in occupied at all
-                    if new_head in occupied:
-                        state["alive"] = False
-                else:
-                    # allow moving into tail because it will be removed
-                    if new_head in occupied and new_head != tail:
-                        state["alive"] = False
-
-                if state["alive"]:
-                    # Move snake
-                    state["snake"].append(new_head)
-                    occupied.add(new_head)
-
-                    if ate_food:
-                        state["score"] += 1
-                        # Speed up each time it eats food
-                        state["fps"] = min(MAX_FPS, FPS_BASE + state["score"] * FPS_PER_FOOD)
-
-                        # Spawn new food
-                        state["food"] = spawn_food(occupied)
-                        if state["food"] == (-1, -1):
-                            state["alive"] = False
-                            state["won"] = True
-                    else:
-                        # Remove tail
-                        removed = state["snake"].pop(0)
-                        occupied.remove(removed)
-
-            can_turn_this_tick = True  # allow a turn next tick
+        profiler.lap("events")
+        dt_ms = clock.tick(render_fps)
+        profiler.lap("wait")
+        if state["alive"] and not state["paused"]:
+            state["accum_ms"] += dt_ms
+            while state["alive"] and state["accum_ms"] >= 1000 / state["fps"]:
+                state["accum_ms"] -= 1000 / state["fps"]
+                tick(state)
+            latency.applied(len(state["turns"]))
+        profiler.lap("update")
 
         # ----------------------------
         # Draw
         # ----------------------------
-        screen.fill(BG_COLOR)
-
-        # Subtle grid (optional, but nice)
-        for x in range(0, WIDTH, CELL_SIZE):
-            pygame.draw.line(screen, (24, 24, 24), (x, 0), (x, HEIGHT))
-        for y in range(0, HEIGHT, CELL_SIZE):
-            pygame.draw.line(screen, (24, 24, 24), (0, y), (WIDTH, y))
-
-        # Food
-        if state["food"] != (-1, -1):
-            draw_cell(screen, state["food"], FOOD_COLOR, inset=3)
-
-        # Snake
-        for seg in state["snake"][:-1]:
-            draw_cell(screen, seg, SNAKE_COLOR, inset=3)
-        draw_cell(screen, state["snake"][-1], SNAKE_HEAD_COLOR, inset=2)
-
-        # Score panel
-        panel_rect = pygame.Rect(10, 10, 220, 42)
-        pygame.draw.rect(screen, PANEL_COLOR, panel_rect, border_radius=10)
-        pygame.draw.rect(screen, BORDER_COLOR, panel_rect, width=2, border_radius=10)
-        score_txt = font_small.render(f"Score: {state['score']}   Speed: {state['fps']}", True, TEXT_COLOR)
-        screen.blit(score_txt, (20, 20))
-
-        # Game Over overlay
-        if not state["alive"]:
-            overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 160))
-            screen.blit(overlay, (0, 0))
-
-            if state.get("won", False):
-                render_text_center(screen, font_large, "YOU WIN!", HEIGHT // 2 - 70)
-                render_text_center(screen, font_medium, f"Final Score: {state['score']}", HEIGHT // 2 - 10)
+        # Interpolate between the last two ticks while the snake is moving
+        moving = INTERPOLATE and state["alive"]
+        alpha = min(1.0, state["accum_ms"] * state["fps"] / 1000) if moving else 1.0
+
+        fx, fy = state["food"]
+        food_cell = fy * GRID_W + fx if fx >= 0 else -1
+        idle = not state["alive"] or state["paused"]
+        if idle and scene_drawn:
+            pass  # the game over / pause screen is still up to date
+        elif DIRTY_RECTS and not idle and dirty.collect(state["body"], food_cell):
+            # Repaint only the changed cells, plus the panel when it changed or
+            # a changed cell sits under it
+            cells = dirty.cells
+            if moving:
+                # The sliding head and tail cover these cells, this frame and last
+                ends = moving_cells(state)
+                cells.update(ends)
+                cells.update(last_ends)
+                last_ends = ends
+            redraw_panel = panel_changed(state, last_panel) or not cells.isdisjoint(panel_cells)
+            if redraw_panel:
+                cells.update(panel_cells)
+            redraw_profile = profile_overlay.visible and (profile_overlay.update() or not cells.isdisjoint(profile_cells))
+            if redraw_profile:
+                cells.update(profile_cells)
+            for cell in cells:
+                draw_board_cell(screen, state, cell, moving)
+            if moving:
+                draw_moving_ends(screen, state, alpha)
+            rects = dirty.rects()
+            if redraw_panel:
+                draw_panel(screen, font_small, state)
+                last_panel = panel_values(state)
+                rects.append(PANEL_RECT)
+            profiler.lap("draw")
+            if redraw_profile:
+                rects.append(pygame.Rect(profile_overlay.draw(screen)))
+            profiler.lap("overlay")
+            pygame.display.update(rects)
+        else:
+            # Background + subtle grid, one blit
+            background.draw(screen, CELL_SIZE)
+
+            # Food
+            if state["food"] != (-1, -1):
+                draw_cell(screen, state["food"], FOOD_COLOR, inset=3)
+
+            # Snake
+            # Every body segment in one blits() batch
+            body = state["body"]
+            segment = cell_sprite(screen, SNAKE_COLOR, inset=3)
+            blit_batch(screen, [(segment, dirty.rect(cell)) for cell in body if cell != body.head])
+            if moving:
+                draw_moving_ends(screen, state, alpha)
+                last_ends = moving_cells(state)
             else:
-                render_text_center(screen, font_large, "GAME OVER", HEIGHT // 2 - 70)
-                render_text_center(screen, font_medium, f"Final Score: {state['score']}", HEIGHT // 2 - 10)
-
-            render_text_center(screen, font_small, "Press R / Enter / Space to Restart", HEIGHT // 2 + 40, color=TEXT_COLOR)
-            render_text_center(screen, font_small, "Press Esc to Quit", HEIGHT // 2 + 70, color=MUTED_TEXT)
-
-        pygame.display.flip()
-
-        # Control speed
-        clock.tick(state["fps"] if state["alive"] else 30)
+                draw_cell(screen, cell_xy(body.head), SNAKE_HEAD_COLOR, inset=2)
+
+            # Score panel
+            draw_panel(screen, font_small, state)
+            last_panel = panel_values(state)
+            profiler.lap("draw")
+
+            # Game Over / pause overlay
+            if idle:
+                dirty.invalidate()
+                scene_drawn = True
+                screen.blit(shade, (0, 0))
+
+                if state["paused"]:
+                    render_text_center(screen, font_large, "PAUSED", HEIGHT // 2 - 40)
+                    render_text_center(screen, font_small, "Press any key to resume", HEIGHT // 2 + 20, color=TEXT_COLOR)
+                    render_text_center(screen, font_small, "Press Esc to Quit", HEIGHT // 2 + 50, color=MUTED_TEXT)
+                else:
+                    if state.get("won", False):
+                        render_text_center(screen, font_large, "YOU WIN!", HEIGHT // 2 - 70)
+                        render_text_center(screen, font_medium, f"Final Score: {state['score']}", HEIGHT // 2 - 10)
+                    else:
+                        render_text_center(screen, font_large, "GAME OVER", HEIGHT // 2 - 70)
+                        render_text_center(screen, font_medium, f"Final Score: {state['score']}", HEIGHT // 2 - 10)
+
+                    render_text_center(screen, font_small, "Press R / Enter / Space to Restart", HEIGHT // 2 + 40, color=TEXT_COLOR)
+                    render_text_center(screen, font_small, "Press Esc to Quit", HEIGHT // 2 + 70, color=MUTED_TEXT)
+                profiler.lap("game_over")
+
+            if profile_overlay.visible:
+                profile_overlay.update()
+                profile_overlay.draw(screen)
+            profiler.lap("overlay")
+            pygame.display.flip()
+        profiler.lap("flip")
+        latency.shown()
+        profiler.end()
 
 
 if __name__ == "__main__":
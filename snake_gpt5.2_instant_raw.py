@@ -1,27 +1,46 @@
-import pygame
 import random
 import sys
 
-# -------------------- INITIAL SETUP --------------------
-pygame.init()
+# pygame (and the snake_render helpers built on it) are imported by
+# init_display(), so importing this module opens no window.
+pygame = None
 
+# -------------------- INITIAL SETUP --------------------
 WIDTH, HEIGHT = 600, 400
 CELL_SIZE = 20
 
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Snake")
-
-clock = pygame.time.Clock()
-
-FONT = pygame.font.SysFont("arial", 24)
-BIG_FONT = pygame.font.SysFont("arial", 48)
-
 # Colors
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
 GREEN = (0, 200, 0)
 RED = (200, 0, 0)
 
+# Display state, set up by init_display()
+screen = None
+clock = None
+FONT = BIG_FONT = None
+text_cache = None
+
+def init_display():
+    """Initialize pygame, create the window, clock and fonts (first call only)."""
+    global pygame, screen, clock, FONT, BIG_FONT, text_cache
+    if screen is not None:
+        return screen
+
+    import pygame
+    from snake_render import text_cache
+
+    pygame.init()
+
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Snake")
+
+    clock = pygame.time.Clock()
+
+    FONT = pygame.font.SysFont("arial", 24)
+    BIG_FONT = pygame.font.SysFont("arial", 48)
+    return screen
+
 # -------------------- GAME STATE --------------------
 def reset_game():
     snake = [(100, 100), (80, 100), (60, 100)]
@@ -38,9 +57,6 @@ def spawn_food(snake):
         if (x, y) not in snake:
             return (x, y)
 
-snake, direction, food, score, speed = reset_game()
-game_over = False
-
 # -------------------- DRAW FUNCTIONS --------------------
 def draw_snake(snake):
     for block in snake:
@@ -50,14 +66,14 @@ def draw_food(food):
     pygame.draw.rect(screen, RED, (*food, CELL_SIZE, CELL_SIZE))
 
 def draw_score(score):
-    text = FONT.render(f"Score: {score}", True, WHITE)
+    text = text_cache.render(FONT, f"Score: {score}", WHITE)
     screen.blit(text, (10, 10))
 
-def draw_game_over():
+def draw_game_over(score):
     screen.fill(BLACK)
-    title = BIG_FONT.render("GAME OVER", True, RED)
-    score_text = FONT.render(f"Final Score: {score}", True, WHITE)
-    restart_text = FONT.render("Press R to Restart or Q to Quit", True, WHITE)
+    title = text_cache.render(BIG_FONT, "GAME OVER", RED)
+    score_text = text_cache.render(FONT, f"Final Score: {score}", WHITE)
+    restart_text = text_cache.render(FONT, "Press R to Restart or Q to Quit", WHITE)
 
     screen.blit(title, (WIDTH // 2 - title.get_width() // 2, 100))
     screen.blit(score_text, (WIDTH // 2 - score_text.get_width() // 2, 170))
@@ -65,65 +81,79 @@ def draw_game_over():
     pygame.display.flip()
 
 # -------------------- MAIN LOOP --------------------
-running = True
-while running:
-    clock.tick(speed)
-
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-
-        if event.type == pygame.KEYDOWN:
-            if not game_over:
-                if event.key == pygame.K_UP and direction != (0, CELL_SIZE):
-                    direction = (0, -CELL_SIZE)
-                elif event.key == pygame.K_DOWN and direction != (0, -CELL_SIZE):
-                    direction = (0, CELL_SIZE)
-                elif event.key == pygame.K_LEFT and direction != (CELL_SIZE, 0):
-                    direction = (-CELL_SIZE, 0)
-                elif event.key == pygame.K_RIGHT and direction != (-CELL_SIZE, 0):
-                    direction = (CELL_SIZE, 0)
-            else:
-                if event.key == pygame.K_r:
-                    snake, direction, food, score, speed = reset_game()
-                    game_over = False
-                elif event.key == pygame.K_q:
-                    running = False
-
-    if game_over:
-        draw_game_over()
-        continue
-
-    # Move snake
-    head_x = snake[0][0] + direction[0]
-    head_y = snake[0][1] + direction[1]
-    new_head = (head_x, head_y)
-
-    # Collision with wall
-    if (
-        head_x < 0 or head_x >= WIDTH or
-        head_y < 0 or head_y >= HEIGHT or
-        new_head in snake
-    ):
-        game_over = True
-        continue
-
-    snake.insert(0, new_head)
-
-    # Eating food
-    if new_head == food:
-        score += 1
-        speed += 1  # SPEED INCREASE
-        food = spawn_food(snake)
-    else:
-        snake.pop()
-
-    # Draw everything
-    screen.fill(BLACK)
-    draw_snake(snake)
-    draw_food(food)
-    draw_score(score)
-    pygame.display.flip()
-
-pygame.quit()
-sys.exit()
+def main():
+    init_display()
+    snake, direction, food, score, speed = reset_game()
+    game_over = False
+
+    running = True
+    while running:
+        if game_over:
+            # The game over screen is static: sleep until the next event
+            events = [pygame.event.wait()]
+            events.extend(pygame.event.get())
+        else:
+            clock.tick(speed)
+            events = pygame.event.get()
+
+        for event in events:
+            if event.type == pygame.QUIT:
+                running = False
+
+            if event.type == pygame.KEYDOWN:
+                if not game_over:
+                    if event.key == pygame.K_UP and direction != (0, CELL_SIZE):
+                        direction = (0, -CELL_SIZE)
+                    elif event.key == pygame.K_DOWN and direction != (0, -CELL_SIZE):
+                        direction = (0, CELL_SIZE)
+                    elif event.key == pygame.K_LEFT and direction != (CELL_SIZE, 0):
+                        direction = (-CELL_SIZE, 0)
+                    elif event.key == pygame.K_RIGHT and direction != (-CELL_SIZE, 0):
+                        direction = (CELL_SIZE, 0)
+                else:
+                    if event.key == pygame.K_r:
+                        snake, direction, food, score, speed = reset_game()
+                        game_over = False
+                    elif event.key == pygame.K_q:
+                        running = False
+
+        if game_over:
+            continue
+
+        # Move snake
+        head_x = snake[0][0] + direction[0]
+        head_y = snake[0][1] + direction[1]
+        new_head = (head_x, head_y)
+
+        # Collision with wall
+        if (
+            head_x < 0 or head_x >= WIDTH or
+            head_y < 0 or head_y >= HEIGHT or
+            new_head in snake
+        ):
+            game_over = True
+            draw_game_over(score)
+            continue
+
+        snake.insert(0, new_head)
+
+        # Eating food
+        if new_head == food:
+            score += 1
+            speed += 1  # SPEED INCREASE
+            food = spawn_food(snake)
+        else:
+            snake.pop()
+
+        # Draw everything
+        screen.fill(BLACK)
+        draw_snake(snake)
+        draw_food(food)
+        draw_score(score)
+        pygame.display.flip()
+
+    pygame.quit()
+    sys.exit()
+
+if __name__ == "__main__":
+    main()
@@ -7,10 +7,18 @@ Requirements:
 - Snake speeds up each time it eats food
 """
 
+import argparse
 import sys
-import random
 import pygame
 
+from snake_autopilot import AUTOPILOTS, has_hamiltonian_cycle
+from snake_engine import SnakeEngine, UP, DOWN, LEFT, RIGHT
+from snake_profile import (AllocationTracker, FrameProfiler, InputLatency, ProfilerOverlay, default_path,
+                           ALLOC_WINDOW)
+from snake_render import (BackgroundCache, Camera, DirtyCells, HudLine, PaletteBoard, blit_batch, sprites,
+                          text_cache)
+from snake_replay import Replay, ReplayPlayer, ReplayRecorder
+
 # -----------------------------
 # Config
 # -----------------------------
@@ -19,6 +27,9 @@ CELL = 24  # grid cell size (pixels) - keep WINDOW_* divisible by CELL for clean
 FPS_BASE = 10  # starting speed (frames per second)
 FPS_STEP = 1   # speed increment per food eaten
 FPS_MAX = 35   # cap speed to keep it playable
+DIRTY_RECTS = True  # repaint only the cells that changed (pygame.display.update(rects))
+BOARD_W, BOARD_H = None, None  # board size in cells (--board); None = the window grid
+ARRAY_RENDER = False  # draw the board from a palette-indexed array, one scaled blit (--render array; needs NumPy)
 
 # Colors
 BLACK = (12, 12, 14)
@@ -28,143 +39,116 @@ DARK = (28, 28, 34)
 RED = (220, 50, 60)
 GREEN = (40, 210, 120)
 YELLOW = (240, 210, 60)
+GRID_LINE = (18, 18, 22)
+
+# Cell looks: (color, inset, corner radius), pre-rendered once as sprites
+HEAD_LOOK = (GREEN, 2, 10)
+BODY_LOOK = ((30, 180, 110), 3, 8)
+FOOD_LOOK = (YELLOW, 4, 8)
 
-# Directions
-UP = (0, -1)
-DOWN = (0, 1)
-LEFT = (-1, 0)
-RIGHT = (1, 0)
+# Palette indices of the array renderer (ARRAY_RENDER); 0 is an empty cell
+PIXEL_BODY, PIXEL_HEAD, PIXEL_FOOD = 1, 2, 3
+
+# Scenes: PLAYING runs the frame loop; PAUSED and GAME_OVER are static, drawn
+# once and then idle in pygame.event.wait() until something happens
+PLAYING, PAUSED, GAME_OVER = "playing", "paused", "game_over"
 
 # -----------------------------
 # Helpers
 # -----------------------------
-def clamp(n, lo, hi):
-    return lo if n < lo else hi if n > hi else n
-
 def grid_size():
     return WINDOW_W // CELL, WINDOW_H // CELL
 
-def random_food_position(occupied_set):
+def board_size():
+    # The board can be bigger than the window; the camera then follows the head
     gw, gh = grid_size()
-    all_cells = gw * gh
-    if len(occupied_set) >= all_cells:
-        return None  # no space
-    while True:
-        pos = (random.randrange(gw), random.randrange(gh))
-        if pos not in occupied_set:
-            return pos
+    return BOARD_W or gw, BOARD_H or gh
 
 def draw_text(surface, text, font, color, center):
-    img = font.render(text, True, color)
+    img = text_cache.render(font, text, color)
     rect = img.get_rect(center=center)
     surface.blit(img, rect)
 
-def draw_cell(surface, pos, color, inset=2, radius=6):
-    x, y = pos
-    r = pygame.Rect(x * CELL, y * CELL, CELL, CELL)
-    r.inflate_ip(-inset, -inset)
-    pygame.draw.rect(surface, color, r, border_radius=radius)
+def cell_sprite(surface, look):
+    # The rounded cell pygame.draw.rect would paint, rasterized once
+    color, inset, radius = look
+    return sprites.get(surface, CELL, color, inset, radius)
+
+# Scratch rect reused by every cell erase, so erasing allocates no Rects
+_erase_rect = pygame.Rect(0, 0, 0, 0)
 
 def draw_grid(surface):
     # subtle grid
     gw, gh = grid_size()
     for x in range(gw + 1):
         px = x * CELL
-        pygame.draw.line(surface, (18, 18, 22), (px, 0), (px, WINDOW_H))
+        pygame.draw.line(surface, GRID_LINE, (px, 0), (px, WINDOW_H))
     for y in range(gh + 1):
         py = y * CELL
-        pygame.draw.line(surface, (18, 18, 22), (0, py), (WINDOW_W, py))
-
-# -----------------------------
-# Game State
-# -----------------------------
-class SnakeGame:
-    def __init__(self):
-        self.reset()
-
-    def reset(self):
-        gw, gh = grid_size()
-        start = (gw // 2, gh // 2)
-        self.snake = [start, (start[0] - 1, start[1]), (start[0] - 2, start[1])]
-        self.direction = RIGHT
-        self.next_direction = RIGHT
-        self.score = 0
-        self.food = random_food_position(set(self.snake))
-        self.alive = True
-        self.victory = False
-        self.speed_fps = FPS_BASE
-
-        # Movement pacing independent from FPS so it feels consistent
-        self.move_interval_ms = int(1000 / self.speed_fps)
-        self._accum_ms = 0
-
-    def set_direction(self, d):
-        # Prevent 180-degree reversal
-        dx, dy = d
-        cx, cy = self.direction
-        if (dx, dy) == (-cx, -cy):
-            return
-        self.next_direction = d
-
-    def _update_speed(self):
-        self.speed_fps = clamp(FPS_BASE + self.score * FPS_STEP, FPS_BASE, FPS_MAX)
-        self.move_interval_ms = int(1000 / self.speed_fps)
-
-    def step(self, dt_ms):
-        if not self.alive:
-            return
-
-        self._accum_ms += dt_ms
-        while self._accum_ms >= self.move_interval_ms and self.alive:
-            self._accum_ms -= self.move_interval_ms
-            self._move_once()
-
-    def _move_once(self):
-        self.direction = self.next_direction
+        pygame.draw.line(surface, GRID_LINE, (0, py), (WINDOW_W, py))
 
-        head_x, head_y = self.snake[0]
-        dx, dy = self.direction
-        new_head = (head_x + dx, head_y + dy)
+def paint_background(surface):
+    surface.fill(BLACK)
+    draw_grid(surface)
+    # Past the edge of a board smaller than the window
+    bw, bh = board_size()
+    surface.fill(DARK, pygame.Rect(bw * CELL, 0, WINDOW_W, WINDOW_H))
+    surface.fill(DARK, pygame.Rect(0, bh * CELL, WINDOW_W, WINDOW_H))
 
-        gw, gh = grid_size()
+# Fill + grid, rendered once and reused every frame
+background = BackgroundCache(paint_background)
 
-        # Wall collision
-        if new_head[0] < 0 or new_head[0] >= gw or new_head[1] < 0 or new_head[1] >= gh:
-            self.alive = False
-            return
-
-        # Self collision (note: moving into the tail is allowed if tail will move away)
-        tail = self.snake[-1]
-        body_set = set(self.snake[:-1])  # exclude tail for collision check unless growing
-        if new_head in body_set:
-            self.alive = False
-            return
-
-        ate = (self.food is not None and new_head == self.food)
-
-        # Insert new head
-        self.snake.insert(0, new_head)
-
-        if ate:
-            self.score += 1
-            self._update_speed()
-
-            occupied = set(self.snake)
-            self.food = random_food_position(occupied)
+def erase_cell(surface, pos):
+    x, y = pos
+    _erase_rect.update(x * CELL, y * CELL, CELL, CELL)
+    background.restore(surface, _erase_rect, CELL)
 
-            if self.food is None:
-                # Grid full => win
-                self.victory = True
-                self.alive = False
-                return
-        else:
-            # Normal move: pop tail
-            self.snake.pop()
+# -----------------------------
+# Game State
+# -----------------------------
+class SnakeGame(SnakeEngine):
+    """The windowed game: the headless engine sized to the board (board_size()).
+
+    When set, autopilot steers before every move (snake_autopilot.Autopilot)
+    and recorder logs every move (snake_replay.ReplayRecorder). fork() and
+    snapshot() (see SnakeEngine) leave both out of the copy.
+    """
+
+    def __init__(self, seed=None):
+        gw, gh = board_size()
+        self.autopilot = None
+        self.recorder = None
+        super().__init__(gw, gh, seed=seed, fps_base=FPS_BASE, fps_step=FPS_STEP, fps_max=FPS_MAX)
+
+    def tick(self):
+        if self.autopilot is not None and self.alive:
+            self.turns.clear()  # the autopilot steers every move itself
+            self.autopilot.drive(self)
+        alive = super().tick()
+        if self.recorder is not None:
+            self.recorder.capture()
+        return alive
+
+    def fork(self):
+        # Forks are for lookahead: nobody steers or records them
+        child = super().fork()
+        child.autopilot = None
+        child.recorder = None
+        return child
 
 # -----------------------------
 # Main
 # -----------------------------
-def main():
+def main(record_dir=None, replay_path=None, replay_speed=1.0, autopilot=None, profile_path=None,
+         alloc_window=None, latency_report=False):
+    # record_dir: save a .snkr replay of every game there (see snake_replay.py)
+    # replay_path: watch a recorded game instead of playing
+    # autopilot: "bfs" or "hamiltonian" starts with that autopilot steering
+    # (P toggles it; without one, P brings in the bfs autopilot)
+    # profile_path: write the frame profile (.csv or .json) there on exit;
+    # F3 shows it on screen, F4 saves it now (see snake_profile.py)
+    # alloc_window: print a tracemalloc allocation report every that many frames
+    # latency_report: print the key press latency histogram on exit (F4 prints it now)
     pygame.init()
     pygame.display.set_caption("Snake (Pygame)")
     screen = pygame.display.set_mode((WINDOW_W, WINDOW_H))
@@ -176,35 +160,190 @@ def main():
     font_big = pygame.font.SysFont("consolas", 44, bold=True)
 
     game = SnakeGame()
+    recorder = player = None
+    if replay_path:
+        replay = Replay.load(replay_path)
+        if (replay.grid_w, replay.grid_h) != (game.grid_w, game.grid_h):
+            print(f"Error: replay is for a {replay.grid_w}x{replay.grid_h} board, this one is {game.grid_w}x{game.grid_h} "
+                  f"(run with --board {replay.grid_w}x{replay.grid_h}).")
+            sys.exit(1)
+        player = ReplayPlayer(replay, game)
+    elif record_dir:
+        recorder = game.recorder = ReplayRecorder(game)
+        recorder.start()
+    pilot_kind = AUTOPILOTS[autopilot or "bfs"]
+    if autopilot and not player:
+        game.autopilot = pilot_kind()
+
+    def restart():
+        if player:
+            player.rewind()
+        elif recorder:
+            recorder.start()
+        else:
+            game.reset()
+        camera.center(game.body.head)
+        dirty.invalidate()
+        latency.discard()
+        if board_pixels is not None:
+            pixel_changes.invalidate()
+
+    # The window shows the board through the camera; on a board the size of
+    # the window it never moves
+    camera = Camera(*grid_size(), game.grid_w, game.grid_h, CELL)
+    camera.center(game.body.head)
+    dirty = DirtyCells(game.grid_w, game.grid_h, CELL)
+    hud = {"values": None, "rect": pygame.Rect(0, 0, 0, 0)}  # last HUD drawn
+    score_line = HudLine(font_small, "Score: {}", WHITE)
+    speed_line = HudLine(font_small, "Speed: {} fps", GRAY)
+    pilot_line = HudLine(font_small, "Autopilot (P)", GREEN)
+    profiler = FrameProfiler()
+    latency = InputLatency()
+    profile_overlay = ProfilerOverlay(profiler, font_small, WHITE, DARK)
+    profile_rect = pygame.Rect(profile_overlay.rect(screen))
+
+    # Head, body and food sprites; a full repaint blits them all in one batch
+    head_sprite = cell_sprite(screen, HEAD_LOOK)
+    body_sprite = cell_sprite(screen, BODY_LOOK)
+    food_sprite = cell_sprite(screen, FOOD_LOOK)
+    batch = []  # (sprite, rect) pairs, reused every full repaint
+
+    # Array renderer: one palette index per board cell, kept current from the
+    # same ring diffs as the dirty rects (see PaletteBoard)
+    board_pixels = None
+    if ARRAY_RENDER:
+        board_pixels = PaletteBoard(game.grid_w, game.grid_h, camera.view_w, camera.view_h, CELL,
+                                    [BODY_LOOK[0], HEAD_LOOK[0], FOOD_LOOK[0]], screen)
+        pixel_changes = DirtyCells(game.grid_w, game.grid_h, CELL)
+
+    def save_profile():
+        print(f"Profile saved: {profiler.export(profile_path or default_path())}")
+
+    def turn(d):
+        # Queue a turn; its latency is measured unless the autopilot steers
+        queued = game.set_direction(d)
+        if game.autopilot is None:
+            latency.pressed(queued)
+
+    def hud_values():
+        return (game.score, game.speed_fps, game.autopilot is not None)
+
+    def hud_changed():
+        # Field by field, so the per-frame check builds no tuple
+        values = hud["values"]
+        return (values is None or values[0] != game.score or values[1] != game.speed_fps
+                or values[2] != (game.autopilot is not None))
+
+    def draw_hud():
+        # The HUD lines only re-render when score/speed change
+        hud["values"] = hud_values()
+        r1 = screen.blit(score_line.render(game.score), (10, 8))
+        r2 = screen.blit(speed_line.render(game.speed_fps), (10, 28))
+        hud["rect"] = r1.union(r2)
+        if game.autopilot is not None:
+            hud["rect"].union_ip(screen.blit(pilot_line.render(), (10, 48)))
+
+    def draw_board_cell(cell):
+        # Repaint one cell from the current game state
+        pos = camera.view_pos(cell)
+        if pos is None:
+            return
+        erase_cell(screen, pos)
+        if cell == game.body.head:
+            screen.blit(head_sprite, camera.rect(cell))
+        elif cell in game.body:
+            screen.blit(body_sprite, camera.rect(cell))
+        elif cell == game.food_cell:
+            screen.blit(food_sprite, camera.rect(cell))
+
+    def draw_play_dirty():
+        # Repaint only what changed; returns the rects to update, or None
+        # after a full repaint
+        if not dirty.collect(game.body, game.food_cell):
+            draw_play()
+            return None
+
+        cells = dirty.cells
+        hud_cells = camera.cells_under(hud["rect"])
+        redraw_hud = hud_changed() or not cells.isdisjoint(hud_cells)
+        if redraw_hud:
+            cells.update(hud_cells)
+        if profile_overlay.visible:
+            profile_cells = camera.cells_under(profile_rect)
+            hud["profile"] = profile_overlay.update() or not cells.isdisjoint(profile_cells)
+            if hud["profile"]:
+                cells.update(profile_cells)
+
+        for cell in cells:
+            draw_board_cell(cell)
+        rects = camera.rects(cells)
+        if redraw_hud:
+            draw_hud()
+            rects.append(hud["rect"])
+        return rects
+
+    def sync_board_pixels():
+        # Only the cells changed since the last frame, or all after a restart
+        body, food = game.body, game.food_cell
+        if not pixel_changes.collect(body, food):
+            board_pixels.load(body.occupancy, PIXEL_BODY)
+            board_pixels.set(body.head, PIXEL_HEAD)
+            if food >= 0:
+                board_pixels.set(food, PIXEL_FOOD)
+            return
+        for cell in pixel_changes.cells:
+            if cell == body.head:
+                board_pixels.set(cell, PIXEL_HEAD)
+            elif cell in body:
+                board_pixels.set(cell, PIXEL_BODY)
+            elif cell == food:
+                board_pixels.set(cell, PIXEL_FOOD)
+            else:
+                board_pixels.set(cell, 0)
 
     def draw_play():
-        screen.fill(BLACK)
-        draw_grid(screen)
+        background.draw(screen, CELL)
+        if board_pixels is not None:
+            # Food and snake in one array push and one scaled blit
+            sync_board_pixels()
+            board_pixels.draw(screen, camera.x, camera.y)
+        else:
+            draw_board_sprites()
 
-        # Food
-        if game.food is not None:
-            draw_cell(screen, game.food, YELLOW, inset=4, radius=8)
+        # HUD
+        draw_hud()
 
-        # Snake
-        for i, seg in enumerate(game.snake):
-            if i == 0:
-                draw_cell(screen, seg, GREEN, inset=2, radius=10)
-            else:
-                draw_cell(screen, seg, (30, 180, 110), inset=3, radius=8)
+    def draw_board_sprites():
+        batch.clear()
 
-        # HUD
-        score_text = f"Score: {game.score}"
-        speed_text = f"Speed: {game.speed_fps} fps"
-        hud = font_small.render(score_text, True, WHITE)
-        hud2 = font_small.render(speed_text, True, GRAY)
-        screen.blit(hud, (10, 8))
-        screen.blit(hud2, (10, 28))
+        # Food
+        if game.food is not None and camera.view_pos(game.food_cell) is not None:
+            batch.append((food_sprite, camera.rect(game.food_cell)))
+
+        # Snake: scan the visible rows of the occupancy grid, so the cost is
+        # set by the window, not the snake length or board size
+        head = game.body.head
+        if camera.view_pos(head) is not None:
+            batch.append((head_sprite, camera.rect(head)))
+        occupancy, view_w = game.body.occupancy, camera.view_w
+        for y, start in camera.rows():
+            row = occupancy[start:start + view_w]
+            x = row.find(1)
+            while x >= 0:
+                if start + x != head:
+                    batch.append((body_sprite, camera.rect(start + x)))
+                x = row.find(1, x + 1)
+
+        # Every cell in one blits() call
+        blit_batch(screen, batch)
+
+    # Dim layer under the static scenes' text, built once
+    shade = pygame.Surface((WINDOW_W, WINDOW_H), pygame.SRCALPHA)
+    shade.fill((0, 0, 0, 180))
 
     def draw_game_over():
         # Dim overlay
-        overlay = pygame.Surface((WINDOW_W, WINDOW_H), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        screen.blit(overlay, (0, 0))
+        screen.blit(shade, (0, 0))
 
         title = "YOU WIN!" if game.victory else "GAME OVER"
         draw_text(screen, title, font_big, RED if not game.victory else GREEN, (WINDOW_W // 2, WINDOW_H // 2 - 60))
@@ -225,41 +364,159 @@ def main():
             (WINDOW_W // 2, WINDOW_H // 2 + 40),
         )
 
+    def draw_paused():
+        screen.blit(shade, (0, 0))
+        draw_text(screen, "PAUSED", font_big, WHITE, (WINDOW_W // 2, WINDOW_H // 2 - 30))
+        draw_text(
+            screen,
+            "Press any key to resume  |  Press ESC to Quit",
+            font_small,
+            GRAY,
+            (WINDOW_W // 2, WINDOW_H // 2 + 30),
+        )
+
+    def draw_profile(rects):
+        # Profiler overlay on top of the frame; on a dirty-rect frame only
+        # when its text or the cells under it changed
+        if not profile_overlay.visible:
+            return
+        if rects is None:
+            profile_overlay.update()
+        elif not hud.get("profile"):
+            return
+        rect = profile_overlay.draw(screen)
+        if rects is not None:
+            rects.append(rect)
+
+    tracker = None
+    if alloc_window:
+        tracker = AllocationTracker(alloc_window)
+        tracker.start(game.ticks)
+
+    scene = PLAYING
+    scene_drawn = False  # a static scene is on screen and up to date
+
     running = True
     while running:
-        dt_ms = clock.tick(60)  # render at up to 60 FPS; movement paced by move_interval_ms
+        profiler.start()
+        if scene == PLAYING:
+            dt_ms = clock.tick(60)  # render at up to 60 FPS; movement paced by move_interval_ms
+            events = pygame.event.get()
+        else:
+            # Static scene: already on screen, so sleep until an event comes
+            events = [pygame.event.wait()]
+            events.extend(pygame.event.get())
+            dt_ms = 0
+        profiler.lap("wait")
 
-        for event in pygame.event.get():
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
 
+            elif event.type in (pygame.WINDOWFOCUSLOST, pygame.WINDOWMINIMIZED):
+                if scene == PLAYING:
+                    scene, scene_drawn = PAUSED, False
+
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     running = False
 
-                if game.alive:
-                    if event.key in (pygame.K_UP, pygame.K_w):
-                        game.set_direction(UP)
+                if event.key == pygame.K_F3:
+                    profile_overlay.toggle()
+                    dirty.invalidate()
+                    scene_drawn = False
+                elif event.key == pygame.K_F4:
+                    save_profile()
+                    print(latency.report())
+                elif scene == PAUSED:
+                    # Any other key resumes; the time spent paused is not played
+                    scene = PLAYING
+                    clock.tick()
+                    dirty.invalidate()
+                elif event.key == pygame.K_SPACE and scene == PLAYING:
+                    scene, scene_drawn = PAUSED, False
+                elif player:
+                    if event.key == pygame.K_r:
+                        restart()
+                elif game.alive:
+                    if event.key == pygame.K_p:
+                        game.autopilot = None if game.autopilot else pilot_kind()
+                        latency.discard()  # the autopilot drops turns still queued
+                    elif event.key in (pygame.K_UP, pygame.K_w):
+                        turn(UP)
                     elif event.key in (pygame.K_DOWN, pygame.K_s):
-                        game.set_direction(DOWN)
+                        turn(DOWN)
                     elif event.key in (pygame.K_LEFT, pygame.K_a):
-                        game.set_direction(LEFT)
+                        turn(LEFT)
                     elif event.key in (pygame.K_RIGHT, pygame.K_d):
-                        game.set_direction(RIGHT)
+                        turn(RIGHT)
                 else:
                     if event.key == pygame.K_r:
-                        game.reset()
-
-        # Update
-        game.step(dt_ms)
+                        restart()
 
-        # Draw
-        draw_play()
-        if not game.alive:
-            draw_game_over()
-
-        pygame.display.flip()
+        if scene == GAME_OVER and game.alive:
+            # Restarted (R)
+            scene = PLAYING
+            clock.tick()
+        profiler.lap("events")
 
+        # Update
+        if scene == PLAYING:
+            if player:
+                player.step(dt_ms * replay_speed)
+            else:
+                game.step(dt_ms)
+                latency.applied(len(game.turns))
+                if recorder:
+                    if not game.alive and not recorder.saved:
+                        print(f"Replay saved: {recorder.save_in(record_dir)}")
+            if camera.follow(game.body.head):
+                dirty.invalidate()  # scrolled: every visible cell moved
+            if not game.alive:
+                scene, scene_drawn = GAME_OVER, False
+        profiler.lap("update")
+
+        # Draw (a static scene only when it changed)
+        rects = None
+        redraw = scene == PLAYING or not scene_drawn
+        if scene != PLAYING:
+            if redraw:
+                draw_play()
+                profiler.lap("draw")
+                if scene == GAME_OVER:
+                    draw_game_over()
+                else:
+                    draw_paused()
+                profiler.lap("game_over")
+                dirty.invalidate()
+                scene_drawn = True
+        elif DIRTY_RECTS and board_pixels is None:
+            rects = draw_play_dirty()
+            profiler.lap("draw")
+        else:
+            draw_play()
+            profiler.lap("draw")
+        if redraw:
+            draw_profile(rects)
+            profiler.lap("overlay")
+            if rects is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(rects)
+            profiler.lap("flip")
+            latency.shown()
+        profiler.end()
+        if tracker:
+            report = tracker.frame(game.ticks)
+            if report:
+                print(report)
+
+    if recorder and not recorder.saved:
+        print(f"Replay saved: {recorder.save_in(record_dir)}")
+    if profile_path:
+        save_profile()
+    if latency_report:
+        print(latency.report())
     pygame.quit()
     sys.exit(0)
 
@@ -268,4 +525,32 @@ if __name__ == "__main__":
     if WINDOW_W % CELL != 0 or WINDOW_H % CELL != 0:
         print("Error: WINDOW_W and WINDOW_H must be divisible by CELL for a clean grid.")
         sys.exit(1)
-    main()
+
+    parser = argparse.ArgumentParser(description="Snake (Pygame)")
+    parser.add_argument("--record", metavar="DIR", help="save a replay of every game in DIR")
+    parser.add_argument("--replay", metavar="FILE", help="watch a recorded game")
+    parser.add_argument("--board", metavar="WxH", help="board size in cells, e.g. 2000x2000 "
+                        "(default: the window grid; bigger boards scroll with the head)")
+    parser.add_argument("--render", choices=("sprites", "array"), default="sprites",
+                        help="sprites: rounded cells, repainting only what changed (default); "
+                        "array: flat cells from a palette-indexed board, one scaled blit per frame (needs NumPy)")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed multiplier (default: 1)")
+    parser.add_argument("--profile", metavar="FILE", help="save per-phase frame times on exit (.csv or .json)")
+    parser.add_argument("--alloc-report", nargs="?", type=int, const=ALLOC_WINDOW, metavar="FRAMES",
+                        help=f"print a tracemalloc allocation report every FRAMES frames (default: {ALLOC_WINDOW})")
+    parser.add_argument("--latency", action="store_true",
+                        help="print a histogram of key press -> move -> screen latency on exit")
+    parser.add_argument("--autopilot", nargs="?", const="bfs", choices=sorted(AUTOPILOTS),
+                        help="let an autopilot play (default: bfs; P toggles it)")
+    args = parser.parse_args()
+    ARRAY_RENDER = args.render == "array"
+    if args.board:
+        try:
+            BOARD_W, BOARD_H = (int(n) for n in args.board.lower().split("x"))
+        except ValueError:
+            parser.error(f"--board: expected WxH, got {args.board!r}")
+        if BOARD_W < 4 or BOARD_H < 1:
+            parser.error("--board: the board must be at least 4x1")
+    if args.autopilot == "hamiltonian" and not has_hamiltonian_cycle(*board_size()):
+        parser.error("--autopilot hamiltonian: the board has no Hamiltonian cycle (both sides must be 2+, one of them even)")
+    main(args.record, args.replay, args.speed, args.autopilot, args.profile, args.alloc_report, args.latency)
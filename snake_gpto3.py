@@ -1,6 +1,9 @@
 import pygame
 import random
 import sys
+from collections import deque
+
+from snake_render import fonts, text_cache
 
 # ---------- CONFIG -----------------------------------------------------------
 WIDTH, HEIGHT = 640, 480          # window size
@@ -12,9 +15,9 @@ FONT_NAME = pygame.font.get_default_font()
 
 
 def draw_text(surface, text, size, color, x, y, center=False):
-    """Render text on the given surface."""
-    font = pygame.font.SysFont(FONT_NAME, size, bold=True)
-    render = font.render(text, True, color)
+    """Render text on the given surface (fonts and rendered text are cached)."""
+    font = fonts.get(FONT_NAME, size, bold=True)
+    render = text_cache.render(font, text, color)
     rect = render.get_rect()
     if center:
         rect.center = (x, y)
@@ -23,14 +26,14 @@ def draw_text(surface, text, size, color, x, y, center=False):
     surface.blit(render, rect)
 
 
-def random_food_position(snake_body):
+def random_food_position(occupied):
     """Return a food position that is not on the snake."""
     while True:
         pos = (
             random.randrange(0, WIDTH, BLOCK_SIZE),
             random.randrange(0, HEIGHT, BLOCK_SIZE),
         )
-        if pos not in snake_body:
+        if pos not in occupied:
             return pos
 
 
@@ -47,9 +50,12 @@ def game_loop():
     GREEN = (  0, 180,   0)
 
     # Initial game state
-    snake_body = [(WIDTH // 2, HEIGHT // 2)]
+    # The body is a deque (O(1) push/pop at both ends) mirrored by a set of
+    # occupied cells (O(1) collision lookup).
+    snake_body = deque([(WIDTH // 2, HEIGHT // 2)])
+    occupied = set(snake_body)
     direction = (BLOCK_SIZE, 0)  # moving right
-    food_pos = random_food_position(snake_body)
+    food_pos = random_food_position(occupied)
     speed = START_SPEED
     score = 0
     game_over = False
@@ -74,7 +80,6 @@ def game_loop():
             # -------------- MOVE SNAKE ---------------------------------------
             new_head = (snake_body[0][0] + direction[0],
                         snake_body[0][1] + direction[1])
-            snake_body.insert(0, new_head)
 
             # Check collisions with walls
             if (new_head[0] < 0 or new_head[0] >= WIDTH or
@@ -82,16 +87,21 @@ def game_loop():
                 game_over = True
 
             # Check collisions with itself
-            if new_head in snake_body[1:]:
+            if new_head in occupied:
                 game_over = True
 
+            snake_body.appendleft(new_head)
+            occupied.add(new_head)
+
             # Check if food eaten
             if new_head == food_pos:
                 score += 1
                 speed += SPEED_INCREMENT
-                food_pos = random_food_position(snake_body)
+                food_pos = random_food_position(occupied)
             else:
-                snake_body.pop()  # remove tail segment if no food eaten
+                tail = snake_body.pop()  # remove tail segment if no food eaten
+                if tail != new_head:
+                    occupied.discard(tail)
 
             # -------------- RENDERING ----------------------------------------
             screen.fill(BLACK)
@@ -132,9 +142,12 @@ def game_loop():
                         sys.exit()
                     elif event.key == pygame.K_r:
                         # reset game state
-                        snake_body[:] = [(WIDTH // 2, HEIGHT // 2)]
+                        snake_body.clear()
+                        snake_body.append((WIDTH // 2, HEIGHT // 2))
+                        occupied.clear()
+                        occupied.update(snake_body)
                         direction = (BLOCK_SIZE, 0)
-                        food_pos = random_food_position(snake_body)
+                        food_pos = random_food_position(occupied)
                         speed = START_SPEED
                         score = 0
                         game_over = False
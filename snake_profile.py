@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+Snake profile - per-phase frame timing for the game loops
+
+FrameProfiler splits every frame into phases (PHASES: event polling, the
+frame-rate wait, the game update, drawing, the game over screen, this
+overlay, and the flip / update to the display) with perf_counter laps. The
+last `size` frames are kept in fixed ring buffers (one array('d') per
+phase), so recording allocates nothing and costs a few microseconds per
+frame. A phase that did not run in a frame (the game over screen during
+play) is stored as NaN and left out of its statistics.
+
+stats() gives p50 / p95 / p99 / max per phase and for the whole frame;
+export() writes the samples and stats as CSV or JSON. ProfilerOverlay draws
+the stats on screen, refreshed a few times a second.
+
+AllocationTracker is the memory counterpart: tracemalloc over a window of
+frames, reporting per frame and per tick the transient allocation peak, the
+blocks left alive (what eventually makes the cyclic GC run), the GC passes
+and their pauses, and the call sites that left blocks behind.
+
+InputLatency times key presses: from the loop picking up a turn to the
+tick that moves with it (key -> sim), and to the flip that first shows
+that move (key -> screen), as histograms over fixed millisecond buckets.
+
+In snake_gpt5.2_thinking.py and snake_gpt5.2_auto.py, F3 toggles the
+overlay and F4 exports the samples and prints the input latency histogram
+(also `--profile FILE` and `--latency` on exit in the thinking variant);
+`--alloc-report [FRAMES]` in the thinking variant prints an allocation
+report every FRAMES frames.
+"""
+
+import gc
+import json
+import math
+import sys
+import time
+import tracemalloc
+from array import array
+from collections import deque
+
+PHASES = ("events", "wait", "update", "draw", "game_over", "overlay", "flip")
+RING_FRAMES = 600        # frames kept (10 s at 60 FPS)
+OVERLAY_REFRESH = 15     # frames between overlay text updates
+ALLOC_WINDOW = 300       # frames per allocation report
+ALLOC_TOP = 10           # call sites listed per report
+LATENCY_BUCKETS = (4, 8, 16, 24, 33, 50, 67, 100, 150, 250)  # upper bounds (ms)
+NOT_RUN = math.nan
+
+
+def percentile(values, p):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    k = max(0, min(len(ordered) - 1, int(round(p / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[k]
+
+
+def default_path(extension=".json"):
+    return f"snake-profile-{time.strftime('%Y%m%d-%H%M%S')}{extension}"
+
+
+# -----------------------------
+# Profiler
+# -----------------------------
+class FrameProfiler:
+    """Phase times of the last `size` frames, in milliseconds.
+
+    Per frame: start(), then lap(phase) after each phase (time since the
+    previous lap goes to that phase; lapping a phase twice adds up), then
+    end().
+    """
+
+    def __init__(self, phases=PHASES, size=RING_FRAMES):
+        self.phases = tuple(phases)
+        self.size = size
+        self.rings = [array("d", [NOT_RUN]) * size for _ in self.phases]
+        self.frames = 0  # frames recorded since creation
+        self.pos = 0     # ring slot of the current frame
+        self._index = {phase: i for i, phase in enumerate(self.phases)}
+        self._t = time.perf_counter()
+
+    def start(self):
+        pos = self.pos
+        for ring in self.rings:
+            ring[pos] = NOT_RUN
+        self._t = time.perf_counter()
+
+    def lap(self, phase):
+        now = time.perf_counter()
+        ring = self.rings[self._index[phase]]
+        ms = (now - self._t) * 1000
+        prev = ring[self.pos]
+        ring[self.pos] = ms if prev != prev else prev + ms
+        self._t = now
+
+    def end(self):
+        self.frames += 1
+        self.pos = self.pos + 1 if self.pos + 1 < self.size else 0
+
+    # -------------------------
+    # Results
+    # -------------------------
+    def samples(self):
+        """{phase: [ms or None, ...]} oldest frame first, plus "frame" (the sum)."""
+        n = min(self.frames, self.size)
+        first = (self.pos - n) % self.size
+        order = [(first + i) % self.size for i in range(n)]
+        out = {}
+        for phase, ring in zip(self.phases, self.rings):
+            out[phase] = [None if ring[i] != ring[i] else ring[i] for i in order]
+        out["frame"] = [sum(ring[i] for ring in self.rings if ring[i] == ring[i]) for i in order]
+        return out
+
+    def stats(self):
+        """{phase: {"n", "p50", "p95", "p99", "max"}} over the recorded frames (ms)."""
+        out = {}
+        for phase, values in self.samples().items():
+            values = [v for v in values if v is not None]
+            if not values:
+                continue
+            out[phase] = {
+                "n": len(values),
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+                "p99": percentile(values, 99),
+                "max": max(values),
+            }
+        return out
+
+    def export(self, path):
+        """Write the samples to path (.csv: one row per frame; else JSON). Returns path."""
+        samples = self.samples()
+        columns = list(samples)
+        with open(path, "w", newline="") as f:
+            if path.lower().endswith(".csv"):
+                f.write(",".join(["frame_index"] + [f"{c}_ms" for c in columns]) + "\n")
+                for i, row in enumerate(zip(*(samples[c] for c in columns))):
+                    f.write(",".join([str(i)] + ["" if v is None else f"{v:.4f}" for v in row]) + "\n")
+            else:
+                json.dump({"phases": columns, "frames": len(samples["frame"]),
+                           "stats": self.stats(), "samples_ms": samples}, f)
+        return path
+
+
+# -----------------------------
+# Overlay
+# -----------------------------
+class ProfilerOverlay:
+    """A table of per-phase p50/p95/p99, re-rendered every `refresh` frames.
+
+    Needs only a pygame font. Columns are laid out from measured text
+    widths (the font need not be monospaced) and the box has a fixed size,
+    so the area to repaint never changes.
+    """
+
+    COLUMNS = ("p50", "p95", "p99")
+
+    def __init__(self, profiler, font, color=(235, 235, 235), background=(0, 0, 0), refresh=OVERLAY_REFRESH):
+        self.profiler = profiler
+        self.font = font
+        self.color = color
+        self.background = background
+        self.refresh = refresh
+        self.visible = False
+        self.cells = []  # (text surface, x, y) relative to the box
+        self._rendered_at = None
+        self.rows = list(profiler.phases) + ["frame"]
+        pad, gap = 6, 10
+        self.name_width = max(font.size(name)[0] for name in self.rows + ["ms"])
+        self.number_width = font.size("000.00")[0]
+        self.line_height = font.get_linesize()
+        self._pad, self._gap = pad, gap
+        self.size = (2 * pad + self.name_width + len(self.COLUMNS) * (gap + self.number_width),
+                     2 * pad + self.line_height * (len(self.rows) + 1))
+
+    def toggle(self):
+        self.visible = not self.visible
+        self._rendered_at = None
+        return self.visible
+
+    def update(self):
+        """Re-render the text if it is due. Returns True when it changed."""
+        frames = self.profiler.frames
+        if self._rendered_at is not None and frames - self._rendered_at < self.refresh:
+            return False
+        self._rendered_at = frames
+        stats = self.profiler.stats()
+        table = [["ms"] + list(self.COLUMNS)]
+        for name in self.rows:
+            s = stats.get(name)
+            if s is not None:
+                table.append([name] + [f"{s[c]:.2f}" for c in self.COLUMNS])
+
+        pad, gap, font = self._pad, self._gap, self.font
+        self.cells = []
+        for row, texts in enumerate(table):
+            y = pad + row * self.line_height
+            self.cells.append((font.render(texts[0], True, self.color), pad, y))
+            right = pad + self.name_width
+            for text in texts[1:]:
+                right += gap + self.number_width
+                img = font.render(text, True, self.color)
+                self.cells.append((img, right - img.get_width(), y))  # right-aligned
+        return True
+
+    def rect(self, surface, margin=10):
+        """The box's rect, in the top-right corner of surface."""
+        w, h = self.size
+        return (surface.get_width() - w - margin, margin, w, h)
+
+    def draw(self, surface):
+        """Draw the box; returns its rect."""
+        x, y, w, h = rect = self.rect(surface)
+        surface.fill(self.background, rect)
+        for img, dx, dy in self.cells:
+            surface.blit(img, (x + dx, y + dy))
+        return rect
+
+
+# -----------------------------
+# Allocations
+# -----------------------------
+class AllocationTracker:
+    """tracemalloc over windows of `window` frames.
+
+    Call frame(ticks) once per frame with the game's tick counter; every
+    `window` frames it returns a report (a string) and starts the next
+    window, else None. The counter may go back to 0 when a new game starts:
+    a drop counts as a restart, and the new game's ticks are added on. Per
+    frame it reads the tracemalloc peak above the frame's starting memory
+    (allocations freed again within the frame); per window it diffs two
+    snapshots by call site (allocations still alive).
+    Tracing slows the game down several times, so it is only for finding
+    allocations, not for timing.
+    """
+
+    def __init__(self, window=ALLOC_WINDOW, top=ALLOC_TOP, nframe=1):
+        self.window = window
+        self.top = top
+        self.nframe = nframe
+        self.active = False
+        self._gc_pauses = []
+        self._gc_start = None
+
+    def start(self, ticks=0):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.nframe)
+        if not self.active:
+            gc.callbacks.append(self._on_gc)
+        self.active = True
+        self._begin(ticks)
+
+    def stop(self):
+        if self.active:
+            gc.callbacks.remove(self._on_gc)
+            tracemalloc.stop()
+        self.active = False
+
+    def _begin(self, ticks):
+        self._snapshot = self._take_snapshot()
+        self._blocks = sys.getallocatedblocks()
+        self._ticks = ticks  # the counter at the last frame
+        self._moves = 0      # ticks made in this window, across restarts
+        self._frames = 0
+        self._peaks = []
+        self._gc_pauses = []
+        tracemalloc.reset_peak()
+        self._frame_start = tracemalloc.get_traced_memory()[0]
+
+    def _take_snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ))
+
+    def _on_gc(self, phase, info):
+        if phase == "start":
+            self._gc_start = time.perf_counter()
+        elif self._gc_start is not None:
+            self._gc_pauses.append((info["generation"], (time.perf_counter() - self._gc_start) * 1000))
+            self._gc_start = None
+
+    def frame(self, ticks):
+        if not self.active:
+            return None
+        current, peak = tracemalloc.get_traced_memory()
+        self._peaks.append(max(0, peak - self._frame_start))
+        self._frames += 1
+        self._moves += ticks - self._ticks if ticks >= self._ticks else ticks
+        self._ticks = ticks
+        report = None
+        if self._frames >= self.window:
+            report = self.report()
+            self._begin(ticks)
+        tracemalloc.reset_peak()
+        self._frame_start = tracemalloc.get_traced_memory()[0]
+        return report
+
+    def report(self):
+        frames = self._frames
+        moves = self._moves
+        blocks = sys.getallocatedblocks() - self._blocks
+        stats = self._take_snapshot().compare_to(self._snapshot, "lineno")
+        grown = sorted((s for s in stats if s.count_diff > 0), key=lambda s: -s.count_diff)
+        peaks = self._peaks
+        pauses = [ms for _, ms in self._gc_pauses]
+        per_tick = f"{blocks / moves:+.2f}" if moves else "-"
+        lines = [
+            f"Allocations over {frames} frames / {moves} ticks:",
+            f"  transient peak per frame: p50 {percentile(peaks, 50) / 1024:.1f} KiB, "
+            f"max {max(peaks) / 1024:.1f} KiB",
+            f"  blocks left alive: {blocks:+d} ({blocks / frames:+.2f}/frame, {per_tick}/tick)",
+            f"  gc passes: {len(pauses)}"
+            + (f", pause max {max(pauses):.2f} ms, total {sum(pauses):.2f} ms" if pauses else ""),
+        ]
+        if grown:
+            lines.append("  call sites left holding blocks (count, size):")
+            for stat in grown[:self.top]:
+                frame = stat.traceback[0]
+                lines.append(f"    {stat.count_diff:+6d} {stat.size_diff:+9d} B  {frame.filename}:{frame.lineno}")
+        return "\n".join(lines)
+
+
+# -----------------------------
+# Input latency
+# -----------------------------
+class InputLatency:
+    """Key press latency histograms: key -> sim and key -> screen, in ms.
+
+    pressed(queued) when a key press has been turned into a queued turn
+    (queued=False counts it as ignored); applied(waiting) after the game
+    update, with the number of turns still queued, so the presses before
+    those are the ones this update moved with; shown() right after the flip.
+    discard() forgets presses that will never be applied (a restart, or an
+    autopilot taking over and clearing the queue). Only turns a tick actually
+    moved with are counted, so presses the game ignored are kept out too.
+    Times start when the loop polls the event; the time a key sits in the
+    OS queue before that (up to a frame) is not visible to pygame.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.to_sim = [0] * (len(self.buckets) + 1)  # last slot: over the top bucket
+        self.to_screen = [0] * (len(self.buckets) + 1)
+        self.ignored = 0
+        self.max_ms = 0.0
+        self._queued = deque()  # press times of turns still queued
+        self._moved = []        # press times of turns moved with, not yet shown
+
+    def pressed(self, queued=True):
+        if queued:
+            self._queued.append(time.perf_counter())
+        else:
+            self.ignored += 1
+
+    def applied(self, waiting):
+        queued = self._queued
+        if len(queued) <= waiting:
+            return
+        now = time.perf_counter()
+        while len(queued) > waiting:
+            t = queued.popleft()
+            self._add(self.to_sim, (now - t) * 1000)
+            self._moved.append(t)
+
+    def shown(self):
+        moved = self._moved
+        if not moved:
+            return
+        now = time.perf_counter()
+        for t in moved:
+            ms = (now - t) * 1000
+            self._add(self.to_screen, ms)
+            if ms > self.max_ms:
+                self.max_ms = ms
+        moved.clear()
+
+    def discard(self):
+        self._queued.clear()
+
+    def _add(self, counts, ms):
+        for i, bound in enumerate(self.buckets):
+            if ms < bound:
+                counts[i] += 1
+                return
+        counts[-1] += 1
+
+    def report(self, width=30):
+        shown = sum(self.to_screen)
+        lines = [f"Input latency over {shown} turns ({self.ignored} key presses ignored), "
+                 f"max {self.max_ms:.1f} ms to screen:",
+                 f"  {'ms':>6}  {'key->sim':>8}  {'key->screen':>11}"]
+        top = max(max(self.to_sim), max(self.to_screen), 1)
+        labels = [f"< {b}" for b in self.buckets] + [f">={self.buckets[-1]}"]
+        for label, sim, screen in zip(labels, self.to_sim, self.to_screen):
+            lines.append(f"  {label:>6}  {sim:8d}  {screen:11d}  {'#' * round(screen * width / top)}".rstrip())
+        return "\n".join(lines)
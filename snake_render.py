@@ -0,0 +1,479 @@
+#!/usr/bin/env python3
+"""
+Snake render - shared pygame drawing helpers for the variants
+
+- DirtyCells: works out which grid cells changed since the last frame so a
+  variant can repaint just those and call pygame.display.update(rects)
+- BackgroundCache: the static background (fill, grid, board chrome) painted
+  once into a Surface, so a frame starts with one blit instead of a fill
+  plus a draw call per grid line
+- CellSprites: cell appearances (rounded snake segments, food) rasterized
+  once into small Surfaces, so a snake is drawn with one blits() batch
+  instead of a pygame.draw.rect call per segment
+- PaletteBoard: the board as a palette-indexed array, one pixel per cell,
+  pushed with surfarray and drawn with one scaled blit (needs NumPy)
+- FontRegistry / TextCache / HudLine: fonts built once, rendered text reused
+  until it changes
+- Camera: the window's view onto a board bigger than the window, following
+  the snake's head
+"""
+
+from collections import OrderedDict
+
+import pygame
+
+
+# -----------------------------
+# Static background
+# -----------------------------
+class BackgroundCache:
+    """A pre-rendered background layer.
+
+    paint(surface) draws the static part of the frame. It runs again only
+    when the target surface size or the cell size changes.
+    """
+
+    def __init__(self, paint):
+        self.paint = paint
+        self.surface = None
+        self._cell_size = None
+
+    def get(self, target, cell_size):
+        # Checked field by field: this runs for every erased cell, so it
+        # should not build key tuples
+        surface = self.surface
+        if (surface is None or cell_size != self._cell_size
+                or surface.get_width() != target.get_width()
+                or surface.get_height() != target.get_height()):
+            # Same pixel format as the target so blits need no conversion
+            surface = self.surface = pygame.Surface(target.get_size(), 0, target)
+            self.paint(surface)
+            self._cell_size = cell_size
+        return surface
+
+    def invalidate(self):
+        self.surface = None
+
+    def draw(self, target, cell_size):
+        """Start a frame: copy the whole background onto target."""
+        target.blit(self.get(target, cell_size), (0, 0))
+
+    def restore(self, target, rect, cell_size):
+        """Copy back just the background under rect."""
+        target.blit(self.get(target, cell_size), rect, rect)
+
+
+# -----------------------------
+# Sprites
+# -----------------------------
+SPRITE_KEY = (255, 0, 255)  # colorkey for the transparent corners of a sprite
+
+
+class CellSprites:
+    """Cell-sized sprites, rendered once per appearance.
+
+    get(target, cell_size, color, inset, radius) returns a cell_size square
+    Surface with exactly the pixels pygame.draw.rect(color, cell rect
+    inflated by -inset, border_radius=radius) would paint. The corners are a
+    colorkey (RLE-accelerated), not per-pixel alpha, so blitting a sprite at
+    a cell's top-left gives the same picture as drawing the rect there.
+    Sprites share the target's pixel format so blits need no conversion.
+    """
+
+    def __init__(self):
+        self._sprites = {}
+
+    def get(self, target, cell_size, color, inset=0, radius=0):
+        key = (target.get_bitsize(), cell_size, tuple(color), inset, radius)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            sprite = pygame.Surface((cell_size, cell_size), 0, target)
+            colorkey = SPRITE_KEY if tuple(color)[:3] != SPRITE_KEY else (0, 0, 0)
+            sprite.fill(colorkey)
+            rect = pygame.Rect(0, 0, cell_size, cell_size).inflate(-inset, -inset)
+            pygame.draw.rect(sprite, color, rect, border_radius=radius)
+            sprite.set_colorkey(colorkey, pygame.RLEACCEL)
+            self._sprites[key] = sprite
+        return sprite
+
+    def clear(self):
+        self._sprites.clear()
+
+    def __len__(self):
+        return len(self._sprites)
+
+
+def blit_batch(target, pairs):
+    """Blit (surface, dest) pairs in one call: fblits() on pygame-ce, else blits()."""
+    fblits = getattr(target, "fblits", None)
+    if fblits is not None:
+        fblits(pairs)
+    else:
+        target.blits(pairs, False)
+
+
+# -----------------------------
+# Palette board
+# -----------------------------
+class PaletteBoard:
+    """The board as one palette index per cell, drawn with one scaled blit.
+
+    cells is a (board_h, board_w) uint8 NumPy array: 0 is empty (the
+    background shows through), i > 0 is drawn in palette[i - 1]. Callers
+    keep it current with set() for the few cells a move changes (head, old
+    head, vacated tail, food) and load() after a restart.
+
+    draw() pushes the view_w x view_h window at board cell (x, y) to a
+    low-resolution surface with pygame.surfarray.blit_array, scales it to
+    cell size with one transform.scale and blits the result, so a frame
+    costs O(window pixels) whatever the snake length or board size. Cells
+    come out as flat squares: per-cell shapes (insets, rounded corners) need
+    the sprite path instead.
+    """
+
+    def __init__(self, board_w, board_h, view_w, view_h, cell_size, palette, target):
+        try:
+            import numpy as np
+        except ImportError as e:
+            raise ImportError("PaletteBoard needs NumPy (pip install numpy)") from e
+        palette = [tuple(color)[:3] for color in palette]
+        if SPRITE_KEY in palette:
+            raise ValueError(f"{SPRITE_KEY} is the transparent color and cannot be in the palette")
+        self.board_w = board_w
+        self.board_h = board_h
+        self.view_w = min(view_w, board_w)
+        self.view_h = min(view_h, board_h)
+        self.cell_size = cell_size
+        self.cells = np.zeros((board_h, board_w), np.uint8)
+        self._flat = self.cells.reshape(-1)  # a view: indexed by cell
+        self._frame = memoryview(self._flat)  # much cheaper than NumPy item access
+        size = (self.view_w, self.view_h)
+        self._indexed = pygame.Surface(size, 0, 8)
+        self._indexed.set_palette([SPRITE_KEY] + palette)
+        # Scaling runs fastest in the target's own format
+        self._rgb = pygame.Surface(size, 0, target)
+        self._scaled = pygame.Surface((self.view_w * cell_size, self.view_h * cell_size), 0, target)
+        self._scaled.set_colorkey(SPRITE_KEY)
+
+    def set(self, cell, index):
+        self._frame[cell] = index
+
+    def load(self, occupancy, index):
+        """Every cell from an occupancy grid (1 = snake): index there, 0 elsewhere."""
+        flat = self._flat
+        flat[:] = memoryview(occupancy)
+        flat *= index
+
+    def clear(self):
+        self._flat[:] = 0
+
+    def draw(self, target, x=0, y=0, dest=(0, 0)):
+        """Draw the view whose top-left board cell is (x, y); returns the blit rect."""
+        window = self.cells[y:y + self.view_h, x:x + self.view_w]
+        pygame.surfarray.blit_array(self._indexed, window.T)  # surfarray indexes [x, y]
+        self._rgb.blit(self._indexed, (0, 0))
+        pygame.transform.scale(self._rgb, self._scaled.get_size(), self._scaled)
+        return target.blit(self._scaled, dest)
+
+
+# -----------------------------
+# Text
+# -----------------------------
+class FontRegistry:
+    """pygame.font.SysFont objects, built once per (name, size, bold, italic)."""
+
+    def __init__(self):
+        self._fonts = {}
+
+    def get(self, name, size, bold=False, italic=False):
+        key = (name, size, bold, italic)
+        font = self._fonts.get(key)
+        if font is None:
+            font = self._fonts[key] = pygame.font.SysFont(name, size, bold=bold, italic=italic)
+        return font
+
+    def clear(self):
+        self._fonts.clear()
+
+
+class TextCache:
+    """Rendered text Surfaces keyed by (font, text, color, antialias).
+
+    Least recently used entries are dropped once there are more than maxsize.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, color, antialias)
+        cache = self._cache
+        img = cache.get(key)
+        if img is not None:
+            cache.move_to_end(key)
+            self.hits += 1
+            return img
+
+        self.misses += 1
+        img = cache[key] = font.render(text, antialias, color)
+        if len(cache) > self.maxsize:
+            cache.popitem(last=False)
+        return img
+
+    def clear(self):
+        self._cache.clear()
+
+    def __len__(self):
+        return len(self._cache)
+
+
+class HudLine:
+    """One line of HUD text ("Score: {}") re-rendered only when its value changes."""
+
+    def __init__(self, font, template, color, antialias=True):
+        self.font = font
+        self.template = template
+        self.color = color
+        self.antialias = antialias
+        self.text = None
+        self.surface = None
+        self._value = self  # sentinel: never equal to a real value
+
+    def render(self, *value):
+        if value != self._value:
+            self._value = value
+            self.text = self.template.format(*value)
+            self.surface = self.font.render(self.text, self.antialias, self.color)
+        return self.surface
+
+
+# Shared instances for single-window games
+fonts = FontRegistry()
+text_cache = TextCache()
+sprites = CellSprites()
+
+
+# -----------------------------
+# Camera
+# -----------------------------
+class Camera:
+    """A view_w x view_h window of cells onto a board_w x board_h board.
+
+    follow(cell) keeps that cell at least margin cells away from the view
+    edges (where the board allows), moving the view as little as possible,
+    so the picture scrolls only when the head nears an edge. The view never
+    shows anything past the board edges; on a board no bigger than the view
+    it never moves.
+
+    Cells are board cell indices (y * board_w + x). The drawing helpers work
+    in view cells, so a frame costs O(view) whatever the board size. View
+    positions and screen rects come from tables built once, so looking them
+    up allocates nothing; treat them as read-only.
+    """
+
+    def __init__(self, view_w, view_h, board_w, board_h, cell_size, margin=None):
+        self.board_w = board_w
+        self.board_h = board_h
+        self.view_w = min(view_w, board_w)
+        self.view_h = min(view_h, board_h)
+        self.cell_size = cell_size
+        if margin is None:
+            margin = (self.view_w // 4, self.view_h // 4)
+        elif isinstance(margin, int):
+            margin = (margin, margin)
+        self.margin = margin
+        self.x = 0
+        self.y = 0
+        # Per view cell (vy * view_w + vx): its (vx, vy) and its screen rect
+        self._positions = [(vx, vy) for vy in range(self.view_h) for vx in range(self.view_w)]
+        self._rects = [pygame.Rect(vx * cell_size, vy * cell_size, cell_size, cell_size)
+                       for vx, vy in self._positions]
+        self._out = []           # rects() result, reused
+        self._under_key = None   # cells_under() result for one rect, reused
+        self._under = []
+
+    def _place(self, x, y):
+        x = max(0, min(x, self.board_w - self.view_w))
+        y = max(0, min(y, self.board_h - self.view_h))
+        moved = x != self.x or y != self.y
+        self.x, self.y = x, y
+        return moved
+
+    def follow(self, cell):
+        """Scroll so cell is inside the margins. Returns True if the view moved."""
+        x, y = cell % self.board_w, cell // self.board_w
+        mx, my = self.margin
+        vx = max(x - (self.view_w - 1 - mx), min(self.x, x - mx))
+        vy = max(y - (self.view_h - 1 - my), min(self.y, y - my))
+        return self._place(vx, vy)
+
+    def center(self, cell):
+        """Jump so cell is in the middle of the view. Returns True if the view moved."""
+        x, y = cell % self.board_w, cell // self.board_w
+        return self._place(x - self.view_w // 2, y - self.view_h // 2)
+
+    def view_index(self, cell):
+        """vy * view_w + vx of cell, or -1 when it is off screen."""
+        x = cell % self.board_w - self.x
+        y = cell // self.board_w - self.y
+        if 0 <= x < self.view_w and 0 <= y < self.view_h:
+            return y * self.view_w + x
+        return -1
+
+    def view_pos(self, cell):
+        """(x, y) of cell in view cells, or None when it is off screen."""
+        i = self.view_index(cell)
+        return self._positions[i] if i >= 0 else None
+
+    def rows(self):
+        """(view_y, board cell at the left edge of the view) for every visible row."""
+        start = self.y * self.board_w + self.x
+        for vy in range(self.view_h):
+            yield vy, start
+            start += self.board_w
+
+    def rect(self, cell):
+        """Screen rect of a visible cell."""
+        return self._rects[self.view_index(cell)]
+
+    def rects(self, cells):
+        """Screen rects of the visible cells among cells.
+
+        The list is reused by the next call; append to it freely until then.
+        """
+        out, table = self._out, self._rects
+        out.clear()
+        for cell in cells:
+            i = self.view_index(cell)
+            if i >= 0:
+                out.append(table[i])
+        return out
+
+    def cells_under(self, rect):
+        """Board cells showing under a screen rect (clipped to the view).
+
+        Cached for the last rect and view position, so asking every frame
+        allocates nothing.
+        """
+        key = (rect.x, rect.y, rect.w, rect.h, self.x, self.y)
+        if key != self._under_key:
+            self._under_key = key
+            self._under = self._cells_under(rect)
+        return self._under
+
+    def _cells_under(self, rect):
+        size = self.cell_size
+        x0 = max(0, rect.left // size)
+        y0 = max(0, rect.top // size)
+        x1 = min(self.view_w - 1, (rect.right - 1) // size)
+        y1 = min(self.view_h - 1, (rect.bottom - 1) // size)
+        w = self.board_w
+        return [(self.y + y) * w + self.x + x for y in range(y0, y1 + 1) for x in range(x0, x1 + 1)]
+
+
+# -----------------------------
+# Dirty rectangles
+# -----------------------------
+class DirtyCells:
+    """Grid cells that need repainting since the previous frame.
+
+    collect() reads the ring pointers of a SnakeBody (see snake_engine.py):
+    cells pushed at the head and popped at the tail since the last frame are
+    still in the ring, so finding them costs O(moves since last frame), not
+    O(snake length). The previous head (now drawn as body) and old/new food
+    cells are added too.
+
+    Anything else that changes the picture (a restart, a resize, an overlay)
+    must call invalidate(), which makes the next collect() ask for a full
+    repaint.
+    """
+
+    def __init__(self, grid_w, grid_h, cell_size):
+        self.grid_w = grid_w
+        self.grid_h = grid_h
+        self.cell_size = cell_size
+        self.cells = set()
+        self.full = True
+        self._body = None
+        self._head_pos = 0
+        self._tail_pos = 0
+        self._length = 0
+        self._food = -1
+        self._rects = None
+        self._out = []
+
+    def invalidate(self):
+        self.full = True
+
+    def collect(self, body, food_cell):
+        """Gather changed cells into self.cells.
+
+        Returns False when the caller should repaint everything instead (first
+        frame, after invalidate(), or too many moves to tell apart).
+        """
+        cells = self.cells
+        cells.clear()
+        cap = body.capacity
+        pushed = (body.head_pos - self._head_pos) % cap
+        popped = (body.tail_pos - self._tail_pos) % cap
+        if self.full or body is not self._body or self._length + pushed > cap:
+            self._sync(body, food_cell)
+            return False
+
+        ring = body.ring
+        if pushed:
+            cells.add(ring[self._head_pos])  # old head, now a body segment
+            pos = self._head_pos
+            for _ in range(pushed):
+                pos = pos + 1 if pos + 1 != cap else 0
+                cells.add(ring[pos])
+        pos = self._tail_pos
+        for _ in range(popped):
+            cells.add(ring[pos])
+            pos = pos + 1 if pos + 1 != cap else 0
+
+        if food_cell != self._food:
+            if self._food >= 0:
+                cells.add(self._food)
+            if food_cell >= 0:
+                cells.add(food_cell)
+
+        self._sync(body, food_cell)
+        return True
+
+    def _sync(self, body, food_cell):
+        self.full = False
+        self._body = body
+        self._head_pos = body.head_pos
+        self._tail_pos = body.tail_pos
+        self._length = body.length
+        self._food = food_cell
+
+    def cells_under(self, rect):
+        """Cell indices overlapping a pixel rect (clipped to the grid)."""
+        size = self.cell_size
+        x0 = max(0, rect.left // size)
+        y0 = max(0, rect.top // size)
+        x1 = min(self.grid_w - 1, (rect.right - 1) // size)
+        y1 = min(self.grid_h - 1, (rect.bottom - 1) // size)
+        w = self.grid_w
+        return [y * w + x for y in range(y0, y1 + 1) for x in range(x0, x1 + 1)]
+
+    def rect(self, cell):
+        """Screen rect of cell (shared, built once per cell; do not modify)."""
+        if self._rects is None:
+            size, w = self.cell_size, self.grid_w
+            self._rects = [pygame.Rect((c % w) * size, (c // w) * size, size, size)
+                           for c in range(w * self.grid_h)]
+        return self._rects[cell]
+
+    def rects(self):
+        """Rects of the changed cells; the list is reused by the next call."""
+        out = self._out
+        out.clear()
+        for c in self.cells:
+            out.append(self.rect(c))
+        return out
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Snake replay - deterministic recording and playback of SnakeEngine games
+
+A replay is everything needed to re-run a game exactly:
+- the food RNG seed and the board / speed configuration
+- the direction used on every tick, as 2-bit codes run-length encoded
+
+SnakeEngine only uses its RNG for food, so the same seed and the same
+direction per tick reproduce the game move for move, whatever frame rate the
+game was played at. play() drives the moves with run() (the tick loop behind
+step()), so a replay runs as fast as the engine; ReplayPlayer.step() paces
+them by game time instead, for watching.
+
+File format (little endian):
+    header  "SNKR", version u8, seed u64, grid_w u16, grid_h u16,
+            fps_base u16, fps_step u16, fps_max u16,
+            ticks u32, score u32, flags u8 (1 = alive, 2 = victory)
+    runs    one unsigned LEB128 varint per run: (tick_count << 2) | direction
+            (direction codes are indices into snake_engine.DIRECTIONS)
+
+A run of up to 31 ticks fits in one byte, so typical play costs well under a
+byte per turn.
+
+Usage:
+    python snake_replay.py info game.snkr
+    python snake_replay.py verify game.snkr [more.snkr ...]
+"""
+
+import os
+import random
+import struct
+import sys
+import time
+
+from snake_engine import SnakeEngine, DIRECTIONS
+
+MAGIC = b"SNKR"
+VERSION = 1
+HEADER = struct.Struct("<4sBQHHHHHIIB")
+FLAG_ALIVE = 1
+FLAG_VICTORY = 2
+EXTENSION = ".snkr"
+
+
+class ReplayError(ValueError):
+    pass
+
+
+# -----------------------------
+# Varints
+# -----------------------------
+def _write_varint(out, n):
+    while n > 0x7F:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _read_varints(data, pos):
+    n = shift = 0
+    for pos in range(pos, len(data)):
+        b = data[pos]
+        n |= (b & 0x7F) << shift
+        if b & 0x80:
+            shift += 7
+        else:
+            yield n
+            n = shift = 0
+    if shift:
+        raise ReplayError("truncated run data")
+
+
+# -----------------------------
+# Replay
+# -----------------------------
+class Replay:
+    """One recorded game: seed, configuration, direction runs and final state.
+
+    runs is a list of [direction_code, tick_count].
+    """
+
+    def __init__(self, seed, grid_w, grid_h, fps_base, fps_step, fps_max,
+                 runs=None, ticks=0, score=0, alive=True, victory=False):
+        self.seed = seed
+        self.grid_w = grid_w
+        self.grid_h = grid_h
+        self.fps_base = fps_base
+        self.fps_step = fps_step
+        self.fps_max = fps_max
+        self.runs = runs if runs is not None else []
+        self.ticks = ticks
+        self.score = score
+        self.alive = alive
+        self.victory = victory
+
+    def new_game(self):
+        """A SnakeEngine with this replay's configuration, not yet reset."""
+        return SnakeEngine(self.grid_w, self.grid_h, seed=self.seed,
+                           fps_base=self.fps_base, fps_step=self.fps_step, fps_max=self.fps_max)
+
+    def directions(self):
+        """The direction of every tick, in order."""
+        for code, n in self.runs:
+            d = DIRECTIONS[code]
+            for _ in range(n):
+                yield d
+
+    # -------------------------
+    # Serialization
+    # -------------------------
+    def to_bytes(self):
+        flags = (FLAG_ALIVE if self.alive else 0) | (FLAG_VICTORY if self.victory else 0)
+        out = bytearray(HEADER.pack(
+            MAGIC, VERSION, self.seed, self.grid_w, self.grid_h,
+            self.fps_base, self.fps_step, self.fps_max, self.ticks, self.score, flags,
+        ))
+        for code, n in self.runs:
+            _write_varint(out, (n << 2) | code)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < HEADER.size:
+            raise ReplayError("file too short for a replay header")
+        (magic, version, seed, grid_w, grid_h, fps_base, fps_step, fps_max,
+         ticks, score, flags) = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ReplayError("not a snake replay (bad magic)")
+        if version != VERSION:
+            raise ReplayError(f"unsupported replay version {version}")
+        runs = [[v & 3, v >> 2] for v in _read_varints(data, HEADER.size)]
+        return cls(seed, grid_w, grid_h, fps_base, fps_step, fps_max, runs,
+                   ticks, score, bool(flags & FLAG_ALIVE), bool(flags & FLAG_VICTORY))
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+# -----------------------------
+# Recording
+# -----------------------------
+class ReplayRecorder:
+    """Records the game played on a SnakeEngine (or SnakeGame).
+
+    start() resets the game with a known seed; call capture() after every
+    game.step()/tick() batch. That is exact as long as the direction only
+    changes between batches; anything that steers between the moves of one
+    step() (an autopilot, or several turns queued with set_direction) needs
+    capture() after every tick, which SnakeGame.recorder does.
+    """
+
+    def __init__(self, game):
+        self.game = game
+        self.replay = None
+        self.saved = False
+        self._ticks = 0
+
+    def start(self, seed=None):
+        game = self.game
+        if seed is None:
+            seed = random.getrandbits(63)
+        game.reset(seed)
+        self.replay = Replay(seed, game.grid_w, game.grid_h,
+                             int(game.fps_base), int(game.fps_step), int(game.fps_max))
+        self.saved = False
+        self._ticks = game.ticks
+        return self.replay
+
+    def capture(self):
+        game = self.game
+        n = game.ticks - self._ticks
+        if n <= 0:
+            return
+        self._ticks = game.ticks
+        code = DIRECTIONS.index(game.direction)
+        runs = self.replay.runs
+        if runs and runs[-1][0] == code:
+            runs[-1][1] += n
+        else:
+            runs.append([code, n])
+
+    def finish(self):
+        """The replay so far, stamped with the game's current outcome."""
+        self.capture()
+        replay, game = self.replay, self.game
+        replay.ticks, replay.score = game.ticks, game.score
+        replay.alive, replay.victory = game.alive, game.victory
+        return replay
+
+    def save_in(self, directory):
+        """Write the replay to directory/snake-<time>-<seed>.snkr and return the path."""
+        os.makedirs(directory, exist_ok=True)
+        replay = self.finish()
+        name = f"snake-{time.strftime('%Y%m%d-%H%M%S')}-{replay.seed:x}{EXTENSION}"
+        self.saved = True
+        return replay.save(os.path.join(directory, name))
+
+
+# -----------------------------
+# Playback
+# -----------------------------
+class ReplayPlayer:
+    """Feeds a replay's directions into a game, one recorded tick at a time.
+
+    advance(n) makes up to n recorded moves; step(dt_ms) paces them by game
+    time like SnakeEngine.step (pass dt_ms * speed to watch at any speed).
+    """
+
+    def __init__(self, replay, game=None):
+        self.replay = replay
+        self.game = game if game is not None else replay.new_game()
+        self.rewind()
+
+    def rewind(self):
+        self.game.reset(self.replay.seed)
+        self._run = 0
+        self._left = self.replay.runs[0][1] if self.replay.runs else 0
+        self._accum_ms = 0
+
+    @property
+    def done(self):
+        return self._run >= len(self.replay.runs) or not self.game.alive
+
+    def advance(self, n):
+        """Make up to n recorded moves. Returns moves made."""
+        game, runs = self.game, self.replay.runs
+        made = 0
+        while made < n and not self.done:
+            game.next_direction = DIRECTIONS[runs[self._run][0]]
+            k = game.run(min(n - made, self._left))
+            made += k
+            self._left -= k
+            if not self._left:
+                self._run += 1
+                self._left = runs[self._run][1] if self._run < len(runs) else 0
+            if not k:
+                break
+        return made
+
+    def step(self, dt_ms):
+        """Advance by dt_ms of game time at the game's own speed schedule."""
+        game = self.game
+        self._accum_ms += dt_ms
+        while self._accum_ms >= game.move_interval_ms and not self.done:
+            self._accum_ms -= game.move_interval_ms
+            self.advance(1)
+
+    def finish(self):
+        """Play the rest of the replay; raises ReplayError if the game ends early."""
+        self.advance(sum(n for _, n in self.replay.runs))
+        if self._run < len(self.replay.runs):
+            raise ReplayError(f"game ended early at tick {self.game.ticks}")
+        return self.game
+
+
+def play(replay, game=None):
+    """Re-run a replay to its end, as fast as the engine goes, and return the game.
+
+    game defaults to a fresh SnakeEngine with the replay's configuration; a
+    SnakeGame (or any SnakeEngine with the same board) works too.
+    """
+    return ReplayPlayer(replay, game).finish()
+
+
+def verify(replay):
+    """Replay headless; returns (ok, game) where ok means the outcome matched."""
+    game = play(replay)
+    ok = (game.ticks, game.score, game.alive, game.victory) == \
+         (replay.ticks, replay.score, replay.alive, replay.victory)
+    return ok, game
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) < 2 or argv[0] not in ("info", "verify"):
+        print(__doc__.split("Usage:")[1].rstrip())
+        return 2
+
+    status = 0
+    for path in argv[1:]:
+        replay = Replay.load(path)
+        if argv[0] == "info":
+            print(f"{path}: seed={replay.seed} board={replay.grid_w}x{replay.grid_h} "
+                  f"speed={replay.fps_base}..{replay.fps_max} (+{replay.fps_step}/food) "
+                  f"ticks={replay.ticks} score={replay.score} runs={len(replay.runs)} "
+                  f"size={os.path.getsize(path)}B "
+                  f"{'victory' if replay.victory else 'alive' if replay.alive else 'dead'}")
+            continue
+
+        t0 = time.perf_counter()
+        try:
+            ok, game = verify(replay)
+        except ReplayError as e:
+            ok, game = False, None
+            print(f"{path}: FAIL ({e})")
+        elapsed = time.perf_counter() - t0
+        if game is not None:
+            print(f"{path}: {'OK' if ok else 'MISMATCH'} ticks={game.ticks} score={game.score} "
+                  f"({game.ticks / elapsed if elapsed else 0:.0f} ticks/s)")
+        status |= 0 if ok else 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Snake spectate - asyncio server streaming live games to viewers (no pygame)
+
+The server runs SnakeEngine games (the core of SnakeGame), each steered by an
+autopilot and restarted after every game over, and streams them to any
+number of viewers over TCP or a Unix socket on localhost.
+
+Protocol: one JSON object per line.
+    server -> viewer
+        {"type": "hello", "protocol": 1, "games": 4}
+        {"type": "key", "g": 0, "t": 812, "grid": [30, 20], "body": [..tail to head..],
+         "food": 311, "score": 12, "alive": true}
+        {"type": "d", "g": 0, "t": 813, "head": 342, "pop": 1, "food": 97, "score": 13}
+    viewer -> server
+        watch <game>\\n     switch to another game (game 0 is watched on connect)
+
+A keyframe is sent when a viewer starts watching and whenever a game restarts.
+After that each tick is one delta: the new head cell, whether the tail cell
+was popped, and food / score only when they change ("dead": 1 and
+"victory": 1 end a game). So a frame has a fixed size whatever the snake
+length, and it is encoded once per tick and shared by every viewer of the
+game.
+
+Backpressure: each viewer has a bounded queue of frames (QUEUE_FRAMES)
+drained by its own writer task, which waits on the socket. The simulation
+only ever puts to the queue without waiting. When a viewer falls so far
+behind that its queue is full, its backlog is dropped and it gets a fresh
+keyframe on the next tick instead, so a slow viewer skips ahead rather than
+stalling the games or the other viewers.
+
+Usage:
+    python snake_spectate.py serve [--games 4] [--port 8765 | --unix PATH]
+    python snake_spectate.py watch [--game 0] [--port 8765 | --unix PATH]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import deque
+
+from snake_autopilot import AUTOPILOTS, has_hamiltonian_cycle
+from snake_engine import SnakeEngine, GRID_W, GRID_H
+
+PROTOCOL = 1
+HOST = "127.0.0.1"
+PORT = 8765
+SIM_HZ = 120        # simulation wake-ups per second; games move at their own speed
+QUEUE_FRAMES = 256  # frames buffered per viewer before it is resynced with a keyframe
+RESTART_MS = 1500   # pause on the game over state before a new game
+
+
+def encode(msg):
+    return (json.dumps(msg, separators=(",", ":")) + "\n").encode()
+
+
+# -----------------------------
+# Games
+# -----------------------------
+class LiveGame:
+    """One served game: a SnakeEngine, its autopilot and its viewers."""
+
+    def __init__(self, game_id, game, pilot):
+        self.id = game_id
+        self.game = game
+        self.pilot = pilot
+        self.viewers = set()
+        self.restart_ms = None  # counts down after a game over
+        self._accum_ms = 0
+        self._keyframe = None
+
+    def keyframe(self):
+        """The full state as a keyframe (built at most once per tick)."""
+        if self._keyframe is None:
+            game = self.game
+            self._keyframe = encode({
+                "type": "key", "g": self.id, "t": game.ticks, "grid": [game.grid_w, game.grid_h],
+                "body": list(game.body)[::-1], "food": game.food_cell, "score": game.score,
+                "alive": game.alive,
+            })
+        return self._keyframe
+
+    def advance(self, dt_ms):
+        """Run dt_ms of game time; yields one frame per tick (plus restarts)."""
+        game = self.game
+        if not game.alive:
+            self.restart_ms -= dt_ms
+            if self.restart_ms > 0:
+                return
+            game.reset()
+            self.pilot.reset()
+            self._accum_ms = 0
+            self._keyframe = None
+            yield self.keyframe()
+            return
+
+        self._accum_ms += dt_ms
+        while self._accum_ms >= game.move_interval_ms and game.alive:
+            self._accum_ms -= game.move_interval_ms
+            yield self.tick()
+
+    def tick(self):
+        """One move; returns its delta frame."""
+        game = self.game
+        head, length, food, score = game.body.head, game.body.length, game.food_cell, game.score
+        self.pilot.drive(game)
+        game.tick()
+        body = game.body  # after the tick: a forked game copies its body on its next move
+        self._keyframe = None
+
+        delta = {"type": "d", "g": self.id, "t": game.ticks}
+        if body.head != head:
+            delta["head"] = body.head
+            if body.length == length:
+                delta["pop"] = 1
+        if game.food_cell != food:
+            delta["food"] = game.food_cell
+        if game.score != score:
+            delta["score"] = game.score
+        if not game.alive:
+            delta["dead"] = 1
+            if game.victory:
+                delta["victory"] = 1
+            self.restart_ms = RESTART_MS
+        return encode(delta)
+
+
+# -----------------------------
+# Viewers
+# -----------------------------
+class Viewer:
+    """One connection: a bounded frame queue and the task writing it out."""
+
+    def __init__(self, writer, max_frames=QUEUE_FRAMES):
+        self.writer = writer
+        self.queue = asyncio.Queue(max_frames)
+        self.live = None
+        self.resync = False
+        self.resyncs = 0
+
+    def watch(self, live):
+        if self.live is not None:
+            self.live.viewers.discard(self)
+        self.live = live
+        live.viewers.add(self)
+        self._clear()
+        self.queue.put_nowait(live.keyframe())
+        self.resync = False
+
+    def offer(self, frame):
+        """Queue a frame without waiting; a full queue means resync next tick."""
+        if self.resync:
+            frame = self.live.keyframe()
+        try:
+            self.queue.put_nowait(frame)
+            self.resync = False
+        except asyncio.QueueFull:
+            self._clear()
+            self.resync = True
+            self.resyncs += 1
+
+    def _clear(self):
+        while not self.queue.empty():
+            self.queue.get_nowait()
+
+    async def pump(self):
+        writer, queue = self.writer, self.queue
+        while True:
+            writer.write(await queue.get())
+            await writer.drain()
+
+
+# -----------------------------
+# Server
+# -----------------------------
+class SpectatorServer:
+    """n_games autopilot games served to every viewer that connects."""
+
+    def __init__(self, n_games=4, grid_w=GRID_W, grid_h=GRID_H, seed=None, autopilot="bfs",
+                 speed=1.0, max_frames=QUEUE_FRAMES):
+        self.games = [
+            LiveGame(i, SnakeEngine(grid_w, grid_h, seed=None if seed is None else seed + i),
+                     AUTOPILOTS[autopilot]())
+            for i in range(n_games)
+        ]
+        self.speed = speed
+        self.max_frames = max_frames
+        self.viewers = set()
+
+    async def simulate(self):
+        loop = asyncio.get_running_loop()
+        last = loop.time()
+        while True:
+            await asyncio.sleep(1 / SIM_HZ)
+            now = loop.time()
+            dt_ms = (now - last) * 1000 * self.speed
+            last = now
+            for live in self.games:
+                for frame in live.advance(dt_ms):
+                    for viewer in live.viewers:
+                        viewer.offer(frame)
+
+    async def handle(self, reader, writer):
+        viewer = Viewer(writer, self.max_frames)
+        self.viewers.add(viewer)
+        writer.write(encode({"type": "hello", "protocol": PROTOCOL, "games": len(self.games)}))
+        viewer.watch(self.games[0])
+        pump = asyncio.ensure_future(viewer.pump())
+        try:
+            while not pump.done():
+                line = await reader.readline()
+                if not line:
+                    break
+                cmd = line.decode(errors="replace").split()
+                if len(cmd) == 2 and cmd[0] == "watch" and cmd[1].isdigit() and int(cmd[1]) < len(self.games):
+                    viewer.watch(self.games[int(cmd[1])])
+        except ConnectionError:
+            pass
+        finally:
+            pump.cancel()
+            if viewer.live is not None:
+                viewer.live.viewers.discard(viewer)
+            self.viewers.discard(viewer)
+            writer.close()
+
+    async def serve(self, host=HOST, port=PORT, unix=None, ready=None):
+        if unix:
+            server = await asyncio.start_unix_server(self.handle, unix)
+        else:
+            server = await asyncio.start_server(self.handle, host, port)
+        if ready is not None:
+            ready(server)
+        async with server:
+            await asyncio.gather(server.serve_forever(), self.simulate())
+
+
+# -----------------------------
+# Viewer side
+# -----------------------------
+class GameView:
+    """A viewer's copy of one game, rebuilt from keyframes and deltas."""
+
+    def __init__(self):
+        self.game_id = None
+        self.grid = None
+        self.body = deque()  # tail -> head
+        self.food = -1
+        self.score = 0
+        self.ticks = 0
+        self.alive = False
+
+    def apply(self, msg):
+        kind = msg.get("type")
+        if kind == "key":
+            self.game_id = msg["g"]
+            self.grid = tuple(msg["grid"])
+            self.body = deque(msg["body"])
+            self.food, self.score, self.ticks, self.alive = msg["food"], msg["score"], msg["t"], msg["alive"]
+        elif kind == "d" and msg["g"] == self.game_id:
+            if msg.get("pop"):
+                self.body.popleft()
+            if "head" in msg:
+                self.body.append(msg["head"])
+            self.food = msg.get("food", self.food)
+            self.score = msg.get("score", self.score)
+            self.ticks = msg["t"]
+            self.alive = not msg.get("dead")
+
+
+async def watch(game_id=0, host=HOST, port=PORT, unix=None, seconds=None):
+    if unix:
+        reader, writer = await asyncio.open_unix_connection(unix)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"watch {game_id}\n".encode())
+    view = GameView()
+    received = 0
+    start = report = time.monotonic()
+    while seconds is None or time.monotonic() - start < seconds:
+        line = await reader.readline()
+        if not line:
+            break
+        received += len(line)
+        view.apply(json.loads(line))
+        now = time.monotonic()
+        if now - report >= 1:
+            print(f"game {view.game_id}: tick {view.ticks} length {len(view.body)} score {view.score} "
+                  f"{'alive' if view.alive else 'over'}  {received / (now - report):.0f} B/s")
+            received, report = 0, now
+    writer.close()
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve live snake games to viewers, or watch one.")
+    parser.add_argument("command", choices=("serve", "watch"))
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--unix", metavar="PATH", help="use a Unix socket instead of TCP")
+    parser.add_argument("--games", type=int, default=4, help="games to run (serve)")
+    parser.add_argument("--board", default=f"{GRID_W}x{GRID_H}", metavar="WxH", help="board size (serve)")
+    parser.add_argument("--autopilot", default="bfs", choices=sorted(AUTOPILOTS), help="who plays (serve)")
+    parser.add_argument("--speed", type=float, default=1.0, help="game speed multiplier (serve)")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--game", type=int, default=0, help="game to watch (watch)")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "watch":
+            asyncio.run(watch(args.game, args.host, args.port, args.unix))
+            return 0
+        try:
+            w, h = (int(n) for n in args.board.lower().split("x"))
+        except ValueError:
+            parser.error(f"--board: expected WxH, got {args.board!r}")
+        if args.autopilot == "hamiltonian" and not has_hamiltonian_cycle(w, h):
+            parser.error("--autopilot hamiltonian: the board has no Hamiltonian cycle (both sides must be 2+, one of them even)")
+        server = SpectatorServer(args.games, w, h, args.seed, args.autopilot, args.speed)
+        where = args.unix or f"{args.host}:{args.port}"
+        asyncio.run(server.serve(args.host, args.port, args.unix,
+                                 ready=lambda _: print(f"serving {args.games} games on {where}")))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+"""
+Snake tournament - headless (agent, variant, seed) evaluation on a process pool
+
+Every job plays one game to the end without a window, through the
+simulation code of the variant itself:
+- engine: snake_engine.SnakeEngine on its default 30x20 board
+- snake_gpt5.2_thinking.py: its SnakeGame (a SnakeEngine sized by the window)
+- snake_gpt5.2_auto.py: its new_game_state() / tick(state) dict game
+
+The other variants keep their game state in locals of their game loop, so
+there is nothing for an agent to read or steer without a display.
+
+Jobs are spread over a concurrent.futures.ProcessPoolExecutor (one worker
+per core by default). Each result is appended to the output JSONL file as
+soon as its game finishes, so the file doubles as a checkpoint: running the
+same command again skips the jobs already in it, except those that crashed
+or timed out (RETRY_STATUSES): they are played again, and the newest result
+of a job is the one reported.
+
+Limits are enforced inside the worker's game loop (a pool cannot kill a
+running task): --timeout seconds of wall time, --max-ticks moves, and a stall
+limit of moves without eating (default 4 x board cells) for agents that
+circle forever.
+
+Agents are the names in AGENTS or "module:factory". A factory takes the job
+seed and returns a callable agent(game) -> direction or None; game has the
+SnakeEngine interface (grid_w, grid_h, body, head, direction, food, score,
+ticks, alive, victory, set_direction).
+
+Usage:
+    python snake_tournament.py --agents greedy random --seeds 1000
+    python snake_tournament.py --variants engine snake_gpt5.2_auto.py --out auto.jsonl
+    python snake_tournament.py --agents mybot:Bot --seeds 100000 --workers 16
+"""
+
+import argparse
+import concurrent.futures as cf
+import importlib
+import importlib.util
+import json
+import os
+import random
+import sys
+import time
+
+from snake_autopilot import Autopilot, HamiltonianAutopilot
+from snake_engine import SnakeEngine, DIRECTIONS
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_VARIANTS = ("engine", "snake_gpt5.2_thinking.py", "snake_gpt5.2_auto.py")
+DEFAULT_OUT = "tournament.jsonl"
+DEFAULT_TIMEOUT_S = 60
+IN_FLIGHT_PER_WORKER = 4  # queued jobs per worker, so 100k-job sweeps don't pre-submit everything
+PROGRESS_EVERY_S = 2.0
+RETRY_STATUSES = ("error", "timeout")  # results that do not count as done on resume
+
+
+# -----------------------------
+# Games
+# -----------------------------
+class AutoGame:
+    """snake_gpt5.2_auto.py's dict state behind the SnakeEngine interface."""
+
+    def __init__(self, module, seed):
+        self.module = module
+        self.grid_w, self.grid_h = module.GRID_W, module.GRID_H
+        # spawn_food() samples with the module-level random
+        random.seed(seed)
+        self.state = module.new_game_state()
+        self.ticks = 0
+
+    @property
+    def body(self):
+        return self.state["body"]
+
+    @property
+    def head(self):
+        cell = self.state["body"].head
+        return (cell % self.grid_w, cell // self.grid_w)
+
+    @property
+    def direction(self):
+        return self.state["direction"]
+
+    @property
+    def food(self):
+        food = self.state["food"]
+        return None if food == (-1, -1) else food
+
+    @property
+    def score(self):
+        return self.state["score"]
+
+    @property
+    def alive(self):
+        return self.state["alive"]
+
+    @property
+    def victory(self):
+        return self.state["won"]
+
+    def set_direction(self, d):
+        dx, dy = self.state["direction"]
+        if d != (-dx, -dy):
+            self.state["pending_dir"] = d
+
+    def tick(self):
+        if not self.state["alive"]:
+            return False
+        self.module.tick(self.state)
+        self.ticks += 1
+        return self.state["alive"]
+
+
+_modules = {}  # per-process cache of imported variant files
+
+
+def load_variant(name):
+    module = _modules.get(name)
+    if module is None:
+        path = os.path.join(HERE, name)
+        spec = importlib.util.spec_from_file_location("tournament_" + name[:-3].replace(".", "_"), path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _modules[name] = module
+    return module
+
+
+def new_game(variant, seed):
+    if variant == "engine":
+        return SnakeEngine(seed=seed)
+    if variant == "snake_gpt5.2_thinking.py":
+        return load_variant(variant).SnakeGame(seed=seed)
+    if variant == "snake_gpt5.2_auto.py":
+        return AutoGame(load_variant(variant), seed)
+    raise ValueError(f"unsupported variant {variant!r} (choose from {', '.join(DEFAULT_VARIANTS)})")
+
+
+# -----------------------------
+# Agents
+# -----------------------------
+def open_moves(game):
+    """Directions that do not hit a wall, the body or reverse the snake.
+
+    The tail cell counts as open since it moves away (unless the snake eats).
+    """
+    hx, hy = game.head
+    cx, cy = game.direction
+    body = game.body
+    occupancy, tail = body.occupancy, body.tail
+    moves = []
+    for d in DIRECTIONS:
+        dx, dy = d
+        if (dx, dy) == (-cx, -cy):
+            continue
+        x, y = hx + dx, hy + dy
+        if 0 <= x < game.grid_w and 0 <= y < game.grid_h:
+            cell = y * game.grid_w + x
+            if not occupancy[cell] or cell == tail:
+                moves.append(d)
+    return moves
+
+
+class RandomAgent:
+    """Picks a random open move, turning now and then."""
+
+    def __init__(self, seed, turn_chance=0.2):
+        self.rng = random.Random(seed)
+        self.turn_chance = turn_chance
+
+    def __call__(self, game):
+        moves = open_moves(game)
+        if not moves:
+            return None
+        if game.direction in moves and self.rng.random() >= self.turn_chance:
+            return game.direction
+        return self.rng.choice(moves)
+
+
+class GreedyAgent:
+    """Takes the open move closest (Manhattan) to the food; ties broken at random."""
+
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+
+    def __call__(self, game):
+        moves = open_moves(game)
+        if not moves or game.food is None:
+            return moves[0] if moves else None
+        hx, hy = game.head
+        fx, fy = game.food
+        self.rng.shuffle(moves)
+        return min(moves, key=lambda d: abs(hx + d[0] - fx) + abs(hy + d[1] - fy))
+
+
+AGENTS = {
+    "random": RandomAgent,
+    "greedy": GreedyAgent,
+    "autopilot": Autopilot,
+    "hamiltonian": HamiltonianAutopilot,
+}
+
+
+def load_agent(spec):
+    """An agent factory from a name in AGENTS or a "module:attribute" path."""
+    if spec in AGENTS:
+        return AGENTS[spec]
+    if ":" not in spec:
+        raise ValueError(f"unknown agent {spec!r} (choose from {', '.join(AGENTS)} or use module:factory)")
+    module_name, attr = spec.split(":", 1)
+    return getattr(importlib.import_module(module_name), attr)
+
+
+# -----------------------------
+# Worker
+# -----------------------------
+def init_worker():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    if HERE not in sys.path:
+        sys.path.insert(0, HERE)
+
+
+def play(game, agent, deadline, max_ticks=0, stall_ticks=0):
+    """Run one game to the end; returns its status string."""
+    set_direction, tick, clock = game.set_direction, game.tick, time.perf_counter
+    last_score, last_eat = game.score, 0
+    while game.alive:
+        d = agent(game)
+        if d is not None:
+            set_direction(d)
+        tick()
+        ticks = game.ticks
+        if game.score != last_score:
+            last_score, last_eat = game.score, ticks
+        elif stall_ticks and ticks - last_eat >= stall_ticks and game.alive:
+            return "stalled"
+        if max_ticks and ticks >= max_ticks and game.alive:
+            return "max_ticks"
+        if not ticks & 255 and clock() > deadline:
+            return "timeout"
+    return "victory" if game.victory else "dead"
+
+
+def run_job(job, timeout_s=DEFAULT_TIMEOUT_S, max_ticks=0, stall_ticks=None):
+    """Play one (agent, variant, seed) game and return its result dict."""
+    agent_spec, variant, seed = job
+    started = time.perf_counter()
+    result = {"agent": agent_spec, "variant": variant, "seed": seed}
+    try:
+        game = new_game(variant, seed)
+        agent = load_agent(agent_spec)(seed)
+        stall = 4 * game.grid_w * game.grid_h if stall_ticks is None else stall_ticks
+        status = play(game, agent, started + timeout_s, max_ticks, stall)
+        result.update(status=status, score=game.score, ticks=game.ticks, length=len(game.body))
+    except Exception as e:  # report, don't crash the whole sweep
+        result.update(status="error", error=f"{type(e).__name__}: {e}")
+    result["seconds"] = round(time.perf_counter() - started, 4)
+    return result
+
+
+# -----------------------------
+# Parent: schedule, checkpoint, report
+# -----------------------------
+def default_workers():
+    """Cores this process may run on (respects affinity masks / container cpusets)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def job_key(r):
+    return (r["agent"], r["variant"], r["seed"])
+
+
+def latest_results(results):
+    """One result per job: the last one written (a retry replaces a failure)."""
+    return list({job_key(r): r for r in results}.values())
+
+
+def read_results(path):
+    """Results already in a JSONL file (a torn last line is ignored)."""
+    results = []
+    if os.path.exists(path):
+        with open(path) as f:
+            for line in f:
+                try:
+                    results.append(json.loads(line))
+                except ValueError:
+                    pass
+    return results
+
+
+def ends_cleanly(path):
+    """False if path ends in a torn line (a run killed mid-write)."""
+    if not os.path.exists(path) or not os.path.getsize(path):
+        return True
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+def run_tournament(jobs, out_path, workers=0, timeout_s=DEFAULT_TIMEOUT_S, max_ticks=0, stall_ticks=None,
+                   progress=None):
+    """Run jobs on a process pool, appending each result to out_path as it finishes.
+
+    Jobs whose key is already in out_path are skipped, unless that result
+    is an error or a timeout. Returns the number of games played by this call.
+    """
+    done = {job_key(r) for r in latest_results(read_results(out_path)) if r.get("status") not in RETRY_STATUSES}
+    pending = iter([j for j in jobs if tuple(j) not in done])
+    workers = workers or default_workers()
+    played = 0
+    torn = not ends_cleanly(out_path)
+
+    init_worker()
+    with open(out_path, "a") as out, cf.ProcessPoolExecutor(workers, initializer=init_worker) as pool:
+        if torn:
+            out.write("\n")  # so the first new result does not land on the torn line
+        running = set()
+
+        def submit_more():
+            while len(running) < workers * IN_FLIGHT_PER_WORKER:
+                job = next(pending, None)
+                if job is None:
+                    return
+                running.add(pool.submit(run_job, job, timeout_s, max_ticks, stall_ticks))
+
+        try:
+            submit_more()
+            while running:
+                finished, _ = cf.wait(running, return_when=cf.FIRST_COMPLETED)
+                for future in finished:
+                    running.discard(future)
+                    result = future.result()
+                    out.write(json.dumps(result) + "\n")
+                    played += 1
+                    if progress:
+                        progress(result, played)
+                out.flush()
+                submit_more()
+        except KeyboardInterrupt:
+            for future in running:
+                future.cancel()
+            raise
+    return played
+
+
+def summarize(results):
+    """Per (agent, variant) totals: games, mean/max score, wins, mean ticks, failures."""
+    groups = {}
+    for r in results:
+        g = groups.setdefault((r["agent"], r["variant"]), {"games": 0, "score": 0, "max": 0, "wins": 0,
+                                                           "ticks": 0, "other": {}})
+        g["games"] += 1
+        g["score"] += r.get("score", 0)
+        g["max"] = max(g["max"], r.get("score", 0))
+        g["ticks"] += r.get("ticks", 0)
+        status = r.get("status")
+        if status == "victory":
+            g["wins"] += 1
+        elif status != "dead":
+            g["other"][status] = g["other"].get(status, 0) + 1
+    return groups
+
+
+def format_table(groups):
+    headers = ("agent", "variant", "games", "mean score", "max", "wins", "mean ticks", "other")
+    rows = []
+    for (agent, variant), g in sorted(groups.items()):
+        n = g["games"]
+        rows.append((agent, variant, str(n), f"{g['score'] / n:.2f}", str(g["max"]), str(g["wins"]),
+                     f"{g['ticks'] / n:.0f}", " ".join(f"{k}={v}" for k, v in sorted(g["other"].items()))))
+    widths = [max(len(h), *(len(row[i]) for row in rows)) if rows else len(h) for i, h in enumerate(headers)]
+    lines = ["  ".join(h.ljust(w) for h, w in zip(headers, widths)),
+             "  ".join("-" * w for w in widths)]
+    lines += ["  ".join(c.ljust(w) for c, w in zip(row, widths)) for row in rows]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play (agent, variant, seed) games headless on a process pool.")
+    parser.add_argument("--agents", nargs="+", default=["greedy"], help="agent names or module:factory")
+    parser.add_argument("--variants", nargs="+", default=list(DEFAULT_VARIANTS))
+    parser.add_argument("--seeds", type=int, default=100, help="games per (agent, variant) pair")
+    parser.add_argument("--seed-start", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=0, help="worker processes (default: one per core)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT_S, help="seconds per game")
+    parser.add_argument("--max-ticks", type=int, default=0, help="moves per game (0: no limit)")
+    parser.add_argument("--stall", type=int, default=None,
+                        help="moves without eating before a game counts as stalled (default: 4 x board cells)")
+    parser.add_argument("--out", default=DEFAULT_OUT, help="results JSONL, also the resume checkpoint")
+    parser.add_argument("--restart", action="store_true", help="discard earlier results in --out")
+    args = parser.parse_args(argv)
+
+    # Fail fast on bad names instead of once per job
+    for agent in args.agents:
+        try:
+            load_agent(agent)
+        except (ValueError, ImportError, AttributeError) as e:
+            parser.error(str(e))
+    for variant in args.variants:
+        if variant not in DEFAULT_VARIANTS:
+            parser.error(f"unsupported variant {variant!r} (choose from {', '.join(DEFAULT_VARIANTS)})")
+
+    if args.restart and os.path.exists(args.out):
+        os.remove(args.out)
+    seeds = range(args.seed_start, args.seed_start + args.seeds)
+    jobs = [(a, v, s) for a in args.agents for v in args.variants for s in seeds]
+
+    total = len(jobs)
+    started = time.perf_counter()
+    last_report = [started]
+
+    def progress(result, played):
+        now = time.perf_counter()
+        if result.get("status") == "error":
+            print(f"error {job_key(result)}: {result.get('error')}", file=sys.stderr)
+        if now - last_report[0] >= PROGRESS_EVERY_S:
+            last_report[0] = now
+            print(f"{played} games this run ({played / (now - started):.0f}/s), {total} jobs in sweep",
+                  file=sys.stderr)
+
+    try:
+        played = run_tournament(jobs, args.out, args.workers, args.timeout, args.max_ticks, args.stall, progress)
+    except KeyboardInterrupt:
+        print(f"\ninterrupted; rerun the same command to resume from {args.out}", file=sys.stderr)
+        return 130
+
+    elapsed = time.perf_counter() - started
+    print(f"played {played} games in {elapsed:.1f}s", file=sys.stderr)
+    wanted = {tuple(j) for j in jobs}
+    print(format_table(summarize(r for r in latest_results(read_results(args.out)) if job_key(r) in wanted)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
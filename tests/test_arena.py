@@ -0,0 +1,148 @@
+"""Many snakes on one board (snake_arena.Arena)."""
+
+import random
+
+import pytest
+
+from snake_arena import Arena, ArenaSnake, random_open_move
+from snake_engine import UP, DOWN, LEFT, RIGHT
+
+
+def check_board(arena):
+    """owner, food and the free-cell index agree with the live snakes."""
+    w = arena.grid_w
+    expected = [0] * arena.cells
+    for snake in arena.snakes:
+        if snake.alive:
+            for cell in snake.cells:
+                assert expected[cell] == 0
+                expected[cell] = snake.id + 1
+    assert list(arena.owner) == expected
+    assert {c for c in range(arena.cells) if arena.food[c]} == arena.food_cells
+    assert not any(arena.owner[c] for c in arena.food_cells)
+    taken = sum(1 for tag in expected if tag) + len(arena.food_cells)
+    assert len(arena.free) == arena.cells - taken
+    for cell in range(arena.cells):
+        assert (cell in arena.free) == (not expected[cell] and cell not in arena.food_cells)
+    assert arena.alive_count == sum(s.alive for s in arena.snakes)
+    for snake in arena.snakes:
+        if snake.alive:
+            for a, b in zip(snake.cells, list(snake.cells)[1:]):
+                assert abs(a % w - b % w) + abs(a // w - b // w) == 1
+
+
+def place(arena, *snakes):
+    """Replace the round with snakes given as ((x, y) tail -> head, direction)."""
+    w = arena.grid_w
+    for snake in arena.snakes:
+        if snake.alive:
+            for cell in snake.cells:
+                arena.owner[cell] = 0
+                arena.free.add(cell)
+    arena.snakes = []
+    for i, (cells, direction) in enumerate(snakes):
+        cells = [y * w + x for x, y in cells]
+        for cell in cells:
+            arena.owner[cell] = i + 1
+            arena.free.remove(cell)
+        arena.snakes.append(ArenaSnake(i, cells, direction))
+    arena.n_snakes = arena.alive_count = len(snakes)
+
+
+def empty_arena():
+    return Arena(2, 10, 10, seed=1, food_count=0)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_board_stays_consistent(seed):
+    arena = Arena(8, 20, 15, seed=seed, food_count=5)
+    rng = random.Random(seed)
+    check_board(arena)
+    for _ in range(3):
+        while not arena.done:
+            for snake in arena.snakes:
+                if snake.alive:
+                    d = random_open_move(arena, snake, rng)
+                    if d:
+                        snake.set_direction(d)
+            dead = arena.tick()
+            assert all(not s.alive for s in dead)
+            check_board(arena)
+            assert len(arena.food_cells) == min(arena.food_count, len(arena.free) + len(arena.food_cells))
+        arena.reset()
+        check_board(arena)
+
+
+def test_same_seed_same_round():
+    a, b = Arena(4, 20, 15, seed=3), Arena(4, 20, 15, seed=3)
+    for _ in range(20):
+        assert [list(s.cells) for s in a.snakes] == [list(s.cells) for s in b.snakes]
+        assert a.food_cells == b.food_cells
+        assert [s.id for s in a.tick()] == [s.id for s in b.tick()]
+
+
+def test_longer_snake_wins_head_on():
+    arena = empty_arena()
+    place(arena, ([(0, 5), (1, 5), (2, 5), (3, 5)], RIGHT), ([(7, 5), (6, 5), (5, 5)], LEFT))
+    dead = arena.tick()
+    assert dead == [arena.snakes[1]]
+    assert arena.snakes[0].head == 5 * 10 + 4
+    assert arena.done
+    check_board(arena)
+
+
+def test_equal_lengths_both_die_head_on():
+    arena = empty_arena()
+    place(arena, ([(1, 5), (2, 5), (3, 5)], RIGHT), ([(7, 5), (6, 5), (5, 5)], LEFT))
+    dead = arena.tick()
+    assert set(s.id for s in dead) == {0, 1}
+    assert arena.alive_count == 0
+    assert not any(arena.owner)
+    check_board(arena)
+
+
+def test_may_follow_a_departing_tail():
+    arena = empty_arena()
+    place(arena, ([(2, 5), (3, 5), (4, 5)], RIGHT), ([(0, 4), (0, 5), (1, 5)], RIGHT))
+    assert not arena.tick()  # the second head takes (2, 5) as the first tail leaves it
+    assert arena.snakes[1].head == 5 * 10 + 2
+    check_board(arena)
+
+
+def test_tail_stays_when_its_snake_eats():
+    arena = empty_arena()
+    place(arena, ([(2, 5), (3, 5), (4, 5)], RIGHT), ([(0, 4), (0, 5), (1, 5)], RIGHT))
+    arena.free.remove(5 * 10 + 5)
+    arena.food[5 * 10 + 5] = 1
+    arena.food_cells.add(5 * 10 + 5)
+    dead = arena.tick()
+    assert dead == [arena.snakes[1]]  # (2, 5) is still covered
+    assert arena.snakes[0].score == 1 and arena.snakes[0].length == 4
+    check_board(arena)
+
+
+def test_bodies_and_walls_kill():
+    arena = empty_arena()
+    place(arena, ([(3, 3), (3, 4), (3, 5)], DOWN), ([(1, 4), (2, 4)], RIGHT))
+    arena.snakes[0].set_direction(UP)  # a reversal, ignored
+    dead = arena.tick()
+    assert dead == [arena.snakes[1]]  # into the other body
+    assert arena.snake_at(4 * 10 + 2) is None
+    for _ in range(4):
+        arena.tick()
+    assert not arena.snakes[0].alive  # down into the wall
+    check_board(arena)
+
+
+def test_dead_snakes_leave_the_board():
+    arena = empty_arena()
+    place(arena, ([(0, 0), (1, 0), (2, 0)], UP), ([(5, 5), (6, 5), (7, 5)], RIGHT))
+    arena.tick()
+    assert arena.snake_at(0) is None
+    assert arena.snake_at(5 * 10 + 8) is arena.snakes[1]
+    check_board(arena)
+
+
+def test_rejects_no_room():
+    with pytest.raises(ValueError):
+        Arena(50, 4, 4)
@@ -0,0 +1,109 @@
+"""Autopilots (snake_autopilot)."""
+
+import random
+
+import pytest
+
+from snake_autopilot import Autopilot, HamiltonianAutopilot, has_hamiltonian_cycle, hamiltonian_cycle
+from snake_engine import SnakeEngine, DIRECTIONS
+
+
+def play(game, pilot):
+    while game.alive:
+        pilot.drive(game)
+        game.tick()
+    return game
+
+
+def survives(game, d):
+    """Does the game live through its next move after set_direction(d)?"""
+    fork = game.fork()
+    if d is not None:
+        fork.set_direction(d)
+    fork.tick()
+    return fork.alive or fork.victory
+
+
+def check_safe_choice(game, pilot):
+    """The pilot never picks a fatal move while a safe one exists."""
+    d = pilot(game)
+    if any(survives(game, option) for option in DIRECTIONS):
+        assert survives(game, d), (game.snake, game.food, d)
+    return d
+
+
+# -----------------------------
+# BFS autopilot
+# -----------------------------
+@pytest.mark.parametrize("seed", range(10))
+def test_bfs_autopilot_never_moves_into_death_needlessly(seed):
+    game = SnakeEngine(8, 6, seed=seed)
+    pilot = Autopilot()
+    for _ in range(3):
+        while game.alive and game.ticks < 1000:  # it may stall for good on a crowded board
+            d = check_safe_choice(game, pilot)
+            if d is not None:
+                game.set_direction(d)
+            game.tick()
+        assert game.score > 0
+        game.reset()
+        pilot.reset()
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_bfs_autopilot_takes_over_any_position(seed):
+    """Switched on mid-game (like P in game), from wherever random play left the snake."""
+    game = SnakeEngine(8, 6, seed=seed)
+    rng = random.Random(seed)
+    while game.alive and game.ticks < 1000:
+        check_safe_choice(game, Autopilot())
+        game.set_direction(rng.choice(DIRECTIONS))
+        game.tick()
+
+
+def test_bfs_autopilot_reuses_its_path():
+    game = SnakeEngine(30, 20, seed=1)
+    pilot = Autopilot()
+    score = game.score
+    while game.alive and game.score == score:
+        pilot.drive(game)
+        game.tick()
+    assert pilot.plans == 1
+
+
+# -----------------------------
+# Hamiltonian autopilot
+# -----------------------------
+
+@pytest.mark.parametrize("w, h", [(4, 2), (5, 2), (4, 3), (4, 5), (5, 4), (6, 7), (7, 6), (8, 8), (30, 20)])
+def test_hamiltonian_cycle_visits_every_cell_once(w, h):
+    cycle = hamiltonian_cycle(w, h)
+    assert sorted(cycle) == [(x, y) for x in range(w) for y in range(h)]
+    for (x1, y1), (x2, y2) in zip(cycle, cycle[1:] + cycle[:1]):
+        assert abs(x1 - x2) + abs(y1 - y2) == 1
+
+
+@pytest.mark.parametrize("w, h", [
+    (4, 2), (9, 2), (4, 9),          # two cells wide
+    (4, 3), (5, 4), (7, 6), (6, 7),  # one odd side
+    (4, 4), (8, 8), (10, 6),
+])
+@pytest.mark.parametrize("seed", range(3))
+def test_hamiltonian_autopilot_always_wins(w, h, seed):
+    game = play(SnakeEngine(w, h, seed=seed), HamiltonianAutopilot())
+    assert game.victory
+    assert len(game.body) == w * h
+
+
+@pytest.mark.parametrize("w, h", [(30, 20), (31, 20)])
+def test_hamiltonian_autopilot_wins_full_size_boards(w, h):
+    assert play(SnakeEngine(w, h, seed=1), HamiltonianAutopilot()).victory
+
+
+@pytest.mark.parametrize("w, h", [(5, 5), (7, 3), (4, 1), (6, 1), (9, 1)])
+def test_hamiltonian_autopilot_refuses_boards_without_a_cycle(w, h):
+    assert not has_hamiltonian_cycle(w, h)
+    with pytest.raises(ValueError):
+        HamiltonianAutopilot()(SnakeEngine(w, h, seed=1))
+    with pytest.raises(ValueError):
+        hamiltonian_cycle(w, h)
@@ -0,0 +1,106 @@
+"""Lockstep NumPy games (snake_batch.BatchSnakeEnv)."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from snake_batch import BatchSnakeEnv, NO_ACTION  # noqa: E402
+from snake_engine import SnakeEngine, DIRECTIONS  # noqa: E402
+
+
+def check_rows(env):
+    """Grid, ring and food agree for every game."""
+    assert np.array_equal(env.grid.sum(axis=1), env.length)
+    for i in range(env.n):
+        cells = [y * env.grid_w + x for x, y in env.snake(i)]
+        assert len(set(cells)) == len(cells) == env.length[i]
+        assert set(np.flatnonzero(env.grid[i])) == set(cells)
+        assert cells[0] == env.head_y[i] * env.grid_w + env.head_x[i]
+        if env.alive[i]:
+            assert env.food[i] >= 0 and env.grid[i, env.food[i]] == 0
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_rows_stay_consistent(seed):
+    env = BatchSnakeEnv(16, 8, 6, seed=seed)
+    rng = np.random.default_rng(seed)
+    meals = 0
+    for _ in range(300):
+        ate, _ = env.step(rng.integers(-1, 4, env.n))
+        meals += ate.sum()
+        check_rows(env)
+        env.reset(~env.alive)
+        check_rows(env)
+    assert meals > 0
+
+
+def test_new_games_match_the_engine():
+    env = BatchSnakeEnv(2, 30, 20, seed=1)
+    for i in range(2):
+        assert env.snake(i) == SnakeEngine(30, 20).snake
+        assert env.food_xy(i) not in env.snake(i)
+    assert env.boards().shape == (2, 20, 30)
+    assert np.shares_memory(env.boards(), env.grid)
+
+
+def test_reversal_is_ignored_and_walls_kill():
+    env = BatchSnakeEnv(2, 30, 20, seed=1)
+    env.food[:] = 0
+    ate, died = env.step([DIRECTIONS.index((-1, 0)), NO_ACTION])
+    assert env.snake(0)[0] == env.snake(1)[0] == (16, 10)
+    assert not ate.any() and not died.any()
+    up = DIRECTIONS.index((0, -1))
+    for _ in range(10):
+        env.step([up, NO_ACTION])
+    assert env.alive[0]
+    ate, died = env.step([up, NO_ACTION])
+    assert died.tolist() == [True, False]
+    assert env.alive.tolist() == [False, True]
+    ticks = env.ticks.copy()
+    env.step()
+    assert env.ticks[0] == ticks[0]  # dead games stay put
+
+
+def test_reset_mask_only_restarts_those_rows():
+    env = BatchSnakeEnv(3, 8, 6, seed=2)
+    env.step([0, 0, 0])
+    env.reset([True, False, False])
+    assert env.ticks.tolist() == [0, 1, 1]
+
+
+def test_eating_grows():
+    env = BatchSnakeEnv(1, 30, 20, seed=1)
+    env.food[0] = 10 * 30 + 16
+    ate, _ = env.step()
+    assert ate[0] and env.length[0] == 4 and env.score[0] == 1
+    check_rows(env)
+
+
+def test_filling_the_grid_is_a_victory():
+    env = BatchSnakeEnv(1, 4, 1, seed=1)
+    assert env.food_xy(0) == (3, 0)
+    env.step()
+    assert env.victory[0] and not env.alive[0]
+    assert env.food_xy(0) is None
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_same_moves_as_the_engine(seed):
+    """With the food forced to match, every game plays like SnakeEngine."""
+    n = 4
+    env = BatchSnakeEnv(n, 8, 6, seed=seed)
+    games = [SnakeEngine(8, 6, seed=seed) for _ in range(n)]
+    rng = np.random.default_rng(seed)
+    for _ in range(300):
+        actions = rng.integers(-1, 4, n)
+        for i, game in enumerate(games):
+            if not game.alive:
+                continue
+            game.food_cell, game.food = int(env.food[i]), env.food_xy(i)
+            if actions[i] >= 0:
+                game.set_direction(DIRECTIONS[actions[i]])
+            game.tick()
+        env.step(actions)
+        for i, game in enumerate(games):
+            assert env.snake(i) == game.snake
+            assert (env.alive[i], env.victory[i], env.score[i]) == (game.alive, game.victory, game.score)
@@ -0,0 +1,401 @@
+"""Rules of the headless engine (snake_engine.SnakeEngine)."""
+
+import random
+
+import pytest
+
+from snake_engine import FreeCells, SnakeBody, SnakeEngine, DIRECTIONS, TURN_QUEUE, UP, DOWN, LEFT, RIGHT
+
+
+def place(game, cells, direction):
+    """Put the snake on cells, given (x, y) from tail to head, heading direction."""
+    w = game.grid_w
+    game.body.clear()
+    for x, y in cells:
+        game.body.push_head(y * w + x)
+    game.head_x, game.head_y = cells[-1]
+    game.direction = game.next_direction = direction
+
+
+def put_food(game, x, y):
+    game.food_cell = y * game.grid_w + x
+    game.food = (x, y)
+
+
+def check_body(body):
+    """The ring, the occupancy grid and the free-cell index agree."""
+    cells = list(body)
+    assert len(cells) == len(body) == len(set(cells))
+    if cells:
+        assert cells[0] == body.head and cells[-1] == body.tail
+    for cell in range(body.capacity):
+        assert body.occupancy[cell] == (cell in cells)
+    free = body.free
+    assert len(free) == body.capacity - len(cells)
+    assert set(free.cells[:free.count]) == set(range(body.capacity)) - set(cells)
+    for i, cell in enumerate(free.cells):
+        assert free.slot[cell] == i
+
+
+def play_randomly(game, rng, moves):
+    """Up to moves random turns and ticks; returns the directions used."""
+    used = []
+    for _ in range(moves):
+        if not game.alive:
+            break
+        d = rng.choice(DIRECTIONS)
+        used.append(d)
+        game.set_direction(d)
+        game.tick()
+    return used
+
+
+def test_new_game():
+    game = SnakeEngine(30, 20, seed=1)
+    assert game.snake == [(15, 10), (14, 10), (13, 10)]
+    assert game.direction == RIGHT
+    assert (game.score, game.ticks, game.alive, game.victory) == (0, 0, True, False)
+    assert game.food is not None and game.food not in game.snake
+
+
+def test_rejects_tiny_grid():
+    with pytest.raises(ValueError):
+        SnakeEngine(3, 5)
+
+
+def test_move_and_turn():
+    game = SnakeEngine(30, 20, seed=1)
+    put_food(game, 0, 0)
+    assert game.tick()
+    assert game.snake == [(16, 10), (15, 10), (14, 10)]
+    game.set_direction(DOWN)
+    game.tick()
+    assert game.snake == [(16, 11), (16, 10), (15, 10)]
+    assert game.ticks == 2
+
+
+def test_reversal_is_ignored():
+    game = SnakeEngine(30, 20, seed=1)
+    put_food(game, 0, 0)
+    game.set_direction(LEFT)
+    game.tick()
+    assert game.direction == RIGHT
+    assert game.head == (16, 10)
+
+
+def test_wall_kills():
+    game = SnakeEngine(30, 20, seed=1)
+    put_food(game, 0, 0)
+    game.set_direction(UP)
+    moves = game.run(100)
+    assert moves == 11  # ten rows up to y = 0, then into the wall
+    assert not game.alive and not game.victory
+    assert not game.tick()
+
+
+def test_eating_grows_and_speeds_up():
+    game = SnakeEngine(30, 20, seed=1)
+    put_food(game, 16, 10)
+    game.tick()
+    assert game.score == 1
+    assert len(game.body) == 4
+    assert game.speed_fps == game.fps_base + game.fps_step
+    assert game.move_interval_ms == int(1000 / game.speed_fps)
+    assert game.food not in game.snake
+
+
+def test_speed_is_capped():
+    game = SnakeEngine(seed=1, fps_base=10, fps_step=5, fps_max=20)
+    assert game.speed_for_score(1) == 15
+    assert game.speed_for_score(100) == 20
+
+
+def test_may_enter_the_departing_tail():
+    game = SnakeEngine(30, 20, seed=1)
+    place(game, [(5, 6), (5, 5), (6, 5), (6, 6)], LEFT)  # a 2x2 loop, tail next to the head
+    put_food(game, 0, 0)
+    assert game.tick()
+    assert game.head == (5, 6)
+
+
+def test_body_kills():
+    game = SnakeEngine(30, 20, seed=1)
+    place(game, [(4, 6), (5, 6), (5, 5), (6, 5), (6, 6)], LEFT)
+    put_food(game, 0, 0)
+    assert not game.tick()  # (5, 6) stays covered: the tail is at (4, 6)
+    assert not game.alive
+
+
+def test_filling_the_grid_is_a_victory():
+    game = SnakeEngine(4, 1, seed=1)
+    assert game.food == (3, 0)  # the only free cell
+    game.tick()
+    assert game.victory and not game.alive
+    assert game.food is None
+    assert game.score == 1
+
+
+def test_step_paces_moves_by_game_time():
+    game = SnakeEngine(30, 20, seed=1)
+    put_food(game, 0, 0)
+    game.step(game.move_interval_ms - 1)
+    assert game.ticks == 0
+    game.step(1)
+    assert game.ticks == 1
+    game.step(3 * game.move_interval_ms)
+    assert game.ticks == 4
+
+
+def test_reset_with_seed_is_deterministic():
+    game = SnakeEngine(30, 20, seed=5)
+    first = game.food
+    game.run(3)
+    game.reset(5)
+    assert game.food == first
+    assert (game.ticks, game.score, game.alive) == (0, 0, True)
+    assert game.snake == [(15, 10), (14, 10), (13, 10)]
+
+
+# -----------------------------
+# Ring buffer body
+# -----------------------------
+def test_body_push_pop_advance():
+    body = SnakeBody(4, 2)
+    for cell in (0, 1, 2):
+        body.push_head(cell)
+    assert list(body) == [2, 1, 0]
+    assert body.advance(3) == 0
+    assert list(body) == [3, 2, 1]
+    assert body.pop_tail() == 1
+    assert list(body) == [3, 2]
+    check_body(body)
+    body.clear()
+    assert len(body) == 0
+    check_body(body)
+
+
+def test_body_ring_wraps_around():
+    body = SnakeBody(4, 1)
+    body.push_head(0)
+    body.push_head(1)
+    for cell in (2, 3, 2, 1, 0, 1, 2, 3):  # the head goes round the 4-slot ring twice
+        body.advance(cell)
+        check_body(body)
+    assert list(body) == [3, 2]
+
+
+def test_body_advance_into_its_tail():
+    body = SnakeBody(2, 2)
+    for cell in (0, 1, 3, 2):
+        body.push_head(cell)
+    assert body.advance(0) == 0
+    assert list(body) == [0, 2, 3, 1]
+    check_body(body)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_body_stays_consistent_in_play(seed):
+    game = SnakeEngine(8, 6, seed=seed)
+    rng = random.Random(seed)
+    for _ in range(5):
+        play_randomly(game, rng, 200)
+        check_body(game.body)
+        assert game.snake[0] == game.head
+        assert len(game.body) == 3 + game.score
+        game.reset()
+        check_body(game.body)
+
+
+# -----------------------------
+# Free cells
+# -----------------------------
+def check_free(free, expected):
+    assert len(free) == len(expected)
+    assert set(free.cells[:free.count]) == expected
+    for cell in range(len(free.cells)):
+        assert (cell in free) == (cell in expected)
+        assert free.cells[free.slot[cell]] == cell
+
+
+def test_free_cells_add_remove():
+    free = FreeCells(10)
+    expected = set(range(10))
+    rng = random.Random(3)
+    for _ in range(500):
+        cell = rng.randrange(10)
+        if cell in expected:
+            free.remove(cell)
+            expected.discard(cell)
+        else:
+            free.add(cell)
+            expected.add(cell)
+        check_free(free, expected)
+
+
+def test_free_cells_sample_only_free_and_uniform():
+    free = FreeCells(8)
+    for cell in (0, 2, 4, 6):
+        free.remove(cell)
+    rng = random.Random(1)
+    counts = {}
+    for _ in range(4000):
+        cell = free.sample(rng)
+        counts[cell] = counts.get(cell, 0) + 1
+    assert set(counts) == {1, 3, 5, 7}
+    assert min(counts.values()) > 800  # 1000 expected each
+
+
+def test_free_cells_sample_when_full():
+    free = FreeCells(3)
+    for cell in range(3):
+        free.remove(cell)
+    assert len(free) == 0
+    assert free.sample(random.Random(1)) == -1
+
+
+def test_food_is_placed_on_a_free_cell_when_crowded():
+    game = SnakeEngine(4, 2, seed=2)
+    rng = random.Random(2)
+    while game.alive:
+        play_randomly(game, rng, 1)
+        if game.alive:
+            assert game.food_cell >= 0 and not game.body.occupancy[game.food_cell]
+
+
+# -----------------------------
+# Turn queue
+# -----------------------------
+def test_quick_double_turn_takes_two_moves():
+    game = SnakeEngine(30, 20, seed=1)
+    put_food(game, 0, 0)
+    assert game.set_direction(UP)
+    assert game.set_direction(LEFT)  # checked against UP, not against RIGHT
+    game.tick()
+    assert game.head == (15, 9)
+    game.tick()
+    assert game.head == (14, 9)
+    assert game.direction == LEFT
+
+
+def test_queued_turns_are_checked_against_the_previous_one():
+    game = SnakeEngine(30, 20, seed=1)
+    assert not game.set_direction(LEFT)   # reverses RIGHT
+    assert not game.set_direction(RIGHT)  # repeats RIGHT
+    assert game.set_direction(UP)
+    assert not game.set_direction(DOWN)   # reverses the queued UP
+    assert list(game.turns) == [UP]
+
+
+def test_turn_queue_is_bounded():
+    game = SnakeEngine(30, 20, seed=1)
+    turns = [UP, LEFT, DOWN, RIGHT, UP]
+    queued = [game.set_direction(d) for d in turns]
+    assert queued == [True] * TURN_QUEUE + [False] * (len(turns) - TURN_QUEUE)
+    assert len(game.turns) == TURN_QUEUE
+
+
+def test_reset_clears_the_turn_queue():
+    game = SnakeEngine(30, 20, seed=1)
+    game.set_direction(UP)
+    game.reset()
+    assert not game.turns
+    assert game.next_direction == RIGHT
+
+
+# -----------------------------
+# Forks and snapshots
+# -----------------------------
+def state(game):
+    free = game.body.free
+    return (list(game.body), bytes(game.body.occupancy), sorted(free.cells[:free.count]),
+            game.food_cell, game.score, game.ticks, game.alive, game.victory, game.direction,
+            list(game.turns), game.move_interval_ms, game.rng.getstate())
+
+
+def replayed(seed, moves):
+    """A fresh game played through moves, to compare against."""
+    game = SnakeEngine(8, 6, seed=seed)
+    for d in moves:
+        if not game.alive:
+            break
+        game.set_direction(d)
+        game.tick()
+    return game
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_forks_are_independent(seed):
+    rng = random.Random(seed)
+    game = SnakeEngine(8, 6, seed=seed)
+    history = play_randomly(game, rng, rng.randrange(1, 40))
+    forks = [(game.fork(), list(history)) for _ in range(3)]
+    history += play_randomly(game, rng, 30)
+    for fork, moves in forks:
+        moves += play_randomly(fork, rng, rng.randrange(40))
+        assert state(fork) == state(replayed(seed, moves))
+        check_body(fork.body)
+    assert state(game) == state(replayed(seed, history))
+    check_body(game.body)
+
+
+def test_fork_shares_until_a_move():
+    game = SnakeEngine(30, 20, seed=1)
+    fork = game.fork()
+    assert fork.body is game.body and fork.rng is game.rng
+    put_food(fork, 0, 0)
+    fork.tick()
+    assert fork.body is not game.body
+    assert fork.rng is game.rng  # no food was placed, so the RNG is still shared
+    game.tick()
+    assert game.head == fork.head  # both moved from the same state
+
+
+def test_body_is_copied_only_while_another_game_uses_it():
+    game = SnakeEngine(30, 20, seed=1)
+    put_food(game, 0, 0)
+    body = game.body
+    game.fork()  # dropped without moving
+    game.restore(game)
+    moved = game.fork()
+    moved.tick()  # has its own copy now
+    game.tick()
+    assert game.body is body
+    kept = game.fork()
+    game.tick()
+    assert game.body is not body and kept.body is body
+
+
+def test_dropped_forks_are_forgotten():
+    game = SnakeEngine(30, 20, seed=1)
+    for _ in range(1000):
+        game.fork()
+    assert len(game._body_sharers) < 100
+
+
+def test_fork_copies_the_turn_queue():
+    game = SnakeEngine(30, 20, seed=1)
+    game.set_direction(UP)
+    fork = game.fork()
+    fork.set_direction(LEFT)
+    assert list(game.turns) == [UP]
+    assert list(fork.turns) == [UP, LEFT]
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_restore_rewinds_any_number_of_times(seed):
+    rng = random.Random(seed)
+    game = SnakeEngine(8, 6, seed=seed)
+    history = play_randomly(game, rng, 10)
+    snapshot = game.snapshot()
+    before = state(game)
+    for _ in range(3):
+        moves = play_randomly(game, rng, 30)
+        assert state(game) == state(replayed(seed, history + moves))
+        game.restore(snapshot)
+        assert state(game) == before
+        check_body(game.body)
+
+
+def test_restore_rejects_another_board():
+    with pytest.raises(ValueError):
+        SnakeEngine(30, 20).restore(SnakeEngine(10, 10).snapshot())
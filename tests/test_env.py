@@ -0,0 +1,158 @@
+"""Gym-style environment observations (snake_env)."""
+
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from snake_env import CHANNELS, NO_ACTION, REWARD_DEATH, REWARD_FOOD, SnakeEnv, VectorSnakeEnv  # noqa: E402
+
+
+def expected_planes(env):
+    """The planes rebuilt from the game state, padding included."""
+    game, pad, w, h = env.game, env.pad, env.grid_w, env.grid_h
+    planes = np.zeros(env.planes.shape, env.planes.dtype)
+    board = planes[:, pad:pad + h, pad:pad + w]
+    cells = list(game.body)  # head first
+    for i, name in enumerate(env.channels):
+        if name == "walls":
+            planes[i] = 1
+            board[i] = 0
+            continue
+        for k, cell in enumerate(cells):
+            y, x = divmod(cell, w)
+            if name == "body":
+                board[i, y, x] = 1
+            elif name == "head" and k == 0:
+                board[i, y, x] = 1
+            elif name == "order":
+                board[i, y, x] = env.head_order - k
+        if name == "food" and game.food_cell >= 0:
+            y, x = divmod(game.food_cell, w)
+            board[i, y, x] = 1
+    return planes
+
+
+def random_actions(seed):
+    rng = random.Random(seed)
+    while True:
+        yield rng.choice((NO_ACTION, NO_ACTION, 0, 1, 2, 3))
+
+
+@pytest.mark.parametrize("channels", [("head", "body", "food", "walls"), CHANNELS, ("body",)])
+def test_planes_track_the_game(channels):
+    env = SnakeEnv(8, 6, seed=1, channels=channels, auto_reset=True)
+    env.reset()
+    actions = random_actions(1)
+    for _ in range(400):
+        env.step(next(actions))
+        assert np.array_equal(env.planes, expected_planes(env))
+
+
+def test_observation_is_a_read_only_view():
+    env = SnakeEnv(8, 6, seed=1)
+    obs, _ = env.reset()
+    assert not obs.flags.writeable
+    assert np.shares_memory(obs, env.planes)
+    obs2, *_ = env.step(NO_ACTION)
+    assert obs2 is obs
+    with pytest.raises(ValueError):
+        obs[0, 0, 0] = 1
+
+
+def test_crop_is_centered_on_the_head():
+    env = SnakeEnv(8, 6, seed=2, crop=2, auto_reset=True)
+    env.reset()
+    actions = random_actions(2)
+    for _ in range(200):
+        obs, *_ = env.step(next(actions))
+        assert obs.shape == env.observation_shape == (4, 5, 5)
+        assert obs[env.channels.index("head"), 2, 2] == 1
+        y, x = divmod(env.game.body.head, env.grid_w)
+        assert np.array_equal(obs, env.planes[:, y:y + 5, x:x + 5])
+
+
+def test_rewards_and_termination():
+    env = SnakeEnv(8, 6, seed=3)
+    env.reset()
+    game = env.game
+    x, y = game.head_x + 1, game.head_y  # food right ahead
+    game.food_cell, game.food = y * game.grid_w + x, (x, y)
+    _, reward, terminated, truncated, info = env.step(NO_ACTION)
+    assert reward == REWARD_FOOD and info["score"] == 1
+    while True:
+        _, reward, terminated, truncated, _ = env.step(NO_ACTION)  # straight into the wall
+        if terminated:
+            break
+    assert reward == REWARD_DEATH and not truncated
+    with pytest.raises(RuntimeError):
+        env.step(NO_ACTION)
+
+
+def test_planes_follow_a_forked_game():
+    env = SnakeEnv(8, 8, seed=3, channels=CHANNELS, auto_reset=True)
+    env.reset()
+    actions = random_actions(3)
+    forks = []
+    for t in range(300):
+        if t % 7 == 0:
+            forks.append(env.game.fork())  # a lookahead agent keeping its copies
+        if t % 11 == 0:
+            fork = env.game.fork()
+            fork.tick()  # ... or moving one first
+        env.step(next(actions))
+        assert np.array_equal(env.planes, expected_planes(env))
+
+
+def test_max_ticks_truncates():
+    env = SnakeEnv(30, 20, seed=1, max_ticks=3)
+    env.reset()
+    results = [env.step(0)[2:4] for _ in range(3)]
+    assert results == [(False, False), (False, False), (False, True)]
+
+
+def test_auto_reset_keeps_the_final_observation():
+    env = SnakeEnv(8, 6, seed=4, auto_reset=True)
+    env.reset()
+    while True:
+        before = env.planes.copy()
+        obs, _, terminated, _, info = env.step(1)  # right, into the wall
+        if terminated:
+            break
+    assert np.array_equal(info["final_observation"], before)
+    assert info["final_info"]["ticks"] > 0
+    assert env.game.ticks == 0
+    assert np.array_equal(obs, expected_planes(env))
+
+
+@pytest.mark.parametrize("crop", [None, 2])
+def test_vector_env_matches_single_envs(crop):
+    n = 4
+    venv = VectorSnakeEnv(n, 8, 6, seed=10, crop=crop)
+    singles = [SnakeEnv(8, 6, seed=10 + i, crop=crop, auto_reset=True) for i in range(n)]
+    obs, _ = venv.reset()
+    for env in singles:
+        env.reset()
+    assert obs.shape == venv.observation_shape
+    rng = np.random.default_rng(0)
+    for _ in range(300):
+        actions = rng.integers(-1, 4, n)
+        obs, rewards, terminated, truncated, _ = venv.step(actions)
+        for i, env in enumerate(singles):
+            o, r, te, tr, _ = env.step(int(actions[i]))
+            assert np.array_equal(obs[i], o)
+            assert (rewards[i], terminated[i], truncated[i]) == (r, te, tr)
+
+
+def test_vector_env_shares_one_buffer():
+    venv = VectorSnakeEnv(3, 8, 6, seed=1)
+    obs, _ = venv.reset()
+    for i, env in enumerate(venv.envs):
+        assert np.shares_memory(env.planes, venv.planes)
+        assert np.array_equal(obs[i], expected_planes(env))
+
+
+def test_unknown_channel_is_rejected():
+    with pytest.raises(ValueError):
+        SnakeEnv(8, 6, channels=("head", "tail"))
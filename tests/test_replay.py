@@ -0,0 +1,97 @@
+"""Replay recording, the .snkr format and verification (snake_replay)."""
+
+import random
+
+import pytest
+
+from snake_engine import SnakeEngine, DIRECTIONS
+from snake_replay import Replay, ReplayError, ReplayPlayer, ReplayRecorder, main, play, verify
+
+EMPTY = Replay(1, 30, 20, 10, 1, 35).to_bytes()  # header only, no runs
+
+
+def record_game(seed, moves=500, grid=(10, 8)):
+    """A random game recorded tick by tick; returns (replay, game)."""
+    game = SnakeEngine(*grid)
+    recorder = ReplayRecorder(game)
+    recorder.start(seed)
+    rng = random.Random(seed)
+    while game.alive and game.ticks < moves:
+        if rng.random() < 0.3:
+            game.set_direction(rng.choice(DIRECTIONS))
+        game.tick()
+        recorder.capture()
+    return recorder.finish(), game
+
+
+def test_bytes_round_trip():
+    replay = Replay(2**63 - 1, 30, 20, 10, 1, 35, [[1, 5], [2, 1], [3, 100000]], 100006, 7, False, False)
+    again = Replay.from_bytes(replay.to_bytes())
+    assert vars(again) == vars(replay)
+
+
+def test_short_runs_take_one_byte():
+    replay = Replay(1, 30, 20, 10, 1, 35, [[0, 31], [1, 1]])
+    assert len(replay.to_bytes()) == len(EMPTY) + 2
+
+
+def test_save_and_load(tmp_path):
+    replay, _ = record_game(3)
+    path = replay.save(str(tmp_path / "game.snkr"))
+    assert vars(Replay.load(path)) == vars(replay)
+
+
+@pytest.mark.parametrize("data", [
+    EMPTY[:10],                                                 # shorter than a header
+    b"XXXX" + EMPTY[4:],                                        # bad magic
+    EMPTY[:4] + b"\x09" + EMPTY[5:],                            # unknown version
+    Replay(1, 30, 20, 10, 1, 35, [[0, 1000]]).to_bytes()[:-1],  # a varint cut short
+])
+def test_bad_data_is_rejected(data):
+    with pytest.raises(ReplayError):
+        Replay.from_bytes(data)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_recorded_games_verify(seed):
+    replay, game = record_game(seed)
+    assert replay.ticks == game.ticks
+    assert sum(n for _, n in replay.runs) == game.ticks
+    ok, again = verify(replay)
+    assert ok
+    assert again.snake == game.snake
+    assert again.food == game.food
+
+
+def test_tampered_outcome_is_a_mismatch():
+    replay, _ = record_game(4)
+    replay.score += 1
+    ok, _ = verify(replay)
+    assert not ok
+
+
+def test_game_ending_early_raises():
+    replay, game = record_game(5)
+    assert not game.alive
+    replay.runs.append([0, 10])  # moves after the recorded death
+    with pytest.raises(ReplayError):
+        play(replay)
+
+
+def test_player_step_paces_by_game_time():
+    replay, _ = record_game(6)
+    player = ReplayPlayer(replay)
+    interval = player.game.move_interval_ms
+    player.step(interval * 3)
+    assert player.game.ticks == 3
+
+
+def test_cli_verify(tmp_path, capsys):
+    replay, _ = record_game(7)
+    good = replay.save(str(tmp_path / "good.snkr"))
+    replay.score += 1
+    bad = replay.save(str(tmp_path / "bad.snkr"))
+    assert main(["verify", good]) == 0
+    assert main(["verify", good, bad]) == 1
+    out = capsys.readouterr().out
+    assert "good.snkr: OK" in out and "bad.snkr: MISMATCH" in out
@@ -0,0 +1,99 @@
+"""Delta-encoded game streams (snake_spectate)."""
+
+import json
+
+from snake_autopilot import Autopilot
+from snake_engine import SnakeEngine
+from snake_spectate import GameView, LiveGame, Viewer, RESTART_MS
+
+
+def check_view(view, game):
+    """The viewer's copy matches the server's game."""
+    assert list(view.body) == list(game.body)[::-1]
+    assert (view.food, view.score, view.ticks, view.alive) == (game.food_cell, game.score, game.ticks, game.alive)
+
+
+def watch(live):
+    view = GameView()
+    view.apply(json.loads(live.keyframe()))
+    return view
+
+
+def run(live, view, moves):
+    """Advance live by about moves ticks, feeding every frame to view; returns the messages."""
+    game = live.game
+    messages = []
+    for _ in range(moves):
+        dt = game.move_interval_ms if game.alive else RESTART_MS
+        for frame in live.advance(dt):
+            msg = json.loads(frame)
+            messages.append(msg)
+            view.apply(msg)
+        check_view(view, game)
+    return messages
+
+
+class ShortGames(Autopilot):
+    """The BFS autopilot for a few meals, then straight on into a wall."""
+
+    def drive(self, game):
+        if game.score < 4:
+            return super().drive(game)
+        return None
+
+
+class LookaheadPilot(Autopilot):
+    """An autopilot that forks the game before every move, and keeps some forks."""
+
+    def __init__(self, seed=None):
+        super().__init__(seed)
+        self.kept = []
+
+    def drive(self, game):
+        fork = game.fork()
+        if game.ticks % 3:
+            self.kept.append(fork)
+        else:
+            fork.tick()
+        super().drive(game)
+
+
+def test_deltas_follow_a_forked_game():
+    live = LiveGame(0, SnakeEngine(8, 6, seed=2), LookaheadPilot(2))
+    view = watch(live)
+    run(live, view, 300)
+
+
+def test_view_tracks_the_game_through_deaths_and_restarts():
+    live = LiveGame(0, SnakeEngine(8, 6, seed=1), ShortGames())
+    view = watch(live)
+    messages = run(live, view, 400)
+    deltas = [m for m in messages if m["type"] == "d"]
+    assert sum(1 for m in deltas if "score" in m) >= 8  # growth
+    assert sum(1 for m in deltas if m.get("dead")) >= 2
+    assert sum(1 for m in messages if m["type"] == "key") >= 2  # restarts
+    assert all("head" in m for m in deltas if not m.get("dead"))
+    assert all(len(json.dumps(m)) < 80 for m in deltas)  # no snake-length payloads
+
+
+def test_slow_viewer_is_resynced_with_a_keyframe():
+    live = LiveGame(0, SnakeEngine(8, 6, seed=3), Autopilot())
+    viewer = Viewer(writer=None, max_frames=8)
+    viewer.watch(live)
+    for _ in range(30):  # nobody drains the queue
+        for frame in live.advance(live.game.move_interval_ms):
+            viewer.offer(frame)
+    assert viewer.resyncs > 0
+    view = GameView()
+    while not viewer.queue.empty():
+        view.apply(json.loads(viewer.queue.get_nowait()))
+    check_view(view, live.game)
+
+
+def test_deltas_of_another_game_are_ignored():
+    a = LiveGame(0, SnakeEngine(8, 6, seed=1), Autopilot())
+    b = LiveGame(1, SnakeEngine(8, 6, seed=2), Autopilot())
+    view = watch(a)
+    for frame in b.advance(b.game.move_interval_ms):
+        view.apply(json.loads(frame))
+    check_view(view, a.game)
@@ -0,0 +1,100 @@
+"""Headless evaluation jobs and resumable results (snake_tournament)."""
+
+import json
+
+import pytest
+
+from snake_engine import SnakeEngine, UP, DOWN, LEFT, RIGHT
+from snake_tournament import (latest_results, play, read_results, run_job, run_tournament, summarize,
+                              RETRY_STATUSES)
+
+
+def circling(game):
+    """Round a 2x2 square forever (the food is kept out of the way)."""
+    return (UP, LEFT, DOWN, RIGHT)[game.ticks % 4]
+
+
+def circling_game():
+    game = SnakeEngine(30, 20, seed=1)
+    game.food_cell, game.food = 0, (0, 0)
+    return game
+
+
+def write_results(path, *results):
+    with open(path, "w") as f:
+        for r in results:
+            f.write(json.dumps(r) + "\n")
+
+
+def result(seed, status, score=0):
+    return {"agent": "greedy", "variant": "engine", "seed": seed, "status": status, "score": score, "ticks": 1}
+
+
+def test_run_job_plays_a_game():
+    r = run_job(("greedy", "engine", 3))
+    assert (r["agent"], r["variant"], r["seed"]) == ("greedy", "engine", 3)
+    assert r["status"] in ("dead", "victory", "stalled")
+    assert r["length"] == 3 + r["score"] and r["ticks"] > 0
+    assert r == dict(run_job(("greedy", "engine", 3)), seconds=r["seconds"])  # seeded, so repeatable
+
+
+def test_run_job_reports_errors():
+    r = run_job(("no_such_agent", "engine", 1))
+    assert r["status"] == "error" and "no_such_agent" in r["error"]
+    assert run_job(("snake_tournament:RandomAgent", "engine", 1))["status"] != "error"
+
+
+def test_play_limits():
+    assert play(circling_game(), circling, float("inf"), max_ticks=10) == "max_ticks"
+    assert play(circling_game(), circling, float("inf"), stall_ticks=100) == "stalled"
+    game = circling_game()
+    assert play(game, circling, 0) == "timeout"
+    assert game.ticks == 256  # the clock is only read every 256 moves
+
+
+def test_resume_skips_finished_jobs_and_retries_failures(tmp_path):
+    out = str(tmp_path / "results.jsonl")
+    write_results(out, result(0, "timeout"), result(1, "error"), result(2, "dead", score=99))
+    jobs = [("greedy", "engine", seed) for seed in range(4)]
+    assert run_tournament(jobs, out, workers=1) == 3  # 0 and 1 again, 3 for the first time
+    latest = {r["seed"]: r for r in latest_results(read_results(out))}
+    assert sorted(latest) == [0, 1, 2, 3]
+    assert latest[2]["score"] == 99
+    assert not any(r["status"] in RETRY_STATUSES for r in latest.values())
+    assert run_tournament(jobs, out, workers=1) == 0
+
+
+def test_torn_last_line(tmp_path):
+    out = str(tmp_path / "results.jsonl")
+    write_results(out, result(0, "dead"))
+    with open(out, "a") as f:
+        f.write('{"agent": "greedy", "var')  # killed mid-write
+    assert [r["seed"] for r in read_results(out)] == [0]
+    assert run_tournament([("greedy", "engine", 1)], out, workers=1) == 1
+    assert [r["seed"] for r in read_results(out)] == [0, 1]
+
+
+def test_latest_result_wins():
+    results = [result(0, "timeout"), result(1, "dead", 5), result(0, "dead", 7)]
+    assert latest_results(results) == [results[2], results[1]]
+
+
+def test_summarize():
+    results = [result(0, "dead", 4), result(1, "victory", 10), result(2, "timeout", 1),
+               dict(result(0, "dead", 2), agent="random")]
+    groups = summarize(results)
+    g = groups[("greedy", "engine")]
+    assert (g["games"], g["score"], g["max"], g["wins"], g["ticks"]) == (3, 15, 10, 1, 3)
+    assert g["other"] == {"timeout": 1}
+    assert groups[("random", "engine")]["games"] == 1
+
+
+def test_missing_file_has_no_results(tmp_path):
+    assert read_results(str(tmp_path / "none.jsonl")) == []
+
+
+@pytest.mark.parametrize("status", RETRY_STATUSES)
+def test_each_retry_status_is_played_again(tmp_path, status):
+    out = str(tmp_path / "results.jsonl")
+    write_results(out, result(5, status))
+    assert run_tournament([("greedy", "engine", 5)], out, workers=1) == 1